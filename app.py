@@ -1,4 +1,5 @@
 from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
 from extensions import db, migrate, login_manager
 from config import Config
 import os
@@ -7,6 +8,15 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
     
+    # Client addresses come from the proxy's X-Forwarded-For, so per-client
+    # rate limits do not see every visitor as the proxy
+    if app.config['PROXY_FIX_X_FOR']:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+    
+    # Flask's send_file emits X-Sendfile headers when this is set
+    if app.config['EVIDENCE_OFFLOAD'] == 'x-sendfile':
+        app.config['USE_X_SENDFILE'] = True
+    
     # Ensure upload folder exists
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
@@ -16,15 +26,49 @@ def create_app(config_class=Config):
     login_manager.init_app(app)
     login_manager.login_view = 'admin.login'
     
+    # Shared template bytecode and cached fragments
+    from services.page_cache import init_template_caching
+    init_template_caching(app)
+    
+    # Newly stored evidence files are protected from cleanup until their rows commit
+    from services.storage import init_storage
+    init_storage(app)
+    
+    # Read-your-writes for admins when admin reads go to a replica
+    from services.replica import init_replica
+    init_replica(app)
+    
+    # Report change events for the live dashboard, sent on commit
+    from services.events import init_events
+    init_events(app)
+    
+    # Report status history, written in batches after the changes commit
+    from services.history import init_history
+    init_history(app)
+    
+    # Web processes run queued jobs too, unless a separate worker does
+    from services.jobs import init_jobs
+    init_jobs(app)
+    
+    # Per-endpoint latency, SQL and upload metrics, served at /admin/metrics
+    from services.metrics import init_metrics
+    init_metrics(app)
+    
     # IMPORTANT: Import models BEFORE blueprints to register user_loader
     import models
     
     # Register blueprints
     from routes.citizen import citizen_bp
     from routes.admin import admin_bp
+    from routes.uploads import uploads_bp
     
     app.register_blueprint(citizen_bp)
     app.register_blueprint(admin_bp, url_prefix='/admin')
+    app.register_blueprint(uploads_bp, url_prefix='/upload')
+    
+    # Register CLI commands
+    from commands import register_commands
+    register_commands(app)
     
     return app
 
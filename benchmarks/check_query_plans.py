@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Query plan check
+Seeds a database, drives the dashboard and export routes, and runs EXPLAIN
+on every SELECT they issue. Exits non-zero if any plan falls back to a
+sequential scan of reports or evidence.
+
+Usage:
+    python benchmarks/check_query_plans.py [N]
+    DATABASE_URL=postgresql://... python benchmarks/check_query_plans.py 200000
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from export_memory import BenchmarkConfig
+
+DEFAULT_SIZE = 50000
+CHECKED_TABLES = ('reports', 'evidence')
+
+ROUTES = [
+    '/admin/dashboard',
+    '/admin/dashboard?status=Pending',
+    '/admin/dashboard?type=Extortion',
+    '/admin/dashboard?date_from=2024-01-01&date_to=2024-02-01',
+    '/admin/dashboard?status=Reviewed&type=Fraud',
+    '/admin/dashboard?q=minister+road',
+    '/admin/export?status=Resolved&date_from=2024-01-01',
+    '/admin/export?type=Bribery',
+    '/admin/export?q=permit',
+]
+
+
+def _pg_seq_scans(plan):
+    """Yield the relations read by Seq Scan nodes in a Postgres JSON plan"""
+    if plan.get('Node Type') == 'Seq Scan':
+        yield plan.get('Relation Name')
+    for child in plan.get('Plans', []):
+        yield from _pg_seq_scans(child)
+
+
+def find_seq_scans(connection, statement, parameters):
+    """EXPLAIN one statement and return the checked tables it scans sequentially"""
+    dialect = connection.dialect.name
+    if dialect == 'postgresql':
+        plan = connection.exec_driver_sql('EXPLAIN (FORMAT JSON) ' + statement, parameters).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        scans = _pg_seq_scans(plan[0]['Plan'])
+    elif dialect == 'sqlite':
+        rows = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+        scans = (row[-1].split()[1] for row in rows
+                 if row[-1].startswith('SCAN ') and 'INDEX' not in row[-1])
+    else:
+        raise SystemExit(f'Unsupported database dialect: {dialect}')
+    return sorted({table for table in scans if table in CHECKED_TABLES})
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SIZE
+
+    from app import create_app
+    from extensions import db
+    from models import Admin
+    from services.seed import seed_reports
+
+    app = create_app(BenchmarkConfig)
+
+    with app.app_context():
+        db.create_all()
+        if not Admin.query.filter_by(username='bench').first():
+            admin = Admin(username='bench')
+            admin.set_password('bench')
+            db.session.add(admin)
+            db.session.commit()
+
+        print(f'Seeding {size} reports...')
+        seed_reports(size, seed=size, clear=True)
+        with db.engine.connect() as connection:
+            connection.exec_driver_sql('ANALYZE')
+            connection.commit()
+        db.session.remove()
+
+        client = app.test_client()
+        client.post('/admin/login', data={'username': 'bench', 'password': 'bench'})
+
+        captured = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT'):
+                captured.append((statement, parameters))
+
+        failures = 0
+        for url in ROUTES:
+            captured.clear()
+            event.listen(db.engine, 'before_cursor_execute', capture)
+            response = client.get(url)
+            for _ in response.response:
+                pass
+            response.close()
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+            problems = []
+            if response.status_code != 200:
+                problems.append(f'HTTP {response.status_code}')
+            with db.engine.connect() as connection:
+                for statement, parameters in captured:
+                    scans = find_seq_scans(connection, statement, parameters)
+                    if scans:
+                        problems.append(f'sequential scan on {", ".join(scans)}: '
+                                        + ' '.join(statement.split())[:160])
+
+            failures += len(problems)
+            print(f'{"FAIL" if problems else "  ok"} {url} ({len(captured)} statements)')
+            for problem in problems:
+                print(f'     {problem}')
+
+        if failures:
+            print(f'\n{failures} plan(s) fell back to a sequential scan')
+            sys.exit(1)
+        print('\nAll dashboard and export queries use indexes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Export memory benchmark
+Seeds a throwaway database with N reports and measures the peak Python heap
+used while streaming /admin/export. Peak memory should stay flat as N grows.
+
+Usage:
+    python benchmarks/export_memory.py [N ...]
+    DATABASE_URL=postgresql://... python benchmarks/export_memory.py 1000 100000
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+class BenchmarkConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
+        'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'export_benchmark.db')
+    UPLOAD_FOLDER = tempfile.mkdtemp()
+    LOOKUP_RATE_BURST = 10 ** 9  # One client drives every request
+
+
+def measure_export(app, client):
+    """Stream the export once and return (rows, bytes, seconds, peak heap bytes)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    response = client.get('/admin/export')
+    total_bytes = 0
+    lines = 0
+    for chunk in response.response:
+        chunk = chunk.encode() if isinstance(chunk, str) else chunk
+        total_bytes += len(chunk)
+        lines += chunk.count(b'\n')
+    response.close()
+
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return lines - 1, total_bytes, elapsed, peak
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+
+    from app import create_app
+    from extensions import db
+    from models import Admin
+    from services.seed import seed_reports
+
+    app = create_app(BenchmarkConfig)
+
+    with app.app_context():
+        db.create_all()
+        if not Admin.query.filter_by(username='bench').first():
+            admin = Admin(username='bench')
+            admin.set_password('bench')
+            db.session.add(admin)
+            db.session.commit()
+
+        client = app.test_client()
+        client.post('/admin/login', data={'username': 'bench', 'password': 'bench'})
+
+        print(f"{'reports':>10} {'rows':>10} {'csv MB':>10} {'seconds':>10} {'peak heap MB':>14}")
+        results = []
+        for size in sizes:
+            seed_reports(size, seed=size, clear=True)
+            db.session.remove()
+            rows, total_bytes, elapsed, peak = measure_export(app, client)
+            results.append(peak)
+            print(f'{size:>10} {rows:>10} {total_bytes / 1e6:>10.1f} {elapsed:>10.2f} {peak / 1e6:>14.2f}')
+
+        growth = max(results) / min(results)
+        print(f'\nPeak heap grew {growth:.2f}x across a {max(sizes) // min(sizes)}x increase in reports')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+"""
+Route benchmark
+Seeds a database with N synthetic reports, drives the app's real routes
+through the test client and reports latency percentiles, SQL statements per
+request and peak RSS for each scenario. Results are written as JSON so runs
+on different commits can be compared.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--size N] [--requests R] [--output results.json]
+    DATABASE_URL=postgresql://... python benchmarks/run_benchmarks.py --size 200000
+    python benchmarks/run_benchmarks.py --compare before.json after.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import re
+import resource
+import statistics
+import struct
+import subprocess
+import sys
+import time
+import zlib
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from export_memory import BenchmarkConfig
+
+DEFAULT_SIZE = 20000
+DEFAULT_REQUESTS = 50
+PAGE_DEPTHS = (1, 5, 20)
+
+def _png(n):
+    """A valid 1x1 PNG whose colour, and so content hash, depends on n"""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    pixel = b'\x00' + (n % 2 ** 24).to_bytes(3, 'big')
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(pixel)) + chunk(b'IEND', b''))
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _consume(response):
+    """Read a response to the end, including streamed bodies"""
+    for _ in response.response:
+        pass
+    status = response.status_code
+    response.close()
+    return status
+
+
+def _dashboard_page_url(client, url, depth):
+    """Follow Next links from `url` and return the URL of page `depth`"""
+    for _ in range(depth - 1):
+        body = client.get(url).get_data(as_text=True)
+        match = re.search(r'href="([^"]*cursor=[^"]*)"[^>]*>\s*Next', body)
+        if not match:
+            break
+        url = match.group(1).replace('&amp;', '&')
+    return url
+
+
+def build_scenarios(app, client):
+    """Return (name, callable) pairs; each callable issues one request and returns its status"""
+    from extensions import db
+    from models import Report
+
+    with app.app_context():
+        report_ids = db.session.execute(
+            db.select(Report.report_id).order_by(Report.id.desc()).limit(200)
+        ).scalars().all()
+    recent = (datetime.utcnow() - timedelta(days=30)).strftime('%Y-%m-%d')
+
+    def get(url):
+        return lambda: _consume(client.get(url))
+
+    scenarios = []
+    for depth in PAGE_DEPTHS:
+        url = _dashboard_page_url(client, '/admin/dashboard', depth)
+        scenarios.append((f'dashboard page {depth}', get(url)))
+    scenarios += [
+        ('dashboard status filter', get('/admin/dashboard?status=Pending')),
+        ('dashboard type filter', get('/admin/dashboard?type=Extortion')),
+        ('dashboard date range', get(f'/admin/dashboard?date_from={recent}')),
+        ('dashboard search', get('/admin/dashboard?q=contractor+permit')),
+        ('export filtered', get(f'/admin/export?date_from={recent}')),
+        ('export all', get('/admin/export')),
+    ]
+
+    counter = iter(range(10 ** 9))
+
+    def submit():
+        n = next(counter)
+        return _consume(client.post('/report', data={
+            'corruption_type': 'Bribery',
+            'description': f'Benchmark submission {n}: the clerk asked for a payment.',
+            'location': 'Capital District',
+            'evidence': [(io.BytesIO(_png(n)), f'photo{n}.png')],
+        }, content_type='multipart/form-data'))
+
+    def track():
+        report_id = report_ids[next(counter) % len(report_ids)]
+        return _consume(client.post('/track', data={'report_id': report_id}))
+
+    def manage():
+        report_id = report_ids[next(counter) % len(report_ids)]
+        return _consume(client.get(f'/manage/{report_id}'))
+
+    scenarios += [('submit with file', submit), ('track', track), ('manage page', manage)]
+    return scenarios
+
+
+def run_scenario(engine, func, requests):
+    """Time `requests` calls of one scenario and count their SQL statements"""
+    statements = [0]
+
+    def count(*args):
+        statements[0] += 1
+
+    func()  # Warm up caches and connections
+    event.listen(engine, 'before_cursor_execute', count)
+    latencies = []
+    errors = 0
+    try:
+        for _ in range(requests):
+            started = time.perf_counter()
+            status = func()
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status >= 400:
+                errors += 1
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+
+    return {
+        'requests': requests,
+        'errors': errors,
+        'p50_ms': round(_percentile(latencies, 50), 2),
+        'p90_ms': round(_percentile(latencies, 90), 2),
+        'p99_ms': round(_percentile(latencies, 99), 2),
+        'mean_ms': round(statistics.fmean(latencies), 2),
+        'queries_per_request': round(statements[0] / requests, 2),
+        'peak_rss_mb': round(_peak_rss_mb(), 1),
+    }
+
+
+def compare(before_path, after_path):
+    """Print the change in p50, p90 and queries per request between two result files"""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    print(f"{before.get('commit')} -> {after.get('commit')} "
+          f"({before['database']} {before['size']} -> {after['database']} {after['size']})")
+    print(f"{'scenario':<26} {'p50 ms':>18} {'p90 ms':>18} {'queries':>14}")
+    for name, new in after['scenarios'].items():
+        old = before['scenarios'].get(name)
+        if old is None:
+            print(f'{name:<26} {"(new)":>18}')
+            continue
+        cells = [f"{old[key]:>7} -> {new[key]:<7}" for key in ('p50_ms', 'p90_ms')]
+        print(f"{name:<26} {cells[0]:>18} {cells[1]:>18} "
+              f"{old['queries_per_request']:>5} -> {new['queries_per_request']:<5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE, help='reports to seed')
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS, help='timed requests per scenario')
+    parser.add_argument('--output', default='benchmark-results.json', help='JSON results file')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='compare two result files')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    from app import create_app
+    from extensions import db
+    from models import Admin
+    from services.seed import seed_reports
+
+    app = create_app(BenchmarkConfig)
+
+    with app.app_context():
+        db.create_all()
+        if not Admin.query.filter_by(username='bench').first():
+            admin = Admin(username='bench')
+            admin.set_password('bench')
+            db.session.add(admin)
+            db.session.commit()
+
+        print(f'Seeding {args.size} reports...')
+        seed_reports(args.size, seed=args.size, clear=True)
+        database = db.engine.dialect.name
+        engine = db.engine
+        db.session.remove()
+
+    client = app.test_client()
+    client.post('/admin/login', data={'username': 'bench', 'password': 'bench'})
+
+    results = {
+        'commit': _git_commit(),
+        'database': database,
+        'size': args.size,
+        'requests': args.requests,
+        'python': platform.python_version(),
+        'started_at': datetime.utcnow().isoformat(timespec='seconds'),
+        'scenarios': {},
+    }
+
+    print(f"{'scenario':<26} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'queries':>8} {'RSS MB':>8}")
+    for name, func in build_scenarios(app, client):
+        result = run_scenario(engine, func, args.requests)
+        results['scenarios'][name] = result
+        print(f"{name:<26} {result['p50_ms']:>9} {result['p90_ms']:>9} {result['p99_ms']:>9} "
+              f"{result['queries_per_request']:>8} {result['peak_rss_mb']:>8}"
+              + (f"  ({result['errors']} errors)" if result['errors'] else ''))
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f'\nResults written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -6,15 +6,29 @@ set -o errexit
 pip install --upgrade pip
 pip install -r requirements.txt
 
-# Only initialize Alembic if migrations folder doesn’t exist
-if [ ! -d "migrations" ]; then
-    echo "Initializing Alembic..."
-    flask db init
+# Databases created by db.create_all() before migrations existed have the
+# initial tables but no migration history; mark them as the initial schema
+# so the upgrade adds everything since
+LEGACY_SCHEMA=$(python3 << END
+from sqlalchemy import inspect
+from app import create_app
+from extensions import db
+
+app = create_app()
+
+with app.app_context():
+    tables = inspect(db.engine).get_table_names()
+    print('yes' if 'reports' in tables and 'alembic_version' not in tables else 'no')
+END
+)
+if [ "$LEGACY_SCHEMA" = "yes" ]; then
+    echo "Stamping existing database as the initial schema..."
+    flask db stamp 14f548a3d8c8
 fi
 
-# Upgrade database to latest version
+# Upgrade database to latest version; a failed migration fails the build
 echo "Upgrading database..."
-flask db upgrade || echo "⚠️ Database already up to date or revision mismatch."
+flask db upgrade
 
 # Create uploads directory
 mkdir -p static/uploads
@@ -28,8 +42,7 @@ from models import Admin
 app = create_app()
 
 with app.app_context():
-    db.create_all()
-    admin = Admin.query.filter_by(username='admin').first()
+    admin = Admin.query.filter_by(username='admin@anticorrup').first()
     if not admin:
         admin = Admin(username='admin@anticorrup', email='admin@example.com')
         admin.set_password('Anticorrup@123')
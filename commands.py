@@ -0,0 +1,214 @@
+import os
+import click
+from flask import current_app
+from flask.cli import AppGroup, with_appcontext
+from extensions import db
+from models import ArchivedEvidence, Evidence
+
+evidence_cli = AppGroup('evidence', help='Evidence storage maintenance.')
+
+
+@evidence_cli.command('rehome')
+@click.option('--batch-size', default=500, show_default=True, help='Rows updated per transaction.')
+def rehome_evidence(batch_size):
+    """Move legacy flat uploads into the content-addressed layout."""
+    from services.storage import absolute_path, content_path, copy_into_store, hash_file
+    
+    moved = deduplicated = missing = 0
+    last_id = 0
+    
+    while True:
+        batch = Evidence.query.filter(Evidence.content_hash.is_(None), Evidence.id > last_id) \
+            .order_by(Evidence.id).limit(batch_size).all()
+        if not batch:
+            break
+        
+        sources = {}
+        for evidence in batch:
+            last_id = evidence.id
+            source = absolute_path(evidence.filename)
+            if not os.path.exists(source):
+                missing += 1
+                click.echo(f'Missing file for evidence {evidence.id}: {evidence.filename}', err=True)
+                continue
+            
+            # The row moves to a copy first; the legacy file goes only once that has
+            # committed, so a crash at any point leaves every row with its file
+            content_hash = hash_file(source)
+            ext = os.path.splitext(evidence.filename)[1][1:]
+            if os.path.exists(absolute_path(content_path(content_hash, ext))):
+                deduplicated += 1
+            else:
+                moved += 1
+            
+            sources[evidence.filename] = source
+            evidence.filename = copy_into_store(source, content_hash, ext)
+            evidence.content_hash = content_hash
+        
+        db.session.commit()
+        
+        still_used = set(db.session.execute(
+            db.select(Evidence.filename).where(Evidence.filename.in_(list(sources)))
+            .union(db.select(ArchivedEvidence.filename).where(ArchivedEvidence.filename.in_(list(sources))))
+        ).scalars())
+        for legacy_name, source in sources.items():
+            if legacy_name not in still_used:
+                os.remove(source)
+    
+    click.echo(f'Moved {moved}, deduplicated {deduplicated}, missing {missing}')
+
+
+@evidence_cli.command('purge-uploads')
+def purge_uploads():
+    """Delete chunked uploads that were never completed or never attached to a report, and old import reject files."""
+    from services.ingest import purge_rejects, rejects_folder
+    from services.storage import expire_claims
+    from services.uploads import purge_stale_uploads
+    
+    click.echo(f'Purged {purge_stale_uploads()} stale upload(s)')
+    click.echo(f"Released {expire_claims(current_app.config['UPLOAD_SESSION_TTL'])} unattached file(s)")
+    click.echo(f"Deleted {purge_rejects(rejects_folder(), current_app.config['IMPORT_REJECTS_TTL'])} import reject file(s)")
+
+
+@evidence_cli.command('thumbnails')
+@click.option('--workers', default=None, type=int, help='Processes to use (default THUMBNAIL_WORKERS).')
+def build_thumbnails(workers):
+    """Generate missing thumbnails for existing evidence."""
+    from concurrent.futures import ProcessPoolExecutor
+    from services.storage import absolute_path, thumbnail_filename
+    from services.thumbnails import can_thumbnail, generate_thumbnail
+    
+    max_size = current_app.config['THUMBNAIL_SIZE']
+    jobs = {}
+    rows = db.session.query(Evidence.filename, Evidence.content_hash, Evidence.file_type) \
+        .filter(Evidence.content_hash.isnot(None))
+    for filename, content_hash, file_type in rows:
+        target = absolute_path(thumbnail_filename(content_hash))
+        if target not in jobs and can_thumbnail(file_type) and not os.path.exists(target):
+            jobs[target] = (absolute_path(filename), target, file_type, max_size)
+    
+    built = failed = 0
+    with ProcessPoolExecutor(max_workers=workers or current_app.config['THUMBNAIL_WORKERS']) as pool:
+        futures = [pool.submit(generate_thumbnail, *job) for job in jobs.values()]
+        for future in futures:
+            if future.exception() is None:
+                built += 1
+            else:
+                failed += 1
+                click.echo(f'Failed: {future.exception()}', err=True)
+    
+    click.echo(f'Built {built} thumbnail(s), {failed} failed')
+
+
+@click.command('worker')
+@click.option('--pool', type=click.Choice(['thread', 'process']), default='thread', show_default=True,
+              help='Run jobs in threads (I/O-bound work) or processes (CPU-bound work).')
+@click.option('--concurrency', default=4, show_default=True, help='Jobs run at the same time.')
+@click.option('--once', is_flag=True, help='Exit when no runnable jobs are left.')
+@with_appcontext
+def worker(pool, concurrency, once):
+    """Run background jobs from the database queue."""
+    from services.jobs import run_worker
+    
+    click.echo(f'Worker started ({pool} pool, concurrency {concurrency})')
+    processed = run_worker(pool=pool, concurrency=concurrency, once=once)
+    click.echo(f'Processed {processed} job(s)')
+
+
+@click.command('seed')
+@click.argument('count', type=int)
+@click.option('--days', default=365, show_default=True, help='Spread reports over this many past days.')
+@click.option('--seed', 'random_seed', default=None, type=int, help='Random seed, for reproducible data.')
+@click.option('--clear', is_flag=True, help='Delete all reports and evidence first.')
+@with_appcontext
+def seed(count, days, random_seed, clear):
+    """Insert COUNT synthetic reports with evidence rows."""
+    from services.seed import seed_reports
+    from services.stats import invalidate_dashboard_stats
+    
+    if clear:
+        click.confirm('Delete every report and evidence row?', abort=True)
+    reports, evidence = seed_reports(count, days=days, seed=random_seed, clear=clear)
+    invalidate_dashboard_stats()
+    click.echo(f'Inserted {reports} report(s) and {evidence} evidence row(s)')
+
+
+@click.command('import-reports')
+@click.argument('source', type=click.File('rb'))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), default=None,
+              help='Input format (default: from the file extension).')
+@click.option('--rejects', 'rejects_path', default=None, help='Where to write rows that fail validation.')
+@click.option('--batch-size', default=5000, show_default=True, help='Rows loaded per transaction.')
+@with_appcontext
+def import_reports_command(source, fmt, rejects_path, batch_size):
+    """Bulk load reports from a partner CSV or JSONL file (- for stdin)."""
+    from services.ingest import import_format, import_reports
+    from services.report_cache import invalidate_reports
+    from services.stats import invalidate_dashboard_stats
+    
+    fmt = fmt or import_format(source.name)
+    if fmt is None:
+        raise click.UsageError('Cannot tell the format from the file name; pass --format csv or jsonl.')
+    rejects_path = rejects_path or (source.name if source.name != '<stdin>' else 'import') + f'.rejects.{fmt}'
+    
+    result = import_reports(source, fmt, rejects_path, batch_size=batch_size)
+    invalidate_dashboard_stats()
+    invalidate_reports()
+    
+    click.echo(f'Imported {result.imported} report(s), rejected {result.rejected}')
+    if result.rejected:
+        click.echo(f'Rejected rows written to {rejects_path}')
+    if result.error:
+        raise click.ClickException(f'Import stopped, {result.error}')
+
+
+@click.command('backfill-stats')
+@with_appcontext
+def backfill_stats():
+    """Rebuild the daily report rollups from the reports table."""
+    from services.rollups import backfill_daily_stats
+    
+    click.echo(f'Rebuilt {backfill_daily_stats()} daily bucket(s)')
+
+
+@click.command('archive-reports')
+@click.option('--older-than', 'older_than_days', default=None, type=int,
+              help='Archive reports resolved more than this many days ago (default: ARCHIVE_AFTER_DAYS).')
+@click.option('--batch-size', default=1000, show_default=True, help='Reports moved per transaction.')
+@with_appcontext
+def archive_reports(older_than_days, batch_size):
+    """Move old resolved reports and their evidence rows to the archive tables."""
+    from services.archive import archive_resolved_reports
+    from services.report_cache import invalidate_reports
+    from services.stats import invalidate_dashboard_stats
+    
+    if older_than_days is None:
+        older_than_days = current_app.config['ARCHIVE_AFTER_DAYS']
+    archived = archive_resolved_reports(older_than_days, batch_size=batch_size)
+    invalidate_dashboard_stats()
+    invalidate_reports()
+    click.echo(f'Archived {archived} report(s) resolved more than {older_than_days} day(s) ago')
+
+
+@click.command('index-similarity')
+@click.option('--workers', default=None, type=int, help='Processes to use (default SIMILARITY_WORKERS).')
+@click.option('--batch-size', default=1000, show_default=True, help='Reports per worker batch.')
+@click.option('--rebuild', is_flag=True, help='Drop the index and rebuild it from scratch.')
+@with_appcontext
+def index_similarity(workers, batch_size, rebuild):
+    """Add reports that are not indexed yet to the near-duplicate index."""
+    from services.similarity import backfill_index
+    
+    indexed = backfill_index(workers or current_app.config['SIMILARITY_WORKERS'], batch_size, rebuild=rebuild)
+    click.echo(f'Indexed {indexed} report(s)')
+
+
+def register_commands(app):
+    """Attach the project's CLI commands to the app"""
+    app.cli.add_command(evidence_cli)
+    app.cli.add_command(worker)
+    app.cli.add_command(seed)
+    app.cli.add_command(import_reports_command)
+    app.cli.add_command(backfill_stats)
+    app.cli.add_command(archive_reports)
+    app.cli.add_command(index_similarity)
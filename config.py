@@ -12,12 +12,114 @@ class Config:
     if SQLALCHEMY_DATABASE_URI and SQLALCHEMY_DATABASE_URI.startswith('postgres://'):
         SQLALCHEMY_DATABASE_URI = SQLALCHEMY_DATABASE_URI.replace('postgres://', 'postgresql://', 1)
     
+    # Optional read replica for the heavy admin read paths (dashboard, report
+    # pages, exports); writes always go to the primary
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    if DATABASE_REPLICA_URL and DATABASE_REPLICA_URL.startswith('postgres://'):
+        DATABASE_REPLICA_URL = DATABASE_REPLICA_URL.replace('postgres://', 'postgresql://', 1)
+    SQLALCHEMY_BINDS = {'replica': DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    
+    # Seconds of replication lag tolerated before reads fall back to the
+    # primary, and how long an admin keeps reading the primary after a write
+    REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG', 5))
+    REPLICA_CHECK_INTERVAL = 5  # Seconds between replica lag checks in each worker
+    
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
     UPLOAD_FOLDER = os.path.join(basedir, 'static', 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'pdf'}
     
+    # Chunked uploads send large evidence in parts well under MAX_CONTENT_LENGTH
+    UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB per part
+    CHUNKED_UPLOAD_MAX_SIZE = int(os.environ.get('CHUNKED_UPLOAD_MAX_SIZE', 200 * 1024 * 1024))
+    UPLOAD_SESSION_TTL = 24 * 60 * 60  # Seconds before unfinished uploads are purged
+    IMPORT_REJECTS_TTL = 7 * 24 * 60 * 60  # Seconds reject files from dashboard imports stay downloadable
+    
+    # Evidence serving: '' streams through Flask, 'x-accel-redirect' hands the
+    # transfer to nginx and 'x-sendfile' to Apache/lighttpd
+    EVIDENCE_OFFLOAD = os.environ.get('EVIDENCE_OFFLOAD', '')
+    EVIDENCE_ACCEL_PREFIX = os.environ.get('EVIDENCE_ACCEL_PREFIX', '/protected-uploads/')
+    EVIDENCE_MAX_AGE = 30 * 24 * 60 * 60  # Stored files never change, so cache them for long
+    
+    # Evidence thumbnails, generated in a background process pool
+    THUMBNAIL_SIZE = 320  # Longest edge in pixels
+    THUMBNAIL_WORKERS = int(os.environ.get('THUMBNAIL_WORKERS', 2))
+    
+    # Background job queue (flask worker)
+    JOB_POLL_INTERVAL = 1.0  # Seconds an idle worker waits before polling again
+    JOB_LOCK_TIMEOUT = 15 * 60  # Seconds before a job claimed by a dead worker is retried
+    # Threads in each web process that also run jobs, for single-process
+    # development; every one polls the jobs table, so deployments leave
+    # this at 0 and run a separate flask worker
+    JOB_WORKER_THREADS = int(os.environ.get('JOB_WORKER_THREADS', 0))
+    
     PERMANENT_SESSION_LIFETIME = timedelta(hours=2)
     
-    REPORTS_PER_PAGE = 20
\ No newline at end of file
+    # Seconds a logged-in admin's identity is cached in each worker; edits
+    # to an admin invalidate it immediately in the worker that made them
+    ADMIN_CACHE_TTL = int(os.environ.get('ADMIN_CACHE_TTL', 60))
+    
+    REPORTS_PER_PAGE = 20
+    
+    # Above this many matching reports the dashboard shows the planner estimate
+    EXACT_COUNT_LIMIT = int(os.environ.get('EXACT_COUNT_LIMIT', 10000))
+    
+    # Longest range, in days, the daily statistics endpoint answers
+    DAILY_STATS_MAX_DAYS = 10 * 366
+    
+    # Live dashboard updates over Server-Sent Events. Each open dashboard
+    # holds a connection and a worker thread (see gunicorn.conf.py); set to
+    # 0 where workers cannot keep connections open, e.g. sync workers
+    LIVE_DASHBOARD = bool(int(os.environ.get('LIVE_DASHBOARD', 1)))
+    SSE_HEARTBEAT = 15  # Seconds between keep-alive comments on an idle stream
+    SSE_QUEUE_SIZE = 100  # Events buffered for a slow client before it is told to reload
+    
+    # Near-duplicate detection: reports whose descriptions' estimated word
+    # shingle overlap reaches this share are clustered together
+    SIMILARITY_THRESHOLD = float(os.environ.get('SIMILARITY_THRESHOLD', 0.6))
+    SIMILAR_REPORTS_LIMIT = 10  # Similar reports listed on a report's page
+    SIMILARITY_WORKERS = int(os.environ.get('SIMILARITY_WORKERS', 2))  # Processes used by flask index-similarity
+    
+    # Report history is written behind the request in batches: when this many
+    # entries are waiting, every few seconds, and when the process exits
+    HISTORY_FLUSH_SIZE = int(os.environ.get('HISTORY_FLUSH_SIZE', 500))
+    HISTORY_FLUSH_INTERVAL = float(os.environ.get('HISTORY_FLUSH_INTERVAL', 2.0))  # Seconds
+    HISTORY_BUFFER_LIMIT = 100000  # Entries kept in memory while the database is unreachable
+    
+    # Resolved reports untouched for this many days are moved to the archive tables
+    ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 180))
+    
+    # Compiled templates are kept here and shared by all workers (None: a
+    # per-user directory under the system temp dir)
+    TEMPLATE_CACHE_DIR = os.environ.get('TEMPLATE_CACHE_DIR')
+    FRAGMENT_CACHE_SIZE = int(os.environ.get('FRAGMENT_CACHE_SIZE', 5000))  # Rendered dashboard rows per worker
+    # Seconds browsers and proxies may reuse the anonymous portal pages
+    PAGE_CACHE_MAX_AGE = int(os.environ.get('PAGE_CACHE_MAX_AGE', 300))
+    
+    # Seconds the dashboard statistics are cached in each worker
+    STATS_CACHE_TTL = int(os.environ.get('STATS_CACHE_TTL', 60))
+    
+    # Per-worker cache of report-ID lookups on the citizen tracking pages;
+    # writes invalidate it in the worker that made them, the TTL bounds the rest
+    REPORT_CACHE_SIZE = int(os.environ.get('REPORT_CACHE_SIZE', 10000))
+    REPORT_CACHE_TTL = int(os.environ.get('REPORT_CACHE_TTL', 30))
+    REPORT_CACHE_NEGATIVE_TTL = int(os.environ.get('REPORT_CACHE_NEGATIVE_TTL', 60))  # Unknown IDs
+    
+    # Reverse proxies in front of the app whose X-Forwarded-For entry is
+    # trusted as the client address (Render adds one); 0 when exposed directly
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 1))
+    
+    # Token bucket per client on report lookups: a burst, then this many per second
+    LOOKUP_RATE_LIMIT = float(os.environ.get('LOOKUP_RATE_LIMIT', 0.5))
+    LOOKUP_RATE_BURST = int(os.environ.get('LOOKUP_RATE_BURST', 20))
+    # Same for opening chunked uploads, which bounds the disk one client can fill
+    UPLOAD_RATE_LIMIT = float(os.environ.get('UPLOAD_RATE_LIMIT', 0.02))
+    UPLOAD_RATE_BURST = int(os.environ.get('UPLOAD_RATE_BURST', 10))
+    
+    # Requests over either budget are logged as slow
+    SLOW_REQUEST_SECONDS = float(os.environ.get('SLOW_REQUEST_SECONDS', 1.0))
+    SLOW_REQUEST_QUERIES = int(os.environ.get('SLOW_REQUEST_QUERIES', 20))
+    
+    # Bearer token that lets Prometheus scrape /admin/metrics without a login
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
\ No newline at end of file
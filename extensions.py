@@ -1,7 +1,9 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
+from services.replica import RoutingSession
 
-db = SQLAlchemy()
+# Admin read-only views can be routed to a read replica (services/replica.py)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 login_manager = LoginManager()
\ No newline at end of file
@@ -0,0 +1,24 @@
+import os
+import shutil
+import tempfile
+
+# Every open admin dashboard keeps an /admin/events stream open, which would
+# pin a whole sync worker; threaded workers serve other requests meanwhile
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 32))
+
+# Worker processes share their metrics through prometheus_client's
+# multiprocess mode. The directory has to be in the environment before the
+# app, and with it prometheus_client, is imported in the workers.
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'anticorruption-metrics'))
+
+
+def on_starting(server):
+    """Start from empty metrics on every server start"""
+    shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'])
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
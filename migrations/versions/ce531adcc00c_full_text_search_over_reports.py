@@ -0,0 +1,73 @@
+"""full-text search over reports
+
+Revision ID: ce531adcc00c
+Revises: 1bee7b923d37
+Create Date: 2026-10-18 11:36:42.328562
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ce531adcc00c'
+down_revision = '1bee7b923d37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("""
+            ALTER TABLE reports ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(location, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(description, '')), 'B')
+            ) STORED
+        """)
+        op.execute("CREATE INDEX ix_reports_search_vector ON reports USING gin (search_vector)")
+
+    elif dialect == 'sqlite':
+        op.execute("""
+            CREATE VIRTUAL TABLE reports_fts USING fts5(
+                description, location, content='reports', content_rowid='id',
+                tokenize='porter unicode61'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER reports_fts_ai AFTER INSERT ON reports BEGIN
+                INSERT INTO reports_fts(rowid, description, location)
+                VALUES (new.id, new.description, new.location);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER reports_fts_ad AFTER DELETE ON reports BEGIN
+                INSERT INTO reports_fts(reports_fts, rowid, description, location)
+                VALUES ('delete', old.id, old.description, old.location);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER reports_fts_au AFTER UPDATE OF description, location ON reports BEGIN
+                INSERT INTO reports_fts(reports_fts, rowid, description, location)
+                VALUES ('delete', old.id, old.description, old.location);
+                INSERT INTO reports_fts(rowid, description, location)
+                VALUES (new.id, new.description, new.location);
+            END
+        """)
+        # Index the reports that already exist
+        op.execute("INSERT INTO reports_fts(reports_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_reports_search_vector")
+        op.execute("ALTER TABLE reports DROP COLUMN IF EXISTS search_vector")
+
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS reports_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS reports_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS reports_fts_ai")
+        op.execute("DROP TABLE IF EXISTS reports_fts")
@@ -1,7 +1,12 @@
 from extensions import db, login_manager
+from flask import current_app
 from flask_login import UserMixin
+from sqlalchemy import DDL, event
+from sqlalchemy.orm import query_expression
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
+import threading
+import time
 
 
 # ==============================
@@ -28,10 +33,50 @@ class Admin(UserMixin, db.Model):
         return f'<Admin {self.username}>'
 
 
+class AdminIdentity(UserMixin):
+    """Detached copy of an admin's identity, safe to share between requests."""
+    
+    def __init__(self, admin):
+        self.id = admin.id
+        self.username = admin.username
+        self.email = admin.email
+    
+    def __repr__(self):
+        return f'<AdminIdentity {self.username}>'
+
+
+_admin_cache_lock = threading.Lock()
+_admin_cache = {}  # admin id -> (AdminIdentity or None, expires_at)
+
+
+def invalidate_admin(admin_id):
+    """Drop a cached admin identity so the next request reloads it."""
+    with _admin_cache_lock:
+        _admin_cache.pop(admin_id, None)
+
+
+@event.listens_for(Admin, 'after_update')
+@event.listens_for(Admin, 'after_delete')
+def _invalidate_changed_admin(mapper, connection, admin):
+    invalidate_admin(admin.id)
+
+
 @login_manager.user_loader
 def load_user(user_id):
-    """Flask-Login user loader."""
-    return Admin.query.get(int(user_id))
+    """Flask-Login user loader, cached for ADMIN_CACHE_TTL seconds per worker."""
+    admin_id = int(user_id)
+    now = time.monotonic()
+    with _admin_cache_lock:
+        entry = _admin_cache.get(admin_id)
+        if entry is not None and now < entry[1]:
+            return entry[0]
+    
+    admin = db.session.get(Admin, admin_id)
+    identity = AdminIdentity(admin) if admin else None
+    
+    with _admin_cache_lock:
+        _admin_cache[admin_id] = (identity, now + current_app.config['ADMIN_CACHE_TTL'])
+    return identity
 
 
 # ==============================
@@ -52,10 +97,71 @@ class Report(db.Model):
     # Relationship to Evidence
     evidence = db.relationship('Evidence', backref='report', lazy=True, cascade='all, delete-orphan')
     
+    # Full-text relevance, populated only by search queries
+    search_rank = query_expression()
+    
+    is_archived = False
+    
     def __repr__(self):
         return f'<Report {self.report_id}>'
 
 
+# Composite indexes matching the dashboard filters and its (created_at, id) ordering
+db.Index('ix_reports_created_at_id', Report.created_at.desc(), Report.id.desc())
+db.Index('ix_reports_status_created_at_id', Report.status, Report.created_at.desc(), Report.id.desc())
+db.Index('ix_reports_type_created_at_id', Report.corruption_type, Report.created_at.desc(), Report.id.desc())
+# Covers the GROUP BY behind the dashboard statistics
+db.Index('ix_reports_status_type', Report.status, Report.corruption_type)
+
+
+# Full-text search structures live outside the ORM mapping: a generated
+# tsvector column on Postgres and an external-content FTS5 table on SQLite.
+# Migrations create the same objects on existing databases.
+def search_ddl(table):
+    """Full-text search DDL for a table with description and location columns, by dialect"""
+    return {
+        'postgresql': [
+            f"""ALTER TABLE {table} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(location, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(description, '')), 'B')
+            ) STORED""",
+            f"CREATE INDEX ix_{table}_search_vector ON {table} USING gin (search_vector)",
+        ],
+        'sqlite': [
+            f"""CREATE VIRTUAL TABLE {table}_fts USING fts5(
+                description, location, content='{table}', content_rowid='id',
+                tokenize='porter unicode61'
+            )""",
+            f"""CREATE TRIGGER {table}_fts_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {table}_fts(rowid, description, location)
+                VALUES (new.id, new.description, new.location);
+            END""",
+            f"""CREATE TRIGGER {table}_fts_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {table}_fts({table}_fts, rowid, description, location)
+                VALUES ('delete', old.id, old.description, old.location);
+            END""",
+            f"""CREATE TRIGGER {table}_fts_au AFTER UPDATE OF description, location ON {table} BEGIN
+                INSERT INTO {table}_fts({table}_fts, rowid, description, location)
+                VALUES ('delete', old.id, old.description, old.location);
+                INSERT INTO {table}_fts(rowid, description, location)
+                VALUES (new.id, new.description, new.location);
+            END""",
+        ],
+    }
+
+
+def attach_search_ddl(table):
+    """Create a table's search structures along with it, and drop them with it"""
+    for dialect, statements in search_ddl(table.name).items():
+        for statement in statements:
+            event.listen(table, 'after_create', DDL(statement).execute_if(dialect=dialect))
+    event.listen(table, 'before_drop',
+                 DDL(f'DROP TABLE IF EXISTS {table.name}_fts').execute_if(dialect='sqlite'))
+
+
+attach_search_ddl(Report.__table__)
+
+
 # ==============================
 # Evidence Model
 # ==============================
@@ -63,12 +169,169 @@ class Evidence(db.Model):
     __tablename__ = 'evidence'
     
     id = db.Column(db.Integer, primary_key=True)
-    filename = db.Column(db.String(255), nullable=False)
+    filename = db.Column(db.String(255), nullable=False)  # Path under UPLOAD_FOLDER, ab/cd/<hash>.<ext>
+    content_hash = db.Column(db.String(64), index=True)  # SHA-256 of the stored file
     original_filename = db.Column(db.String(255), nullable=False)
     file_type = db.Column(db.String(50))
     file_size = db.Column(db.Integer)
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
-    report_id = db.Column(db.Integer, db.ForeignKey('reports.id'), nullable=False)
+    report_id = db.Column(db.Integer, db.ForeignKey('reports.id'), nullable=False, index=True)
     
     def __repr__(self):
         return f'<Evidence {self.original_filename}>'
+
+
+# ==============================
+# Background Job Model
+# ==============================
+class Job(db.Model):
+    __tablename__ = 'jobs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_after = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_at = db.Column(db.DateTime)
+    locked_by = db.Column(db.String(64))
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    
+    __table_args__ = (
+        # Workers claim the oldest runnable jobs first
+        db.Index('ix_jobs_status_run_after', 'status', 'run_after'),
+    )
+    
+    def __repr__(self):
+        return f'<Job {self.id} {self.kind} {self.status}>'
+
+
+# ==============================
+# Daily Report Rollup Model
+# ==============================
+class ReportDailyStats(db.Model):
+    """Reports per creation day, type and current status, kept in step by every write path"""
+    __tablename__ = 'report_daily_stats'
+    
+    day = db.Column(db.Date, primary_key=True)
+    corruption_type = db.Column(db.String(100), primary_key=True)
+    status = db.Column(db.String(30), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<ReportDailyStats {self.day} {self.corruption_type} {self.status} {self.count}>'
+
+
+# ==============================
+# Archive Models
+# ==============================
+class ArchivedReport(db.Model):
+    """
+    Resolved reports moved out of the operational table. Rows keep their
+    original ids; on Postgres the table is range-partitioned by month of
+    created_at, so the partition key is part of the primary key.
+    """
+    __tablename__ = 'reports_archive'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    created_at = db.Column(db.DateTime, primary_key=True)
+    report_id = db.Column(db.String(50), nullable=False, index=True)
+    corruption_type = db.Column(db.String(100), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    location = db.Column(db.String(255))
+    status = db.Column(db.String(30))
+    updated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    evidence = db.relationship('ArchivedEvidence', lazy=True, viewonly=True,
+                               primaryjoin='ArchivedReport.id == foreign(ArchivedEvidence.report_id)')
+    
+    search_rank = query_expression()
+    
+    is_archived = True
+    
+    __table_args__ = (
+        db.Index('ix_reports_archive_created_at_id', 'created_at', 'id'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+    
+    def __repr__(self):
+        return f'<ArchivedReport {self.report_id}>'
+
+
+attach_search_ddl(ArchivedReport.__table__)
+
+
+class ArchivedEvidence(db.Model):
+    __tablename__ = 'evidence_archive'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    filename = db.Column(db.String(255), nullable=False)
+    content_hash = db.Column(db.String(64), index=True)
+    original_filename = db.Column(db.String(255), nullable=False)
+    file_type = db.Column(db.String(50))
+    file_size = db.Column(db.Integer)
+    uploaded_at = db.Column(db.DateTime)
+    report_id = db.Column(db.Integer, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<ArchivedEvidence {self.original_filename}>'
+
+
+# ==============================
+# Near-Duplicate Index Models
+# ==============================
+class ReportSignature(db.Model):
+    """MinHash signature of a report's description and the near-duplicate cluster it joined"""
+    __tablename__ = 'report_signatures'
+    
+    report_id = db.Column(db.Integer, db.ForeignKey('reports.id', ondelete='CASCADE'), primary_key=True)
+    signature = db.Column(db.LargeBinary, nullable=False)  # Packed 32-bit MinHash values
+    cluster_id = db.Column(db.Integer, nullable=False, index=True)  # Id of the cluster's first report
+    
+    def __repr__(self):
+        return f'<ReportSignature {self.report_id} cluster {self.cluster_id}>'
+
+
+class ReportBucket(db.Model):
+    """One LSH band of a report's signature; reports sharing a (band, bucket) are candidates"""
+    __tablename__ = 'report_lsh_buckets'
+    
+    band = db.Column(db.SmallInteger, primary_key=True)
+    bucket = db.Column(db.BigInteger, primary_key=True)
+    report_id = db.Column(db.Integer, db.ForeignKey('reports.id', ondelete='CASCADE'), primary_key=True,
+                          index=True)
+    
+    def __repr__(self):
+        return f'<ReportBucket {self.band}:{self.bucket} {self.report_id}>'
+
+
+# ==============================
+# Report History Model
+# ==============================
+class ReportEvent(db.Model):
+    """
+    Append-only timeline of what happened to a report, and who did it.
+    Written in batches by services/history.py; not tied to the reports
+    table, so the history outlives deletion and archiving.
+    """
+    __tablename__ = 'report_events'
+    
+    id = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True)
+    report_id = db.Column(db.Integer, nullable=False)
+    event_type = db.Column(db.String(30), nullable=False)  # created, imported, edited, status_changed, deleted, archived
+    old_status = db.Column(db.String(30))
+    new_status = db.Column(db.String(30))
+    actor = db.Column(db.String(80), nullable=False)  # Admin username, 'citizen' or 'system'
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # A report's timeline is one range scan
+        db.Index('ix_report_events_report_id_created_at', 'report_id', 'created_at'),
+    )
+    
+    def __repr__(self):
+        return f'<ReportEvent {self.report_id} {self.event_type}>'
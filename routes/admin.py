@@ -1,14 +1,88 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, send_from_directory, current_app, make_response
+from flask import Blueprint, render_template, request, redirect, url_for, flash, send_from_directory, current_app, Response, stream_with_context, abort, jsonify
+from markupsafe import Markup
+from werkzeug.security import safe_join
 from flask_login import login_user, logout_user, login_required, current_user
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload, with_expression
 from extensions import db
-from models import Admin, Report, Evidence
-from datetime import datetime
+from models import Admin, Report, Evidence, ArchivedReport, ArchivedEvidence
+from services.stats import get_dashboard_stats, invalidate_dashboard_stats
+from services.pagination import ARCHIVED_CREATED_AT_SORT, CREATED_AT_SORT, KeysetSort, keyset_paginate, count_reports
+from services.search import apply_search
+from services.storage import content_hash_of
+from services.jobs import enqueue
+from services.bulk import bulk_update_status, bulk_delete
+from services.thumbnails import thumbnail_for
+from services.report_cache import invalidate_report, invalidate_reports
+from services.metrics import render_metrics
+from services.ingest import import_format, import_reports as ingest_reports, rejects_folder
+from services.rollups import GROUPINGS, adjust_daily_stats, daily_series, report_change
+from services.replica import replica_reads
+from services.bundle import stream_bundle
+from services.similarity import remove_from_index, similar_counts, similar_reports
+from services.events import publish, stream_events, subscribe
+from services.history import record, timeline
+from datetime import datetime, timedelta
 import csv
+import itertools
+import hmac
 from io import StringIO
+import mimetypes
 import os
+import secrets
 
 admin_bp = Blueprint('admin', __name__)
 
+EXPORT_BATCH_SIZE = 1000
+
+def _report_filters(params=None):
+    """Read the report filter parameters shared by the dashboard, export and bulk actions"""
+    params = request.args if params is None else params
+    return {
+        'status_filter': params.get('status', ''),
+        'type_filter': params.get('type', ''),
+        'date_from': params.get('date_from', ''),
+        'date_to': params.get('date_to', ''),
+        'q': params.get('q', '').strip(),
+        'include_archived': params.get('archived', '') == '1',
+    }
+
+def _filter_params(filters):
+    """URL parameters that _report_filters reads back as the same filters"""
+    params = {
+        'status': filters['status_filter'],
+        'type': filters['type_filter'],
+        'date_from': filters['date_from'],
+        'date_to': filters['date_to'],
+        'q': filters['q'],
+        'archived': '1' if filters['include_archived'] else '',
+    }
+    return {name: value for name, value in params.items() if value}
+
+def _apply_report_filters(query, filters, model=Report):
+    """Apply the status, type and date range filters to a report or archived report query"""
+    if filters['status_filter']:
+        query = query.filter(model.status == filters['status_filter'])
+    
+    if filters['type_filter']:
+        query = query.filter(model.corruption_type == filters['type_filter'])
+    
+    if filters['date_from']:
+        try:
+            date_from_obj = datetime.strptime(filters['date_from'], '%Y-%m-%d')
+            query = query.filter(model.created_at >= date_from_obj)
+        except ValueError:
+            pass
+    
+    if filters['date_to']:
+        try:
+            date_to_obj = datetime.strptime(filters['date_to'], '%Y-%m-%d')
+            query = query.filter(model.created_at <= date_to_obj)
+        except ValueError:
+            pass
+    
+    return query
+
 @admin_bp.route('/login', methods=['GET', 'POST'])
 def login():
     if current_user.is_authenticated:
@@ -38,75 +112,92 @@ def logout():
 
 @admin_bp.route('/dashboard')
 @login_required
+@replica_reads
 def dashboard():
     from models import Report
     from app import db
     
     # Get filter parameters
-    status_filter = request.args.get('status', '')
-    type_filter = request.args.get('type', '')
-    date_from = request.args.get('date_from', '')
-    date_to = request.args.get('date_to', '')
-    page = request.args.get('page', 1, type=int)
-    
-    # Build query
-    query = Report.query
-    
-    if status_filter:
-        query = query.filter_by(status=status_filter)
-    
-    if type_filter:
-        query = query.filter_by(corruption_type=type_filter)
-    
-    if date_from:
-        try:
-            date_from_obj = datetime.strptime(date_from, '%Y-%m-%d')
-            query = query.filter(Report.created_at >= date_from_obj)
-        except ValueError:
-            pass
-    
-    if date_to:
-        try:
-            date_to_obj = datetime.strptime(date_to, '%Y-%m-%d')
-            query = query.filter(Report.created_at <= date_to_obj)
-        except ValueError:
-            pass
-    
-    # Order by most recent first
-    query = query.order_by(Report.created_at.desc())
-    
-    # Paginate
-    reports = query.paginate(page=page, per_page=current_app.config['REPORTS_PER_PAGE'], error_out=False)
+    filters = _report_filters()
+    cursor = request.args.get('cursor')
+    
+    # Build query, loading evidence for the whole page in one query
+    query = _apply_report_filters(Report.query, filters).options(selectinload(Report.evidence))
+    
+    # Full-text search results are ordered by relevance instead of date
+    sort = CREATED_AT_SORT
+    if filters['q']:
+        query, rank = apply_search(query, filters['q'])
+        query = query.options(with_expression(Report.search_rank, rank))
+        sort = KeysetSort(rank, 'search_rank', float, float)
+    
+    # Archived reports, when asked for, are merged into the same ordering
+    merge_with = []
+    if filters['include_archived']:
+        archived_query = _apply_report_filters(ArchivedReport.query, filters, ArchivedReport) \
+            .options(selectinload(ArchivedReport.evidence))
+        archived_sort = ARCHIVED_CREATED_AT_SORT
+        if filters['q']:
+            archived_query, archived_rank = apply_search(archived_query, filters['q'], ArchivedReport)
+            archived_query = archived_query.options(with_expression(ArchivedReport.search_rank, archived_rank))
+            archived_sort = KeysetSort(archived_rank, 'search_rank', float, float, ArchivedReport.id)
+        merge_with.append((archived_query, archived_sort))
+    
+    # Get statistics and corruption types from the cached aggregate
+    stats = get_dashboard_stats()
+    
+    # The unfiltered total is already known; filtered totals may be estimated
+    if any(filters.values()):
+        total, total_is_estimate = count_reports(query, current_app.config['EXACT_COUNT_LIMIT'])
+        for archived_query, _ in merge_with:
+            archived_total, archived_is_estimate = count_reports(archived_query,
+                                                                 current_app.config['EXACT_COUNT_LIMIT'])
+            total += archived_total
+            total_is_estimate = total_is_estimate or archived_is_estimate
+    else:
+        total, total_is_estimate = stats['total_reports'], False
     
-    # Get statistics
-    total_reports = Report.query.count()
-    pending_reports = Report.query.filter_by(status='Pending').count()
-    reviewed_reports = Report.query.filter_by(status='Reviewed').count()
-    resolved_reports = Report.query.filter_by(status='Resolved').count()
+    # Keyset pagination on (created_at or rank, id), best first
+    reports = keyset_paginate(query, current_app.config['REPORTS_PER_PAGE'], cursor,
+                              total, total_is_estimate, sort, merge_with)
     
-    # Get unique corruption types
-    corruption_types = db.session.query(Report.corruption_type).distinct().all()
-    corruption_types = [t[0] for t in corruption_types]
+    # Near-duplicate counts for the reports on this page
+    similar = similar_counts([report.id for report in reports.items if not report.is_archived])
     
     return render_template('admin/dashboard.html',
                          reports=reports,
-                         total_reports=total_reports,
-                         pending_reports=pending_reports,
-                         reviewed_reports=reviewed_reports,
-                         resolved_reports=resolved_reports,
-                         corruption_types=corruption_types,
-                         status_filter=status_filter,
-                         type_filter=type_filter,
-                         date_from=date_from,
-                         date_to=date_to)
+                         similar=similar,
+                         filter_params=_filter_params(filters),
+                         **stats,
+                         **filters)
 
 @admin_bp.route('/report/<int:report_id>')
 @login_required
+@replica_reads
 def view_report(report_id):
     from datetime import datetime
     
     report = Report.query.get_or_404(report_id)
-    return render_template('admin/view_report.html', report=report, now=datetime.utcnow)
+    
+    # Previews use the small derivatives, never the full-size evidence
+    thumbnails = {evidence.id: thumbnail_for(evidence) for evidence in report.evidence}
+    
+    # Likely copies of this report, from its near-duplicate cluster
+    similar, similar_total = similar_reports(report.id, current_app.config['SIMILAR_REPORTS_LIMIT'])
+    
+    return render_template('admin/view_report.html', report=report, thumbnails=thumbnails,
+                           similar=similar, similar_total=similar_total, history=timeline(report.id),
+                           now=datetime.utcnow)
+
+@admin_bp.route('/archive/<int:report_id>')
+@login_required
+@replica_reads
+def view_archived_report(report_id):
+    report = ArchivedReport.query.filter_by(id=report_id).first_or_404()
+    thumbnails = {evidence.id: thumbnail_for(evidence) for evidence in report.evidence}
+    
+    return render_template('admin/view_report.html', report=report, thumbnails=thumbnails,
+                           history=timeline(report.id), now=datetime.utcnow)
 
 @admin_bp.route('/report/<int:report_id>/update_status', methods=['POST'])
 @login_required
@@ -114,13 +205,21 @@ def update_status(report_id):
     from models import Report
     from app import db
     
-    report = Report.query.get_or_404(report_id)
+    # Locked until commit, so a concurrent change cannot move the report out of the same rollup bucket
+    report = Report.query.filter_by(id=report_id).with_for_update().first_or_404()
     new_status = request.form.get('status')
     
     if new_status in ['Pending', 'Reviewed', 'Resolved']:
+        previous = report_change(report, -1)
+        publish('status_changed', id=report.id, report_id=report.report_id,
+                old_status=report.status or 'Pending', status=new_status)
+        record(report.id, 'status_changed', report.status or 'Pending', new_status)
         report.status = new_status
         report.updated_at = datetime.utcnow()
+        adjust_daily_stats([previous, report_change(report, 1)])
         db.session.commit()
+        invalidate_dashboard_stats()
+        invalidate_report(report.report_id)
         flash(f'Report {report.report_id} status updated to {new_status}', 'success')
     else:
         flash('Invalid status', 'danger')
@@ -133,85 +232,328 @@ def delete_report(report_id):
     from models import Report
     from app import db
     
-    report = Report.query.get_or_404(report_id)
+    report = Report.query.filter_by(id=report_id).with_for_update().first_or_404()
     
-    # Delete associated evidence files
-    for evidence in report.evidence:
-        filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], evidence.filename)
-        if os.path.exists(filepath):
-            os.remove(filepath)
+    # Evidence files no other report shares are deleted by a background job
+    enqueue('release_files', files=[(evidence.filename, evidence.content_hash)
+                                    for evidence in report.evidence])
     
+    adjust_daily_stats([report_change(report, -1)])
+    remove_from_index([report.id])
+    publish('report_deleted', id=report.id, report_id=report.report_id, status=report.status or 'Pending')
+    record(report.id, 'deleted', report.status or 'Pending')
     db.session.delete(report)
     db.session.commit()
+    invalidate_dashboard_stats()
+    invalidate_report(report.report_id)
     
     flash(f'Report {report.report_id} has been deleted', 'success')
     return redirect(url_for('admin.dashboard'))
 
-@admin_bp.route('/export')
+@admin_bp.route('/reports/bulk', methods=['POST'])
 @login_required
-def export_reports():
-    from models import Report
-    
-    # Get filter parameters
-    status_filter = request.args.get('status', '')
-    type_filter = request.args.get('type', '')
-    date_from = request.args.get('date_from', '')
-    date_to = request.args.get('date_to', '')
-    
-    # Build query
-    query = Report.query
-    
-    if status_filter:
-        query = query.filter_by(status=status_filter)
+def bulk_action():
+    action = request.form.get('action')
+    scope = request.form.get('scope')
+    filters = _report_filters(request.form)
+    redirect_url = url_for('admin.dashboard', **_filter_params(filters))
+    
+    # Select either the checked reports or everything matching the current filters
+    id_query = db.session.query(Report.id)
+    if scope == 'filter':
+        id_query = _apply_report_filters(id_query, filters)
+        if filters['q']:
+            id_query, _ = apply_search(id_query, filters['q'])
+    else:
+        report_ids = request.form.getlist('report_ids', type=int)
+        if not report_ids:
+            flash('No reports selected', 'warning')
+            return redirect(redirect_url)
+        id_query = id_query.filter(Report.id.in_(report_ids))
+    
+    if action == 'status':
+        new_status = request.form.get('new_status')
+        if new_status not in ['Pending', 'Reviewed', 'Resolved']:
+            flash('Invalid status', 'danger')
+            return redirect(redirect_url)
+        count = bulk_update_status(id_query, new_status)
+        message = f'{count} report(s) updated to {new_status}'
+    elif action == 'delete':
+        count = bulk_delete(id_query)
+        message = f'{count} report(s) deleted'
+    else:
+        flash('Invalid action', 'danger')
+        return redirect(redirect_url)
     
-    if type_filter:
-        query = query.filter_by(corruption_type=type_filter)
+    # Too many rows to describe one by one; open dashboards reload instead
+    publish('refresh')
+    db.session.commit()
+    invalidate_dashboard_stats()
+    invalidate_reports()
     
-    if date_from:
-        try:
-            date_from_obj = datetime.strptime(date_from, '%Y-%m-%d')
-            query = query.filter(Report.created_at >= date_from_obj)
-        except ValueError:
-            pass
+    flash(message, 'success')
+    return redirect(redirect_url)
+
+def _export_query(filters, model=Report, evidence_model=Evidence):
+    """Column query behind the CSV export, for the operational or the archive tables"""
+    # Evidence counts come from one grouped subquery instead of a lazy load per report
+    evidence_counts = db.session.query(
+        evidence_model.report_id.label('report_id'),
+        func.count(evidence_model.id).label('evidence_count')
+    ).group_by(evidence_model.report_id).subquery()
+    
+    query = db.session.query(
+        model.report_id,
+        model.corruption_type,
+        model.description,
+        model.location,
+        model.status,
+        model.created_at,
+        model.updated_at,
+        func.coalesce(evidence_counts.c.evidence_count, 0).label('evidence_count')
+    ).outerjoin(evidence_counts, evidence_counts.c.report_id == model.id)
+    
+    query = _apply_report_filters(query, filters, model)
+    
+    if filters['q']:
+        query, rank = apply_search(query, filters['q'], model)
+        query = query.order_by(rank.desc(), model.id.desc())
+    else:
+        query = query.order_by(model.created_at.desc())
     
-    if date_to:
-        try:
-            date_to_obj = datetime.strptime(date_to, '%Y-%m-%d')
-            query = query.filter(Report.created_at <= date_to_obj)
-        except ValueError:
-            pass
+    # yield_per streams rows in batches (a server-side cursor on Postgres)
+    return query.yield_per(EXPORT_BATCH_SIZE)
+
+@admin_bp.route('/export')
+@login_required
+@replica_reads
+def export_reports():
+    filters = _report_filters()
+    include_archived = filters['include_archived']
+    
+    rows = _export_query(filters)
+    if include_archived:
+        # Archived reports follow the operational ones, read once those are done
+        rows = itertools.chain(
+            ((row, False) for row in rows),
+            ((row, True) for row in _export_query(filters, ArchivedReport, ArchivedEvidence))
+        )
+    else:
+        rows = ((row, False) for row in rows)
     
-    reports = query.order_by(Report.created_at.desc()).all()
-    
-    # Create CSV
-    si = StringIO()
-    writer = csv.writer(si)
-    
-    # Write header
-    writer.writerow(['Report ID', 'Corruption Type', 'Description', 'Location', 'Status', 
-                     'Created At', 'Updated At', 'Evidence Count'])
-    
-    # Write data
-    for report in reports:
-        writer.writerow([
-            report.report_id,
-            report.corruption_type,
-            report.description,
-            report.location or 'N/A',
-            report.status,
-            report.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            report.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
-            len(report.evidence)
-        ])
+    def generate():
+        si = StringIO()
+        writer = csv.writer(si)
+        
+        # Write header
+        header = ['Report ID', 'Corruption Type', 'Description', 'Location', 'Status', 
+                  'Created At', 'Updated At', 'Evidence Count']
+        writer.writerow(header + ['Archived'] if include_archived else header)
+        
+        # Write data, flushing the buffer once per batch
+        for i, (row, archived) in enumerate(rows, 1):
+            values = [
+                row.report_id,
+                row.corruption_type,
+                row.description,
+                row.location or 'N/A',
+                row.status,
+                row.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                row.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
+                row.evidence_count
+            ]
+            writer.writerow(values + ['Yes' if archived else 'No'] if include_archived else values)
+            if i % EXPORT_BATCH_SIZE == 0:
+                yield si.getvalue()
+                si.seek(0)
+                si.truncate(0)
+        
+        yield si.getvalue()
     
     # Create response
-    output = make_response(si.getvalue())
+    output = Response(stream_with_context(generate()), mimetype='text/csv')
     output.headers["Content-Disposition"] = f"attachment; filename=reports_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    output.headers["Content-type"] = "text/csv"
     
     return output
 
-@admin_bp.route('/uploads/<filename>')
+def _bundle_query(filters, model=Report, evidence_model=Evidence):
+    """One row per evidence file of the filtered reports, in a stable order"""
+    query = db.session.query(
+        model.report_id,
+        model.corruption_type,
+        model.status,
+        model.location,
+        model.created_at,
+        evidence_model.id.label('evidence_id'),
+        evidence_model.filename,
+        evidence_model.original_filename,
+        evidence_model.file_type,
+        evidence_model.file_size,
+        evidence_model.content_hash,
+        evidence_model.uploaded_at
+    ).join(evidence_model, evidence_model.report_id == model.id)
+    
+    query = _apply_report_filters(query, filters, model)
+    if filters['q']:
+        query, _ = apply_search(query, filters['q'], model)
+    
+    return query.order_by(model.created_at.desc(), model.id.desc(), evidence_model.id) \
+        .yield_per(EXPORT_BATCH_SIZE)
+
+@admin_bp.route('/export/evidence')
+@login_required
+@replica_reads
+def export_evidence():
+    """ZIP of every evidence file of the filtered reports, with a CSV manifest"""
+    filters = _report_filters()
+    
+    rows = _bundle_query(filters)
+    if filters['include_archived']:
+        rows = itertools.chain(rows, _bundle_query(filters, ArchivedReport, ArchivedEvidence))
+    
+    # Written on the fly from disk in one pass; the manifest lists the rows that pass streamed
+    output = Response(stream_with_context(stream_bundle(rows)),
+                      mimetype='application/zip')
+    output.headers["Content-Disposition"] = f"attachment; filename=evidence_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    return output
+
+@admin_bp.route('/stats/daily')
+@login_required
+@replica_reads
+def daily_stats():
+    """Reports per day by type or status, answered from the daily rollups"""
+    group = request.args.get('group', 'type')
+    today = datetime.utcnow().date()
+    
+    try:
+        date_to = datetime.strptime(request.args['date_to'], '%Y-%m-%d').date() \
+            if request.args.get('date_to') else today
+        date_from = datetime.strptime(request.args['date_from'], '%Y-%m-%d').date() \
+            if request.args.get('date_from') else date_to - timedelta(days=89)
+    except ValueError:
+        return jsonify(error='Dates must be YYYY-MM-DD'), 400
+    
+    if group not in GROUPINGS:
+        return jsonify(error=f"group must be one of {', '.join(GROUPINGS)}"), 400
+    if date_from > date_to or (date_to - date_from).days > current_app.config['DAILY_STATS_MAX_DAYS']:
+        return jsonify(error='Invalid date range'), 400
+    
+    days, series = daily_series(date_from, date_to, group)
+    return jsonify(
+        date_from=date_from.isoformat(),
+        date_to=date_to.isoformat(),
+        group=group,
+        days=[day.isoformat() for day in days],
+        series=series,
+        totals={name: sum(counts) for name, counts in series.items()},
+    )
+
+@admin_bp.route('/import', methods=['POST'])
+@login_required
+def import_reports():
+    """Bulk load reports from an uploaded partner CSV or JSONL file"""
+    upload = request.files.get('file')
+    fmt = import_format(upload.filename) if upload else None
+    wants_json = request.accept_mimetypes.best == 'application/json'
+    
+    if fmt is None:
+        message = 'Please choose a .csv or .jsonl file to import'
+        if wants_json:
+            return jsonify(error=message), 400
+        flash(message, 'danger')
+        return redirect(url_for('admin.dashboard'))
+    
+    os.makedirs(rejects_folder(), exist_ok=True)
+    rejects_name = f'rejects-{datetime.utcnow():%Y%m%d-%H%M%S}-{secrets.token_hex(4)}.{fmt}'
+    
+    result = ingest_reports(upload.stream, fmt, os.path.join(rejects_folder(), rejects_name))
+    
+    invalidate_dashboard_stats()
+    invalidate_reports()
+    
+    rejects_url = url_for('admin.import_rejects', filename=rejects_name) if result.rejected else None
+    if wants_json:
+        if result.error:
+            # Batches before the failure are already committed
+            return jsonify(error=f'Import stopped, {result.error}', imported=result.imported,
+                           rejected=result.rejected, rejects_url=rejects_url), 400
+        return jsonify(imported=result.imported, rejected=result.rejected, rejects_url=rejects_url)
+    
+    if result.error:
+        flash(f'Import stopped after {result.imported} report(s), {result.error}', 'danger')
+    if result.rejected:
+        flash(Markup('Imported {} report(s); {} row(s) were rejected. <a href="{}">Download the rejected rows</a>')
+              .format(result.imported, result.rejected, rejects_url), 'warning')
+    elif not result.error:
+        flash(f'Imported {result.imported} report(s)', 'success')
+    return redirect(url_for('admin.dashboard'))
+
+@admin_bp.route('/import/rejects/<filename>')
+@login_required
+def import_rejects(filename):
+    return send_from_directory(rejects_folder(), filename, as_attachment=True)
+
+@admin_bp.route('/uploads/<path:filename>')
 @login_required
 def uploaded_file(filename):
-    return send_from_directory(current_app.config['UPLOAD_FOLDER'], filename)
\ No newline at end of file
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    path = safe_join(upload_folder, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    
+    # Content-addressed files get a strong ETag that is simply their hash
+    etag = content_hash_of(filename)
+    max_age = current_app.config['EVIDENCE_MAX_AGE'] if etag else 0
+    offload = current_app.config['EVIDENCE_OFFLOAD']
+    
+    if offload == 'x-accel-redirect':
+        if etag and request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            # nginx serves the bytes (including Range requests) from an internal location
+            response = Response(mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+            response.headers['X-Accel-Redirect'] = current_app.config['EVIDENCE_ACCEL_PREFIX'] + filename
+        if etag:
+            response.set_etag(etag)
+    else:
+        # conditional=True answers If-None-Match with 304 and Range with 206;
+        # with USE_X_SENDFILE the body is left to the front server
+        response = send_from_directory(upload_folder, filename, etag=etag or True,
+                                       max_age=max_age, conditional=True)
+    
+    # Evidence is only for authenticated admins, so shared caches must not keep it
+    response.cache_control.public = False
+    response.cache_control.private = True
+    response.cache_control.max_age = max_age
+    if etag:
+        response.cache_control.immutable = True
+    return response
+
+@admin_bp.route('/events')
+@login_required
+def events():
+    """Server-Sent Events stream of report changes for the live dashboard"""
+    if not current_app.config['LIVE_DASHBOARD']:
+        abort(404)
+    
+    # The stream itself never touches the database, so this request's
+    # connection goes back to the pool as soon as the view returns
+    subscription = subscribe()
+    response = Response(stream_events(subscription, current_app.config['SSE_HEARTBEAT']),
+                        mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    return response
+
+
+@admin_bp.route('/metrics')
+def metrics():
+    """Prometheus metrics, summed over the worker processes"""
+    token = current_app.config['METRICS_TOKEN']
+    authorization = request.headers.get('Authorization', '')
+    scraper = token and hmac.compare_digest(authorization, f'Bearer {token}')
+    
+    if not (scraper or current_user.is_authenticated):
+        abort(401)
+    
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
@@ -1,7 +1,19 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
+from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app, abort
 from werkzeug.utils import secure_filename
 from extensions import db
 from models import Report, Evidence
+from services.stats import invalidate_dashboard_stats
+from services.storage import store_stream
+from services.jobs import enqueue
+from services.uploads import load_evidence_token
+from services.thumbnails import schedule_thumbnails
+from services.report_cache import get_report_snapshot, invalidate_report
+from services.ratelimit import lookup_limiter
+from services.rollups import adjust_daily_stats, report_change
+from services.similarity import index_report
+from services.events import publish, report_payload
+from services.history import record
+from services.page_cache import cached_page
 import os
 import secrets
 from datetime import datetime
@@ -12,6 +24,45 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
+def save_evidence(report, files):
+    """
+    Store uploaded evidence files and add an Evidence row for each.
+    Returns (filename, content_hash, file_type) for the files stored.
+    """
+    stored = []
+    for file in files:
+        if file and file.filename and allowed_file(file.filename):
+            filename = secure_filename(file.filename)
+            ext = os.path.splitext(filename)[1]
+            
+            # Files are stored once per distinct content, hashed while streaming to disk
+            stored_name, content_hash, file_size = store_stream(file.stream, ext[1:])
+            
+            evidence = Evidence(
+                filename=stored_name,
+                content_hash=content_hash,
+                original_filename=filename,
+                file_type=ext[1:],
+                file_size=file_size,
+                report_id=report.id
+            )
+            db.session.add(evidence)
+            stored.append((stored_name, content_hash, ext[1:]))
+    return stored
+
+def attach_uploaded_evidence(report, tokens):
+    """
+    Add Evidence rows for files already stored through a chunked upload.
+    Returns (filename, content_hash, file_type) for the files attached.
+    """
+    stored = []
+    for token in tokens:
+        upload = load_evidence_token(token)
+        if upload:
+            db.session.add(Evidence(report_id=report.id, **upload))
+            stored.append((upload['filename'], upload['content_hash'], upload['file_type']))
+    return stored
+
 def generate_report_id():
     """Generate unique report ID"""
     timestamp = datetime.utcnow().strftime('%Y%m%d')
@@ -19,10 +70,12 @@ def generate_report_id():
     return f'ACR-{timestamp}-{random_str}'
 
 @citizen_bp.route('/')
+@cached_page
 def index():
     return render_template('citizen/index.html')
 
 @citizen_bp.route('/report', methods=['GET', 'POST'])
+@cached_page
 def submit_report():
     from models import Report, Evidence
     from app import db
@@ -46,34 +99,20 @@ def submit_report():
         
         db.session.add(report)
         db.session.flush()  # Get report ID before committing
+        adjust_daily_stats([report_change(report, 1)])
+        index_report(report)
         
         # Handle file uploads
+        stored = attach_uploaded_evidence(report, request.form.getlist('evidence_token'))
         if 'evidence' in request.files:
-            files = request.files.getlist('evidence')
-            for file in files:
-                if file and file.filename and allowed_file(file.filename):
-                    filename = secure_filename(file.filename)
-                    # Add timestamp to filename to prevent collisions
-                    name, ext = os.path.splitext(filename)
-                    unique_filename = f"{name}_{secrets.token_hex(8)}{ext}"
-                    
-                    filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
-                    file.save(filepath)
-                    
-                    # Get file size
-                    file_size = os.path.getsize(filepath)
-                    
-                    # Create evidence record
-                    evidence = Evidence(
-                        filename=unique_filename,
-                        original_filename=filename,
-                        file_type=ext[1:],
-                        file_size=file_size,
-                        report_id=report.id
-                    )
-                    db.session.add(evidence)
+            stored += save_evidence(report, request.files.getlist('evidence'))
         
+        publish('report_created', **report_payload(report))
+        record(report.id, 'created', new_status=report.status or 'Pending')
         db.session.commit()
+        invalidate_dashboard_stats()
+        invalidate_report(report.report_id)
+        schedule_thumbnails(stored)
         
         flash(f'Report submitted successfully! Your report ID is: {report.report_id}', 'success')
         return redirect(url_for('citizen.success', report_id=report.report_id))
@@ -81,11 +120,17 @@ def submit_report():
     return render_template('citizen/report_form.html')
 
 @citizen_bp.route('/success/<report_id>')
+@lookup_limiter.limit
 def success(report_id):
-    report = Report.query.filter_by(report_id=report_id).first_or_404()
+    report = get_report_snapshot(report_id)
+    if report is None:
+        abort(404)
     return render_template('citizen/success.html', report=report)
 
+# The cached form is served before the limiter, so only lookups take tokens
 @citizen_bp.route('/track', methods=['GET', 'POST'])
+@cached_page
+@lookup_limiter.limit
 def track_report():
     if request.method == 'POST':
         report_id = request.form.get('report_id')
@@ -94,7 +139,7 @@ def track_report():
             flash('Please enter a Report ID.', 'danger')
             return redirect(url_for('citizen.track_report'))
         
-        report = Report.query.filter_by(report_id=report_id.strip().upper()).first()
+        report = get_report_snapshot(report_id.strip().upper())
         
         if not report:
             flash('Report not found. Please check your Report ID and try again.', 'danger')
@@ -105,13 +150,24 @@ def track_report():
     return render_template('citizen/track_report.html')
 
 @citizen_bp.route('/manage/<report_id>', methods=['GET', 'POST'])
+@lookup_limiter.limit
 def manage_report(report_id):
-    report = Report.query.filter_by(report_id=report_id).first_or_404()
+    snapshot = get_report_snapshot(report_id)
+    if snapshot is None:
+        abort(404)
     
     # Check if report can be edited (only if status is still Pending)
-    can_edit = report.status == 'Pending'
+    can_edit = snapshot.status == 'Pending'
     
     if request.method == 'POST' and can_edit:
+        # Writes work on the live row, locked against concurrent status changes;
+        # the cached snapshot may be a few seconds old
+        report = db.session.get(Report, snapshot.id, with_for_update=True)
+        if report is None or report.status != 'Pending':
+            invalidate_report(report_id)
+            flash('This report can no longer be edited.', 'danger')
+            return redirect(url_for('citizen.manage_report', report_id=report_id))
+        
         action = request.form.get('action')
         
         if action == 'update':
@@ -121,35 +177,25 @@ def manage_report(report_id):
             location = request.form.get('location')
             
             if corruption_type and description:
+                previous = report_change(report, -1)
+                description_changed = description != report.description
                 report.corruption_type = corruption_type
                 report.description = description
                 report.location = location
                 report.updated_at = datetime.utcnow()
                 
                 # Handle new evidence uploads
+                stored = attach_uploaded_evidence(report, request.form.getlist('evidence_token'))
                 if 'evidence' in request.files:
-                    files = request.files.getlist('evidence')
-                    for file in files:
-                        if file and file.filename and allowed_file(file.filename):
-                            filename = secure_filename(file.filename)
-                            name, ext = os.path.splitext(filename)
-                            unique_filename = f"{name}_{secrets.token_hex(8)}{ext}"
-                            
-                            filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
-                            file.save(filepath)
-                            
-                            file_size = os.path.getsize(filepath)
-                            
-                            evidence = Evidence(
-                                filename=unique_filename,
-                                original_filename=filename,
-                                file_type=ext[1:],
-                                file_size=file_size,
-                                report_id=report.id
-                            )
-                            db.session.add(evidence)
+                    stored += save_evidence(report, request.files.getlist('evidence'))
                 
+                adjust_daily_stats([previous, report_change(report, 1)])
+                if description_changed:
+                    index_report(report)
+                record(report.id, 'edited')
                 db.session.commit()
+                invalidate_dashboard_stats()
+                schedule_thumbnails(stored)
                 flash('Report updated successfully!', 'success')
             else:
                 flash('Please fill in all required fields.', 'danger')
@@ -159,14 +205,14 @@ def manage_report(report_id):
             evidence = Evidence.query.filter_by(id=evidence_id, report_id=report.id).first()
             
             if evidence:
-                filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], evidence.filename)
-                if os.path.exists(filepath):
-                    os.remove(filepath)
-                
+                # The file goes, in the background, once no other evidence shares its content
+                enqueue('release_files', files=[(evidence.filename, evidence.content_hash)])
                 db.session.delete(evidence)
                 db.session.commit()
+                invalidate_dashboard_stats()
                 flash('Evidence file deleted successfully!', 'success')
         
+        invalidate_report(report_id)
         return redirect(url_for('citizen.manage_report', report_id=report_id))
     
-    return render_template('citizen/manage_report.html', report=report, can_edit=can_edit)
+    return render_template('citizen/manage_report.html', report=snapshot, can_edit=can_edit)
@@ -0,0 +1,48 @@
+from flask import Blueprint, request, jsonify, url_for
+from werkzeug.utils import secure_filename
+from routes.citizen import allowed_file
+from services.uploads import UploadError, start_upload, upload_status, append_part, complete_upload
+from services.ratelimit import upload_limiter
+import os
+
+uploads_bp = Blueprint('uploads', __name__)
+
+@uploads_bp.errorhandler(UploadError)
+def handle_upload_error(error):
+    return jsonify(error=str(error), **error.extra), error.status
+
+@uploads_bp.route('', methods=['POST'])
+@upload_limiter.limit
+def start():
+    """Open a chunked upload; the client then PUTs fixed-size parts in order"""
+    data = request.get_json(silent=True) or {}
+    filename = secure_filename(data.get('filename') or '')
+    
+    if not filename or not allowed_file(filename):
+        raise UploadError('File type not allowed')
+    
+    try:
+        size = int(data.get('size'))
+    except (TypeError, ValueError):
+        raise UploadError('File size is required')
+    
+    upload_id, meta = start_upload(filename, os.path.splitext(filename)[1][1:], size)
+    return jsonify(upload_id=upload_id,
+                   chunk_size=meta['chunk_size'],
+                   url=url_for('uploads.status', upload_id=upload_id)), 201
+
+@uploads_bp.route('/<upload_id>', methods=['GET'])
+def status(upload_id):
+    """Report how many bytes have arrived so an interrupted upload can resume"""
+    meta, received = upload_status(upload_id)
+    return jsonify(size=meta['size'], chunk_size=meta['chunk_size'], received=received)
+
+@uploads_bp.route('/<upload_id>/<int:index>', methods=['PUT'])
+def put_part(upload_id, index):
+    received = append_part(upload_id, index, request.stream)
+    return jsonify(received=received)
+
+@uploads_bp.route('/<upload_id>/complete', methods=['POST'])
+def complete(upload_id):
+    """Finalize the upload; the returned token is submitted with the report form"""
+    return jsonify(evidence_token=complete_upload(upload_id))
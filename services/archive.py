@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+from sqlalchemy import DateTime, func, literal, text
+from extensions import db
+from models import ArchivedEvidence, ArchivedReport, Evidence, Report
+from services.history import record
+from services.similarity import remove_from_index
+
+ARCHIVE_BATCH_SIZE = 1000
+
+REPORT_COLUMNS = ('id', 'report_id', 'corruption_type', 'description', 'location', 'status',
+                  'created_at', 'updated_at')
+EVIDENCE_COLUMNS = ('id', 'filename', 'content_hash', 'original_filename', 'file_type', 'file_size',
+                    'uploaded_at', 'report_id')
+
+
+def _month_start(value):
+    return datetime(value.year, value.month, 1)
+
+
+def _next_month(value):
+    return datetime(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def ensure_partitions(created_values):
+    """Create the monthly Postgres partitions that rows with these created_at values need"""
+    months = {_month_start(value) for value in created_values}
+    for month in sorted(months):
+        db.session.execute(text(
+            f"CREATE TABLE IF NOT EXISTS reports_archive_{month:%Y_%m} PARTITION OF reports_archive "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_next_month(month):%Y-%m-%d}')"
+        ))
+
+
+def archivable_reports(older_than_days):
+    """Resolved reports last updated more than older_than_days ago"""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    return Report.query.filter(Report.status == 'Resolved', Report.updated_at < cutoff)
+
+
+def archive_batch(report_ids):
+    """
+    Copy the reports and their evidence rows into the archive tables and
+    delete them from the operational ones, with set-based statements in the
+    caller's transaction. Evidence files are shared and stay where they are.
+    """
+    archived_at = datetime.utcnow()
+    # The archive's partition key cannot be null
+    created_at = func.coalesce(Report.created_at, Report.updated_at, archived_at)
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        ensure_partitions(db.session.execute(
+            db.select(func.distinct(func.date_trunc('month', created_at))).where(Report.id.in_(report_ids))
+        ).scalars())
+
+    report_columns = [created_at if name == 'created_at' else getattr(Report, name) for name in REPORT_COLUMNS]
+    db.session.execute(ArchivedReport.__table__.insert().from_select(
+        list(REPORT_COLUMNS) + ['archived_at'],
+        db.select(*report_columns, literal(archived_at, DateTime)).where(Report.id.in_(report_ids))
+    ))
+    db.session.execute(ArchivedEvidence.__table__.insert().from_select(
+        list(EVIDENCE_COLUMNS),
+        db.select(*[getattr(Evidence, name) for name in EVIDENCE_COLUMNS]).where(Evidence.report_id.in_(report_ids))
+    ))
+
+    for report_id, status in db.session.query(Report.id, Report.status).filter(Report.id.in_(report_ids)):
+        record(report_id, 'archived', status)
+
+    # Archived reports are not part of the near-duplicate index
+    remove_from_index(report_ids)
+    Evidence.query.filter(Evidence.report_id.in_(report_ids)).delete(synchronize_session=False)
+    Report.query.filter(Report.id.in_(report_ids)).delete(synchronize_session=False)
+
+
+def archive_resolved_reports(older_than_days, batch_size=ARCHIVE_BATCH_SIZE):
+    """Move old resolved reports to the archive, committing per batch; returns how many"""
+    archived = 0
+    while True:
+        report_ids = [report_id for (report_id,) in archivable_reports(older_than_days)
+                      .with_entities(Report.id).order_by(Report.id).limit(batch_size)]
+        if not report_ids:
+            return archived
+
+        archive_batch(report_ids)
+        db.session.commit()
+        archived += len(report_ids)
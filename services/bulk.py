@@ -0,0 +1,60 @@
+from datetime import datetime
+from sqlalchemy import func
+from extensions import db
+from models import Evidence, Report
+from services.history import record
+from services.jobs import enqueue
+from services.rollups import adjust_daily_stats, query_changes
+from services.similarity import remove_from_index
+
+BATCH_SIZE = 1000
+
+
+def lock_reports(id_query):
+    """
+    Lock the selected report rows until commit. Rollup deltas are computed
+    from the statuses read afterwards, so a concurrent status change cannot
+    be subtracted from the same bucket twice.
+    """
+    db.session.query(Report.id).filter(Report.id.in_(id_query.scalar_subquery())) \
+        .order_by(Report.id).with_for_update().all()
+
+
+def bulk_update_status(id_query, status):
+    """Set the status of every report selected by id_query in one UPDATE"""
+    lock_reports(id_query)
+    adjust_daily_stats(query_changes(id_query, -1) + query_changes(id_query, 1, status=status))
+    # Only reports whose status actually changes get a history entry
+    old_status = func.coalesce(Report.status, 'Pending')
+    changed = db.session.query(Report.id, old_status) \
+        .filter(Report.id.in_(id_query.scalar_subquery()), old_status != status)
+    for report_id, previous in changed:
+        record(report_id, 'status_changed', previous, status)
+    return Report.query.filter(Report.id.in_(id_query.scalar_subquery())) \
+        .update({'status': status, 'updated_at': datetime.utcnow()}, synchronize_session=False)
+
+
+def bulk_delete(id_query):
+    """
+    Delete the selected reports and their evidence rows with set-based
+    DELETEs, queueing file cleanup in batches. The caller commits.
+    """
+    lock_reports(id_query)
+    report_ids = [report_id for (report_id,) in id_query]
+
+    for start in range(0, len(report_ids), BATCH_SIZE):
+        batch = report_ids[start:start + BATCH_SIZE]
+        adjust_daily_stats(query_changes(db.session.query(Report.id).filter(Report.id.in_(batch)), -1))
+        for report_id, status in db.session.query(Report.id, Report.status).filter(Report.id.in_(batch)):
+            record(report_id, 'deleted', status or 'Pending')
+
+        files = db.session.query(Evidence.filename, Evidence.content_hash) \
+            .filter(Evidence.report_id.in_(batch)).all()
+        if files:
+            enqueue('release_files', files=[tuple(stored) for stored in files])
+
+        remove_from_index(batch)
+        Evidence.query.filter(Evidence.report_id.in_(batch)).delete(synchronize_session=False)
+        Report.query.filter(Report.id.in_(batch)).delete(synchronize_session=False)
+
+    return len(report_ids)
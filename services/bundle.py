@@ -0,0 +1,105 @@
+import csv
+import io
+import os
+import tempfile
+import zipfile
+from datetime import datetime
+from werkzeug.utils import secure_filename
+from services.storage import CHUNK_SIZE, absolute_path
+
+MANIFEST_NAME = 'manifest.csv'
+MANIFEST_HEADER = ['Report ID', 'Corruption Type', 'Status', 'Location', 'Created At', 'File',
+                   'Original Filename', 'File Type', 'File Size', 'SHA-256', 'Included']
+MANIFEST_SPOOL_SIZE = 1024 * 1024  # Bytes of manifest kept in memory before spilling to disk
+
+
+class _ZipOutput:
+    """Write-only, unseekable sink that zipfile writes into and the response drains"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        """Yield what has been written since the last drain, if anything"""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        if data:
+            yield data
+
+
+def _zip_time(value):
+    """ZIP timestamp for a datetime (now if None); the format cannot go before 1980"""
+    return max((value or datetime.now()).timetuple()[:6], (1980, 1, 1, 0, 0, 0))
+
+
+def bundle_path(row):
+    """Where one evidence file goes inside the bundle: <report id>/<evidence id>_<original name>"""
+    name = secure_filename(row.original_filename or '') or os.path.basename(row.filename)
+    return f'{row.report_id}/{row.evidence_id}_{name}'
+
+
+def _manifest_row(row, included):
+    return [
+        row.report_id,
+        row.corruption_type,
+        row.status,
+        row.location or 'N/A',
+        row.created_at.strftime('%Y-%m-%d %H:%M:%S') if row.created_at else '',
+        bundle_path(row),
+        row.original_filename,
+        row.file_type or '',
+        row.file_size or '',
+        row.content_hash or '',
+        included,
+    ]
+
+
+def stream_bundle(rows):
+    """
+    Yield a ZIP archive of the evidence files and a manifest as it is
+    written, from one streamed query, so memory does not grow with the
+    number or size of files. The manifest goes last and lists exactly the
+    rows whose files were streamed, spooled to a temp file once it gets
+    large. Files are stored as they are, since evidence formats are
+    already compressed; files missing on disk are flagged in the manifest.
+    """
+    output = _ZipOutput()
+    with tempfile.SpooledTemporaryFile(MANIFEST_SPOOL_SIZE, mode='w+', newline='', encoding='utf-8') as manifest:
+        writer = csv.writer(manifest)
+        writer.writerow(MANIFEST_HEADER)
+
+        with zipfile.ZipFile(output, 'w', allowZip64=True) as archive:
+            for row in rows:
+                try:
+                    source = open(absolute_path(row.filename), 'rb')
+                except OSError:
+                    writer.writerow(_manifest_row(row, 'No (file missing)'))
+                    continue
+
+                with source:
+                    info = zipfile.ZipInfo(bundle_path(row), date_time=_zip_time(row.uploaded_at))
+                    info.compress_type = zipfile.ZIP_STORED
+                    # A known size lets zipfile decide on ZIP64 headers up front
+                    info.file_size = os.fstat(source.fileno()).st_size
+                    with archive.open(info, 'w') as entry:
+                        for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                            entry.write(chunk)
+                            yield from output.drain()
+                writer.writerow(_manifest_row(row, 'Yes'))
+                yield from output.drain()
+
+            manifest.seek(0)
+            info = zipfile.ZipInfo(MANIFEST_NAME, date_time=_zip_time(None))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            with archive.open(info, 'w', force_zip64=True) as entry:
+                for chunk in iter(lambda: manifest.read(CHUNK_SIZE), ''):
+                    entry.write(chunk.encode('utf-8'))
+                    yield from output.drain()
+    yield from output.drain()
@@ -0,0 +1,181 @@
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from flask import current_app, url_for
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from extensions import db
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'report_events'
+MAX_DESCRIPTION = 200  # NOTIFY payloads are limited to 8000 bytes
+RETRY_MS = 3000  # How soon browsers reconnect after losing the stream
+
+_lock = threading.Lock()
+_subscribers = set()
+_listener = None
+_session_hooked = False
+
+
+class Subscription:
+    """One SSE client's queue of change events"""
+
+    def __init__(self, size):
+        self.events = queue.Queue(maxsize=size)
+        self.overflowed = False
+
+    def deliver(self, change):
+        try:
+            self.events.put_nowait(change)
+        except queue.Full:
+            # A client this far behind reloads instead of replaying
+            self.overflowed = True
+
+    def get(self, timeout):
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+def _broadcast(change):
+    with _lock:
+        subscribers = list(_subscribers)
+    for subscription in subscribers:
+        subscription.deliver(change)
+
+
+# ==============================
+# Publishing
+# ==============================
+def publish(kind, **data):
+    """
+    Queue a change event on the current transaction. It is sent when the
+    transaction commits (and dropped if it rolls back): with NOTIFY on
+    Postgres, so every worker hears it, or to this process's subscribers
+    on other databases.
+    """
+    db.session.info.setdefault('pending_events', []).append({'type': kind, **data})
+
+
+def report_payload(report):
+    """What the dashboard needs to render a new row"""
+    description = report.description or ''
+    return {
+        'id': report.id,
+        'report_id': report.report_id,
+        'corruption_type': report.corruption_type,
+        'description': description[:MAX_DESCRIPTION] + ('…' if len(description) > MAX_DESCRIPTION else ''),
+        'location': report.location,
+        'status': report.status or 'Pending',
+        'evidence_count': len(report.evidence),
+        'created_at': report.created_at.strftime('%Y-%m-%d %H:%M') if report.created_at else '',
+        'url': url_for('admin.view_report', report_id=report.id),
+    }
+
+
+def _notify_before_commit(session):
+    changes = session.info.get('pending_events')
+    if changes and session.get_bind().dialect.name == 'postgresql':
+        for change in changes:
+            session.execute(text('SELECT pg_notify(:channel, :payload)'),
+                            {'channel': CHANNEL, 'payload': json.dumps(change)})
+        session.info['pending_events'] = []
+
+
+def _deliver_after_commit(session):
+    changes = session.info.pop('pending_events', None)
+    if changes:
+        for change in changes:
+            _broadcast(change)
+
+
+def _discard_after_rollback(session):
+    session.info.pop('pending_events', None)
+
+
+# ==============================
+# Listening
+# ==============================
+class _PostgresListener(threading.Thread):
+    """Relays NOTIFY messages to this process's subscribers over one dedicated connection"""
+
+    def __init__(self, engine):
+        super().__init__(name='report-events-listener', daemon=True)
+        self.engine = engine
+
+    def run(self):
+        while True:
+            try:
+                self._listen()
+            except Exception:
+                logger.exception('Report event listener failed; reconnecting')
+                time.sleep(1)
+
+    def _listen(self):
+        connection = self.engine.raw_connection()
+        try:
+            driver = connection.driver_connection
+            driver.set_session(autocommit=True)
+            with driver.cursor() as cursor:
+                cursor.execute(f'LISTEN {CHANNEL}')
+            while True:
+                if select.select([driver], [], [], 5.0) == ([], [], []):
+                    continue
+                driver.poll()
+                while driver.notifies:
+                    _broadcast(json.loads(driver.notifies.pop(0).payload))
+        finally:
+            connection.invalidate()
+
+
+def subscribe():
+    """Register an SSE client, starting this process's NOTIFY listener on first use"""
+    global _listener
+    subscription = Subscription(current_app.config['SSE_QUEUE_SIZE'])
+    with _lock:
+        if _listener is None and db.engine.dialect.name == 'postgresql':
+            _listener = _PostgresListener(db.engine)
+            _listener.start()
+        _subscribers.add(subscription)
+    return subscription
+
+
+def unsubscribe(subscription):
+    with _lock:
+        _subscribers.discard(subscription)
+
+
+def stream_events(subscription, heartbeat):
+    """
+    Server-Sent Events for one client. Comments keep idle connections
+    open through proxies. The subscription is dropped when the client
+    goes away and the server closes the generator.
+    """
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        while True:
+            change = subscription.get(timeout=heartbeat)
+            if subscription.overflowed:
+                subscription.overflowed = False
+                yield 'event: refresh\ndata: {}\n\n'
+            if change is None:
+                yield ': keepalive\n\n'
+            else:
+                yield f"event: {change['type']}\ndata: {json.dumps(change)}\n\n"
+    finally:
+        unsubscribe(subscription)
+
+
+def init_events(app):
+    """Send queued change events when their transaction commits"""
+    global _session_hooked
+    if not _session_hooked:
+        event.listen(Session, 'before_commit', _notify_before_commit)
+        event.listen(Session, 'after_commit', _deliver_after_commit)
+        event.listen(Session, 'after_rollback', _discard_after_rollback)
+        _session_hooked = True
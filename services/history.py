@@ -0,0 +1,153 @@
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+from flask import has_request_context
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from extensions import db
+from models import ReportEvent
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_wakeup = threading.Event()
+_buffer = []  # Committed history rows waiting to be written, oldest first
+_flusher_pid = None
+_app = None
+_session_hooked = False
+
+
+def actor():
+    """Who is making the current change: the admin's username, 'citizen' or 'system' outside requests"""
+    if not has_request_context():
+        return 'system'
+    return current_user.username if current_user.is_authenticated else 'citizen'
+
+
+# ==============================
+# Recording
+# ==============================
+def record(report_id, event_type, old_status=None, new_status=None):
+    """
+    Queue a history entry on the current transaction. Once the transaction
+    commits it moves to the write-behind buffer (and is dropped if it rolls
+    back), so the change itself never waits on the history insert.
+    """
+    db.session.info.setdefault('pending_history', []).append({
+        'report_id': report_id,
+        'event_type': event_type,
+        'old_status': old_status,
+        'new_status': new_status,
+        'actor': actor(),
+        'created_at': datetime.utcnow(),
+    })
+
+
+def _buffer_after_commit(session):
+    rows = session.info.pop('pending_history', None)
+    if rows:
+        _enqueue(rows)
+
+
+def _discard_after_rollback(session):
+    session.info.pop('pending_history', None)
+
+
+def _enqueue(rows):
+    with _lock:
+        _buffer.extend(rows)
+        overflow = len(_buffer) - _app.config['HISTORY_BUFFER_LIMIT']
+        if overflow > 0:
+            # Only while the database keeps refusing writes; dropping beats running out of memory
+            del _buffer[:overflow]
+            logger.error('Report history buffer full; dropped the %d oldest entries', overflow)
+        full = len(_buffer) >= _app.config['HISTORY_FLUSH_SIZE']
+    _ensure_flusher()
+    if full:
+        _wakeup.set()
+
+
+# ==============================
+# Flushing
+# ==============================
+def flush():
+    """
+    Write everything buffered so far with batched INSERTs in a session of
+    its own. Rows that fail stay buffered for the next flush. Returns how
+    many rows were written.
+    """
+    with _lock:
+        rows = _buffer[:]
+        _buffer.clear()
+    if not rows:
+        return 0
+
+    size = _app.config['HISTORY_FLUSH_SIZE']
+    written = 0
+    with _app.app_context():
+        try:
+            for start in range(0, len(rows), size):
+                db.session.execute(db.insert(ReportEvent), rows[start:start + size])
+                db.session.commit()
+                written += len(rows[start:start + size])
+        except SQLAlchemyError:
+            db.session.rollback()
+            logger.exception('Could not write report history; retrying on the next flush')
+            with _lock:
+                _buffer[:0] = rows[written:]
+        finally:
+            db.session.remove()
+    return written
+
+
+def _run_flusher():
+    while True:
+        _wakeup.wait(_app.config['HISTORY_FLUSH_INTERVAL'])
+        _wakeup.clear()
+        try:
+            flush()
+        except Exception:
+            logger.exception('Report history flush failed')
+
+
+def _ensure_flusher():
+    """Start this process's flush thread on first use (after any fork)"""
+    global _flusher_pid
+    if _flusher_pid == os.getpid():
+        return
+    with _lock:
+        if _flusher_pid != os.getpid():
+            threading.Thread(target=_run_flusher, name='report-history-flusher', daemon=True).start()
+            _flusher_pid = os.getpid()
+
+
+# ==============================
+# Reading
+# ==============================
+def timeline(report_id):
+    """
+    A report's history, oldest first: one range scan of the
+    (report_id, created_at) index plus entries this process has not
+    written yet, so admins see their own changes straight away
+    """
+    rows = ReportEvent.query.filter(ReportEvent.report_id == report_id) \
+        .order_by(ReportEvent.created_at, ReportEvent.id).all()
+    with _lock:
+        pending = [SimpleNamespace(**row) for row in _buffer if row['report_id'] == report_id]
+    return sorted(rows + pending, key=lambda entry: entry.created_at)
+
+
+def init_history(app):
+    """Buffer history entries on commit and write what is left when the process exits"""
+    global _app, _session_hooked
+    _app = app
+    if not _session_hooked:
+        event.listen(Session, 'after_commit', _buffer_after_commit)
+        event.listen(Session, 'after_rollback', _discard_after_rollback)
+        atexit.register(flush)
+        _session_hooked = True
@@ -0,0 +1,258 @@
+import csv
+import io
+import json
+import os
+import logging
+import secrets
+import time
+from datetime import datetime, timezone
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+from extensions import db
+from models import Report
+from services.events import publish
+from services.history import record
+from services.jobs import enqueue
+from services.rollups import adjust_daily_stats
+
+IMPORT_BATCH_SIZE = 5000
+IMPORT_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+IMPORT_COLUMNS = ('report_id', 'corruption_type', 'description', 'location', 'status', 'created_at', 'updated_at')
+
+CORRUPTION_TYPES = {'Bribery', 'Embezzlement', 'Fraud', 'Extortion', 'Nepotism', 'Abuse of Power',
+                    'Conflict of Interest', 'Money Laundering', 'Other'}
+STATUSES = {'Pending', 'Reviewed', 'Resolved'}
+MAX_DESCRIPTION_LENGTH = 20000
+MAX_LOCATION_LENGTH = 200
+
+logger = logging.getLogger(__name__)
+
+
+class ImportResult:
+    """Counts from one import run, and why it stopped early if it did"""
+
+    def __init__(self):
+        self.imported = 0
+        self.rejected = 0
+        self.error = None
+
+
+def import_format(filename):
+    """'csv' or 'jsonl' from a file name, or None if the extension is not supported"""
+    return IMPORT_FORMATS.get(os.path.splitext(filename or '')[1].lower())
+
+
+def _read_records(stream, fmt):
+    """Yield (line number, record or None, raw input) from a binary stream"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record, None
+    else:
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line_number, None, line.rstrip('\r\n')
+                continue
+            yield line_number, record if isinstance(record, dict) else None, line.rstrip('\r\n')
+
+
+def _parse_datetime(value):
+    """Naive UTC datetime from an ISO 8601 date or timestamp"""
+    parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def validate_record(record, now):
+    """Return a row for the reports table, or raise ValueError with the reason"""
+    if record is None:
+        raise ValueError('Not a JSON object')
+
+    def text(name):
+        value = record.get(name)
+        return str(value).strip() if value is not None else ''
+
+    corruption_type = text('corruption_type')
+    description = text('description')
+    location = text('location') or None
+    status = text('status') or 'Pending'
+
+    if corruption_type not in CORRUPTION_TYPES:
+        raise ValueError(f'Unknown corruption_type {corruption_type!r}')
+    if not description:
+        raise ValueError('description is required')
+    if len(description) > MAX_DESCRIPTION_LENGTH:
+        raise ValueError(f'description is longer than {MAX_DESCRIPTION_LENGTH} characters')
+    if location and len(location) > MAX_LOCATION_LENGTH:
+        raise ValueError(f'location is longer than {MAX_LOCATION_LENGTH} characters')
+    if status not in STATUSES:
+        raise ValueError(f'Unknown status {status!r}')
+
+    created_at = now
+    if text('created_at'):
+        try:
+            created_at = _parse_datetime(text('created_at'))
+        except ValueError:
+            raise ValueError(f'created_at {text("created_at")!r} is not an ISO 8601 date')
+        if created_at > now:
+            raise ValueError('created_at is in the future')
+
+    return {
+        'corruption_type': corruption_type,
+        'description': description,
+        'location': location,
+        'status': status,
+        'created_at': created_at,
+        'updated_at': created_at,
+    }
+
+
+def _assign_report_ids(rows):
+    """Give each row a public report ID in the citizen format, unique across the batch and table"""
+    pending = rows
+    while pending:
+        for row in pending:
+            row['report_id'] = f"ACR-{row['created_at']:%Y%m%d}-{secrets.token_hex(4).upper()}"
+
+        seen = {}
+        for row in rows:
+            seen.setdefault(row['report_id'], row)
+        taken = set(db.session.execute(
+            db.select(Report.report_id).where(Report.report_id.in_([row['report_id'] for row in pending]))
+        ).scalars())
+        pending = [row for row in rows if seen[row['report_id']] is not row or row['report_id'] in taken]
+
+
+def _copy_rows(rows):
+    """Load rows with Postgres COPY on the session's connection, inside its transaction"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row[column] for column in IMPORT_COLUMNS])
+    buffer.seek(0)
+
+    connection = db.session.connection().connection
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY reports ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _load_batch(rows):
+    _assign_report_ids(rows)
+    if db.session.get_bind().dialect.name == 'postgresql':
+        _copy_rows(rows)
+    else:
+        db.session.execute(db.insert(Report), rows)
+    adjust_daily_stats((row['created_at'], row['corruption_type'], row['status'], 1) for row in rows)
+    loaded = db.session.execute(
+        db.select(Report.id, Report.status).where(Report.report_id.in_([row['report_id'] for row in rows]))
+    ).all()
+    for report_id, status in loaded:
+        record(report_id, 'imported', new_status=status)
+    # Signatures cost a few milliseconds per report, so the worker indexes the batch
+    enqueue('index_reports', report_ids=[report_id for report_id, _ in loaded])
+    # Too many rows to send one by one; open dashboards reload instead
+    publish('refresh')
+    db.session.commit()
+
+
+class _RejectWriter:
+    """Writes rejected rows in the input's own format, with the reason added, so they can be fixed and re-imported"""
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self._file = None
+        self._writer = None
+
+    def write(self, line_number, record, raw, error):
+        if self._file is None:
+            self._file = open(self.path, 'w', newline='', encoding='utf-8')
+        if self.fmt == 'csv':
+            if self._writer is None:
+                fields = [name for name in record if name is not None] if record else list(IMPORT_COLUMNS)
+                self._writer = csv.DictWriter(self._file, fieldnames=['line', 'error'] + fields,
+                                              extrasaction='ignore')
+                self._writer.writeheader()
+            self._writer.writerow({**(record or {}), 'line': line_number, 'error': error})
+        else:
+            if isinstance(record, dict):
+                self._file.write(json.dumps({**record, '_line': line_number, '_error': error}) + '\n')
+            else:
+                self._file.write(json.dumps({'_line': line_number, '_error': error, '_raw': raw}) + '\n')
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def import_reports(stream, fmt, rejects_path, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Validate and load reports from a CSV or JSONL byte stream in batches,
+    committing each batch. Rows that fail validation are written to
+    rejects_path, which is only created if there are any. If the file
+    cannot be read or the database refuses a batch, the import stops there:
+    earlier batches stay committed and result.error says where it stopped.
+    """
+    result = ImportResult()
+    rejects = _RejectWriter(rejects_path, fmt)
+    now = datetime.utcnow()
+    batch = []
+    batch_start = None
+
+    try:
+        for line_number, record, raw in _read_records(stream, fmt):
+            try:
+                row = validate_record(record, now)
+            except ValueError as error:
+                rejects.write(line_number, record, raw, str(error))
+                result.rejected += 1
+                continue
+
+            if not batch:
+                batch_start = line_number
+            batch.append(row)
+            if len(batch) >= batch_size:
+                _load_batch(batch)
+                result.imported += len(batch)
+                batch = []
+
+        if batch:
+            _load_batch(batch)
+            result.imported += len(batch)
+    except (UnicodeDecodeError, csv.Error) as error:
+        db.session.rollback()
+        result.error = f'the file could not be read: {error}'
+    except SQLAlchemyError as error:
+        db.session.rollback()
+        logger.exception('Import batch starting at line %s failed', batch_start)
+        result.error = f'the database refused the rows from line {batch_start} on: {getattr(error, "orig", None) or error}'
+    finally:
+        rejects.close()
+
+    return result
+
+
+def purge_rejects(folder, max_age):
+    """Delete reject files older than max_age seconds from folder; returns how many"""
+    if not os.path.isdir(folder):
+        return 0
+
+    cutoff = time.time() - max_age
+    purged = 0
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        if name.startswith('rejects-') and os.path.getmtime(path) < cutoff:
+            os.remove(path)
+            purged += 1
+    return purged
+
+
+def rejects_folder():
+    """Where reject files from dashboard imports are kept for download"""
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], '.imports')
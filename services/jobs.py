@@ -0,0 +1,244 @@
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from extensions import db
+from models import Job
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+STALE_ERROR = 'The worker running this job stopped before it finished'
+
+_embedded_lock = threading.Lock()
+_embedded_pid = None
+
+
+def job(kind):
+    """
+    Register a handler for a job kind. Handlers receive the payload as
+    keyword arguments, run inside an app context, and must be idempotent:
+    a job is retried after a failure or a worker crash.
+    """
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(kind, max_attempts=5, delay=0, **payload):
+    """
+    Add a job to the current session. It becomes visible to workers when
+    the caller's transaction commits, so work is never queued for a write
+    that rolled back.
+    """
+    new_job = Job(kind=kind, payload=payload, max_attempts=max_attempts,
+                  run_after=datetime.utcnow() + timedelta(seconds=delay))
+    db.session.add(new_job)
+    return new_job
+
+
+def _requeue_stale(now):
+    """
+    Return jobs claimed by a worker that died back to the queue, counting
+    the lost run as an attempt, so a job that kills its worker every time
+    ends up failed instead of looping forever
+    """
+    cutoff = now - timedelta(seconds=current_app.config['JOB_LOCK_TIMEOUT'])
+    stale = Job.query.filter(Job.status == 'running', Job.locked_at < cutoff)
+    released = {'attempts': Job.attempts + 1, 'locked_at': None, 'locked_by': None, 'last_error': STALE_ERROR}
+    stale.filter(Job.attempts + 1 >= Job.max_attempts) \
+        .update({**released, 'status': 'failed', 'finished_at': now}, synchronize_session=False)
+    stale.update({**released, 'status': 'queued'}, synchronize_session=False)
+
+
+def claim_jobs(worker_id, limit):
+    """
+    Atomically claim up to `limit` runnable jobs for this worker and return
+    them as (id, kind, payload, attempts, max_attempts) rows.
+    Postgres uses FOR UPDATE SKIP LOCKED so concurrent workers never wait
+    on each other; SQLite serializes writers, so a guarded UPDATE is enough.
+    """
+    now = datetime.utcnow()
+    _requeue_stale(now)
+
+    runnable = Job.query.filter(Job.status == 'queued', Job.run_after <= now) \
+        .order_by(Job.run_after, Job.id).limit(limit).with_entities(Job.id)
+
+    if db.session.get_bind().dialect.name == 'postgresql':
+        runnable = runnable.with_for_update(skip_locked=True)
+
+    ids = [job_id for (job_id,) in runnable]
+    if ids:
+        Job.query.filter(Job.id.in_(ids), Job.status == 'queued') \
+            .update({'status': 'running', 'locked_at': now, 'locked_by': worker_id},
+                    synchronize_session=False)
+    db.session.commit()
+
+    if not ids:
+        return []
+    return db.session.query(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts) \
+        .filter(Job.id.in_(ids), Job.locked_by == worker_id, Job.status == 'running') \
+        .order_by(Job.id).all()
+
+
+def _record_result(claimed, error):
+    """Mark a claimed job done, or schedule a retry with exponential backoff (2s, 4s, 8s, ...)"""
+    attempts = claimed.attempts + 1
+    now = datetime.utcnow()
+    values = {'attempts': attempts, 'locked_at': None, 'locked_by': None, 'last_error': error}
+
+    if error is None:
+        values.update(status='done', finished_at=now)
+    elif attempts < claimed.max_attempts:
+        values.update(status='queued', run_after=now + timedelta(seconds=2 ** attempts))
+    else:
+        values.update(status='failed', finished_at=now)
+
+    Job.query.filter(Job.id == claimed.id).update(values, synchronize_session=False)
+
+
+def run_handler(kind, payload):
+    """Run one job handler in the current app context; returns an error string or None"""
+    handler = HANDLERS.get(kind)
+    if handler is None:
+        return f'No handler registered for job kind {kind!r}'
+    try:
+        handler(**payload)
+        return None
+    except Exception:
+        db.session.rollback()
+        return traceback.format_exc(limit=5)
+    finally:
+        db.session.remove()
+
+
+def _run_in_thread(app, kind, payload):
+    with app.app_context():
+        return run_handler(kind, payload)
+
+
+_process_app = None
+
+
+def _init_process(config):
+    """Build an app in each pool process from the parent's configuration"""
+    global _process_app
+    from app import create_app
+    _process_app = create_app(type('WorkerConfig', (), config))
+
+
+def _run_in_process(kind, payload):
+    with _process_app.app_context():
+        return run_handler(kind, payload)
+
+
+def run_worker(pool='thread', concurrency=4, once=False):
+    """
+    Claim jobs and run them in a thread or process pool until stopped.
+    With once=True, exit as soon as the queue has no runnable jobs.
+    """
+    app = current_app._get_current_object()
+    worker_id = f'{socket.gethostname()}:{os.getpid()}'
+    poll_interval = app.config['JOB_POLL_INTERVAL']
+
+    if pool == 'process':
+        config = {key: value for key, value in app.config.items() if key.isupper()}
+        executor = ProcessPoolExecutor(max_workers=concurrency, initializer=_init_process,
+                                       initargs=(config,),
+                                       mp_context=multiprocessing.get_context('spawn'))
+        submit = lambda claimed: executor.submit(_run_in_process, claimed.kind, claimed.payload)
+    else:
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        submit = lambda claimed: executor.submit(_run_in_thread, app, claimed.kind, claimed.payload)
+
+    processed = 0
+    with executor:
+        while True:
+            jobs = claim_jobs(worker_id, concurrency)
+            if not jobs:
+                if once:
+                    return processed
+                time.sleep(poll_interval)
+                continue
+
+            futures = [(claimed, submit(claimed)) for claimed in jobs]
+            for claimed, future in futures:
+                try:
+                    error = future.result()
+                except Exception:
+                    error = traceback.format_exc(limit=5)
+                if error:
+                    logger.warning('Job %s (%s) failed: %s', claimed.id, claimed.kind, error)
+                _record_result(claimed, error)
+            db.session.commit()
+            processed += len(jobs)
+
+
+def _run_embedded_worker(app):
+    with app.app_context():
+        while True:
+            try:
+                run_worker(pool='thread', concurrency=app.config['JOB_WORKER_THREADS'])
+            except Exception:
+                logger.exception('Embedded job worker failed; restarting')
+                db.session.rollback()
+                db.session.remove()
+                time.sleep(app.config['JOB_POLL_INTERVAL'])
+
+
+def _start_embedded_worker():
+    """Start this web process's job worker thread on its first request (after any fork)"""
+    global _embedded_pid
+    if _embedded_pid == os.getpid():
+        return
+    with _embedded_lock:
+        if _embedded_pid != os.getpid():
+            threading.Thread(target=_run_embedded_worker, args=(current_app._get_current_object(),),
+                             name='job-worker', daemon=True).start()
+            _embedded_pid = os.getpid()
+
+
+def init_jobs(app):
+    """
+    Opt-in for single-process development: run queued jobs in
+    JOB_WORKER_THREADS threads of every web process instead of a separate
+    flask worker. 0, the default, leaves them to flask worker.
+    """
+    if app.config['JOB_WORKER_THREADS'] and not app.testing:
+        app.before_request(_start_embedded_worker)
+
+
+# ==============================
+# Job handlers
+# ==============================
+@job('release_files')
+def release_files_job(files):
+    """Delete evidence files no longer referenced; safe to run more than once"""
+    from services.storage import release_files
+    release_files([tuple(stored) for stored in files])
+
+
+@job('archive_reports')
+def archive_reports_job(older_than_days=None):
+    """Move old resolved reports to the archive tables; safe to run more than once"""
+    from services.archive import archive_resolved_reports
+    from services.stats import invalidate_dashboard_stats
+    if older_than_days is None:
+        older_than_days = current_app.config['ARCHIVE_AFTER_DAYS']
+    archive_resolved_reports(older_than_days)
+    invalidate_dashboard_stats()
+
+
+@job('index_reports')
+def index_reports_job(report_ids):
+    """Add reports to the near-duplicate index; re-indexing replaces earlier entries"""
+    from services.similarity import index_reports
+    index_reports(report_ids)
+    db.session.commit()
@@ -0,0 +1,242 @@
+import shutil
+import struct
+
+# JPEG segments that identify the camera, owner or place: APP1 (EXIF, XMP),
+# APP13 (IPTC) and comments. Colour profiles (APP2, APP14) are kept.
+JPEG_DROPPED = {0xE1, 0xED, 0xFE}
+JPEG_SOS = 0xDA
+JPEG_STANDALONE = set(range(0xD0, 0xD8)) | {0x01}
+EXIF_HEADER = b'Exif\x00\x00'
+ORIENTATION_TAG = 0x0112
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_DROPPED = {b'eXIf', b'tEXt', b'zTXt', b'iTXt', b'tIME'}
+
+# GIF comments and application extensions (XMP and the like) are dropped,
+# except the loop count of animations and colour profiles
+GIF_SIGNATURES = {b'GIF87a', b'GIF89a'}
+GIF_KEPT_APPLICATIONS = {b'NETSCAPE2.0', b'ANIMEXTS1.0', b'ICCRGBG1012'}
+
+
+class _Malformed(Exception):
+    pass
+
+
+class _Source:
+    """
+    The stream being parsed. Bytes read since the last mark() have not been
+    written yet, so whatever cannot be parsed is still copied unchanged.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.unmarked = bytearray()
+        self.changed = False  # Set once something has been left out of the copy
+
+    def read_exactly(self, size):
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.stream.read(size - len(data))
+            if not chunk:
+                break
+            data += chunk
+        self.unmarked += data
+        if len(data) != size:
+            raise _Malformed('Unexpected end of file')
+        return bytes(data)
+
+    def skip(self, size):
+        """Leave out what has not been written yet and the next size bytes"""
+        self.mark()
+        self.changed = True
+        while size:
+            chunk = self.stream.read(min(size, 64 * 1024))
+            if not chunk:
+                raise _Malformed('Unexpected end of file')
+            size -= len(chunk)
+
+    def mark(self):
+        self.unmarked.clear()
+
+
+# ==============================
+# JPEG
+# ==============================
+def _exif_orientation(exif):
+    """The orientation tag of an EXIF block, or None"""
+    tiff = exif[len(EXIF_HEADER):]
+    if len(tiff) < 8 or tiff[:2] not in (b'II', b'MM'):
+        return None
+    order = '<' if tiff[:2] == b'II' else '>'
+    offset, = struct.unpack(order + 'I', tiff[4:8])
+    if offset + 2 > len(tiff):
+        return None
+    count, = struct.unpack(order + 'H', tiff[offset:offset + 2])
+    for start in range(offset + 2, min(offset + 2 + count * 12, len(tiff) - 11), 12):
+        tag, _, _, value = struct.unpack(order + 'HHIH', tiff[start:start + 10])
+        if tag == ORIENTATION_TAG:
+            return value
+    return None
+
+
+def _orientation_segment(orientation):
+    """A minimal APP1 segment holding nothing but the orientation, so photos still display upright"""
+    tiff = b'MM\x00\x2a' + struct.pack('>IHHHIHHI', 8, 1, ORIENTATION_TAG, 3, 1, orientation, 0, 0)
+    body = EXIF_HEADER + tiff
+    return b'\xff\xe1' + struct.pack('>H', len(body) + 2) + body
+
+
+def _is_orientation_only(segment):
+    """Whether a segment is the one _orientation_segment writes, i.e. the file was stripped before"""
+    return segment[1] == 0xE1 and segment[4:].startswith(EXIF_HEADER) \
+        and segment == _orientation_segment(_exif_orientation(segment[4:]) or 0)
+
+
+def _strip_jpeg(source, target):
+    if source.read_exactly(2) != b'\xff\xd8':
+        raise _Malformed('Not a JPEG')
+
+    segments = []
+    orientation = None
+    dropped = False
+    while True:
+        if source.read_exactly(1) != b'\xff':
+            raise _Malformed('Expected a marker')
+        marker = source.read_exactly(1)[0]
+        while marker == 0xFF:  # Fill bytes
+            marker = source.read_exactly(1)[0]
+        if marker in JPEG_STANDALONE:
+            segments.append(bytes([0xff, marker]))
+            continue
+
+        length_bytes = source.read_exactly(2)
+        body = source.read_exactly(struct.unpack('>H', length_bytes)[0] - 2)
+        segment = bytes([0xff, marker]) + length_bytes + body
+        if marker in JPEG_DROPPED and not _is_orientation_only(segment):
+            dropped = True
+            if marker == 0xE1 and body.startswith(EXIF_HEADER):
+                orientation = _exif_orientation(body) or orientation
+            continue
+        segments.append(segment)
+        if marker == JPEG_SOS:
+            break
+
+    if not dropped:
+        return
+
+    target.write(b'\xff\xd8')
+    # JFIF wants its APP0 segment first, EXIF readers take the orientation after it
+    leading = 1 if segments and segments[0][1] == 0xE0 else 0
+    target.write(b''.join(segments[:leading]))
+    if orientation and orientation != 1:
+        target.write(_orientation_segment(orientation))
+    target.write(b''.join(segments[leading:]))
+    source.mark()
+    source.changed = True
+
+
+# ==============================
+# PNG
+# ==============================
+def _strip_png(source, target):
+    if source.read_exactly(8) != PNG_SIGNATURE:
+        raise _Malformed('Not a PNG')
+    target.write(source.unmarked)
+    source.mark()
+
+    while True:
+        header = source.read_exactly(8)
+        length, = struct.unpack('>I', header[:4])
+        chunk_type = header[4:]
+        if chunk_type in PNG_DROPPED:
+            source.skip(length + 4)
+            continue
+
+        remaining = length + 4  # Data and CRC
+        while remaining:
+            remaining -= len(source.read_exactly(min(remaining, 64 * 1024)))
+            target.write(source.unmarked)
+            source.mark()
+        if chunk_type == b'IEND':
+            return
+
+
+# ==============================
+# GIF
+# ==============================
+def _color_table(source, flags):
+    if flags & 0x80:
+        source.read_exactly(3 << ((flags & 0x07) + 1))
+
+
+def _pass_sub_blocks(source, target, keep):
+    """Copy or leave out data sub-blocks up to and including their empty terminator"""
+    while True:
+        size = source.read_exactly(1)[0]
+        source.read_exactly(size)
+        if keep:
+            target.write(source.unmarked)
+        source.mark()
+        if size == 0:
+            return
+
+
+def _strip_gif(source, target):
+    screen = source.read_exactly(13)
+    if screen[:6] not in GIF_SIGNATURES:
+        raise _Malformed('Not a GIF')
+    _color_table(source, screen[10])
+    target.write(source.unmarked)
+    source.mark()
+
+    while True:
+        introducer = source.read_exactly(1)[0]
+        if introducer == 0x3B:  # Trailer
+            return
+        if introducer == 0x2C:  # Image: descriptor, colour table, LZW code size, data
+            descriptor = source.read_exactly(9)
+            _color_table(source, descriptor[8])
+            source.read_exactly(1)
+            _pass_sub_blocks(source, target, keep=True)
+            continue
+        if introducer != 0x21:
+            raise _Malformed('Expected a block')
+
+        label = source.read_exactly(1)[0]
+        keep = label not in (0xFE, 0xFF)  # Comments and application extensions
+        if label == 0xFF:
+            size = source.read_exactly(1)[0]
+            keep = source.read_exactly(size) in GIF_KEPT_APPLICATIONS
+        if not keep:
+            source.mark()
+            source.changed = True
+        _pass_sub_blocks(source, target, keep)
+
+
+STRIPPERS = {'jpg': _strip_jpeg, 'jpeg': _strip_jpeg, 'png': _strip_png, 'gif': _strip_gif}
+
+
+def can_strip(file_type):
+    return (file_type or '').lower() in STRIPPERS
+
+
+def strip_metadata(stream, target, ext):
+    """
+    Copy a file from a stream to a writable target, leaving out EXIF, XMP,
+    IPTC, comments and text metadata (camera, owner, GPS position,
+    timestamps) of JPEG, PNG and GIF images without re-encoding them. A
+    JPEG keeps only its orientation. Other types, and anything from a part
+    that cannot be parsed on, are copied unchanged. Returns True if
+    something was left out.
+    """
+    source = _Source(stream)
+    strip = STRIPPERS.get((ext or '').lower())
+    if strip is not None:
+        try:
+            strip(source, target)
+        except (_Malformed, struct.error):
+            pass
+
+    target.write(source.unmarked)
+    shutil.copyfileobj(stream, target)
+    return source.changed
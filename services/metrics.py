@@ -0,0 +1,121 @@
+import logging
+import os
+import time
+from flask import g, has_request_context, request
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# With PROMETHEUS_MULTIPROC_DIR set (see gunicorn.conf.py) prometheus_client
+# keeps these in files shared by every worker process instead of in memory
+_registry = CollectorRegistry()
+_latency = Histogram('http_request_duration_seconds', 'Request latency, including streamed bodies.',
+                     ['endpoint'], buckets=LATENCY_BUCKETS, registry=_registry)
+_requests = Counter('http_requests_total', 'Requests by endpoint, method and status.',
+                    ['endpoint', 'method', 'status'], registry=_registry)
+_sql_statements = Counter('db_statements_total', 'SQL statements executed while handling requests.',
+                          ['endpoint'], registry=_registry)
+_sql_seconds = Counter('db_statement_seconds_total', 'Time spent executing SQL while handling requests.',
+                       ['endpoint'], registry=_registry)
+_upload_bytes = Counter('http_upload_bytes_total', 'Request body bytes received.',
+                        ['endpoint'], registry=_registry)
+
+_engine_hooked = False
+
+
+class RequestTimer:
+    """Timings gathered for one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_statements = 0
+        self.sql_seconds = 0.0
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'request_timer' in g:
+        conn.info['query_started'] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop('query_started', None)
+    if started is not None and has_request_context() and 'request_timer' in g:
+        g.request_timer.sql_statements += 1
+        g.request_timer.sql_seconds += time.perf_counter() - started
+
+
+def _start_request():
+    g.request_timer = RequestTimer()
+
+
+def _finish_request(response, app):
+    timer = g.get('request_timer')
+    if timer is None:
+        return response
+
+    endpoint = request.endpoint or 'unmatched'
+    method = request.method
+    upload_bytes = request.content_length or 0
+    elapsed = time.perf_counter() - timer.started
+    response.headers.add('Server-Timing', f'db;dur={timer.sql_seconds * 1000:.1f};desc="{timer.sql_statements} queries"')
+    response.headers.add('Server-Timing', f'app;dur={elapsed * 1000:.1f}')
+
+    config = app.config
+    path = request.full_path.rstrip('?')
+    # Event streams stay open for as long as the page does; that is not latency
+    long_lived = response.mimetype == 'text/event-stream'
+
+    def record():
+        # Runs when the response is closed, so streamed bodies are included
+        duration = None if long_lived else time.perf_counter() - timer.started
+        observe(endpoint, method, response.status_code, duration,
+                timer.sql_statements, timer.sql_seconds, upload_bytes)
+        if long_lived:
+            return
+        if duration > config['SLOW_REQUEST_SECONDS'] or timer.sql_statements > config['SLOW_REQUEST_QUERIES']:
+            logger.warning('Slow request %s %s (%s): %.3fs, %d queries, %.3fs in SQL',
+                           method, path, endpoint, duration, timer.sql_statements, timer.sql_seconds)
+
+    response.call_on_close(record)
+    return response
+
+
+def init_metrics(app):
+    """Hook SQLAlchemy engine events and request signals to collect metrics"""
+    global _engine_hooked
+    if not _engine_hooked:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _engine_hooked = True
+
+    app.before_request(_start_request)
+    app.after_request(lambda response: _finish_request(response, app))
+
+
+def observe(endpoint, method, status, duration, sql_statements, sql_seconds, upload_bytes):
+    """Add one finished request to the metrics; a duration of None leaves the latency histogram alone"""
+    if duration is not None:
+        _latency.labels(endpoint).observe(duration)
+    _requests.labels(endpoint, method, status).inc()
+    _sql_statements.labels(endpoint).inc(sql_statements)
+    _sql_seconds.labels(endpoint).inc(sql_seconds)
+    if upload_bytes:
+        _upload_bytes.labels(endpoint).inc(upload_bytes)
+
+
+def render_metrics():
+    """
+    Metrics in the Prometheus text exposition format, summed over every
+    worker process when PROMETHEUS_MULTIPROC_DIR is set, otherwise this
+    process's own
+    """
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = _registry
+    return generate_latest(registry).decode('utf-8')
@@ -0,0 +1,85 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup
+
+_lock = threading.Lock()
+_fragments = OrderedDict()  # key -> rendered markup, least recently used first
+_pages = {}  # path -> (body, mimetype, etag)
+
+
+# ==============================
+# Template Fragments
+# ==============================
+def cached_fragment(*key, caller):
+    """
+    Render the body of a {% call cached_fragment(...) %} block once per key
+    and reuse the markup from a per-process LRU cache. The key has to cover
+    everything the block shows, e.g. a report's id and updated_at.
+    """
+    with _lock:
+        markup = _fragments.get(key)
+        if markup is not None:
+            _fragments.move_to_end(key)
+            return markup
+
+    markup = Markup(caller())
+    with _lock:
+        _fragments[key] = markup
+        _fragments.move_to_end(key)
+        while len(_fragments) > current_app.config['FRAGMENT_CACHE_SIZE']:
+            _fragments.popitem(last=False)
+    return markup
+
+
+# ==============================
+# Anonymous Pages
+# ==============================
+def _cacheable():
+    # Flash messages and admin sessions make a page personal
+    return request.method == 'GET' and not current_user.is_authenticated and '_flashes' not in session \
+        and not current_app.debug
+
+
+def cached_page(view):
+    """
+    Serve a page that is the same for every anonymous visitor from a
+    per-process copy of its first rendering, with an ETag so browsers
+    revalidate with a 304. POSTs, admins and visitors with pending flash
+    messages get the view as usual.
+    """
+    @wraps(view)
+    def decorated(*args, **kwargs):
+        if not _cacheable():
+            return view(*args, **kwargs)
+
+        with _lock:
+            entry = _pages.get(request.path)
+        if entry is None:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            body = response.get_data()
+            entry = (body, response.mimetype, hashlib.sha256(body).hexdigest()[:32])
+            with _lock:
+                _pages[request.path] = entry
+
+        body, mimetype, etag = entry
+        response = current_app.response_class(body, mimetype=mimetype)
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = current_app.config['PAGE_CACHE_MAX_AGE']
+        # A session cookie may carry flash messages; browsers must not reuse the page across them
+        response.vary.add('Cookie')
+        return response.make_conditional(request)
+    return decorated
+
+
+def init_template_caching(app):
+    """Share compiled templates between worker processes and register the fragment cache"""
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(app.config['TEMPLATE_CACHE_DIR'])
+    app.jinja_env.globals['cached_fragment'] = cached_fragment
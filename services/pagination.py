@@ -0,0 +1,134 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import tuple_
+from extensions import db
+from models import ArchivedReport, Report
+
+
+class KeysetSort:
+    """A descending sort key for keyset pagination, tie-broken by the row id"""
+
+    def __init__(self, column, attr, dump, load, id_column=Report.id):
+        self.column = column
+        self.attr = attr
+        self.dump = dump
+        self.load = load
+        self.id_column = id_column
+
+
+CREATED_AT_SORT = KeysetSort(Report.created_at, 'created_at',
+                             datetime.isoformat, datetime.fromisoformat)
+ARCHIVED_CREATED_AT_SORT = KeysetSort(ArchivedReport.created_at, 'created_at',
+                                      datetime.isoformat, datetime.fromisoformat, ArchivedReport.id)
+
+
+def encode_cursor(direction, report, sort=CREATED_AT_SORT):
+    """Build an opaque token pointing before ('p') or after ('n') a report"""
+    payload = {'d': direction, 'v': sort.dump(getattr(report, sort.attr)), 'i': report.id}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, sort=CREATED_AT_SORT):
+    """Decode a cursor token into (direction, sort value, id), or None if invalid"""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction = payload['d']
+        if direction not in ('n', 'p'):
+            return None
+        return direction, sort.load(payload['v']), int(payload['i'])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class KeysetPage:
+    """One page of reports ordered by (sort key, id) descending"""
+
+    def __init__(self, items, has_prev, has_next, total, total_is_estimate, sort=CREATED_AT_SORT):
+        self.items = items
+        self.has_prev = has_prev
+        self.has_next = has_next
+        self.total = total
+        self.total_is_estimate = total_is_estimate
+        self.sort = sort
+
+    @property
+    def prev_cursor(self):
+        return encode_cursor('p', self.items[0], self.sort) if self.has_prev and self.items else None
+
+    @property
+    def next_cursor(self):
+        return encode_cursor('n', self.items[-1], self.sort) if self.has_next and self.items else None
+
+
+def _fetch(query, sort, decoded, limit):
+    """Up to `limit` rows on the far side of the cursor, nearest first"""
+    key = tuple_(sort.column, sort.id_column)
+
+    if decoded and decoded[0] == 'p':
+        _, value, row_id = decoded
+        return query.filter(key > tuple_(value, row_id)) \
+            .order_by(sort.column.asc(), sort.id_column.asc()).limit(limit).all()
+
+    if decoded:
+        _, value, row_id = decoded
+        query = query.filter(key < tuple_(value, row_id))
+    return query.order_by(sort.column.desc(), sort.id_column.desc()).limit(limit).all()
+
+
+def keyset_paginate(query, per_page, cursor=None, total=None, total_is_estimate=False,
+                    sort=CREATED_AT_SORT, merge_with=()):
+    """
+    Fetch one page after or before the cursor position.
+    Cost depends only on per_page, not on how deep the page is.
+    merge_with takes further (query, sort) pairs over tables that share the
+    id sequence, e.g. the archive; their rows are merged into the same order.
+    """
+    decoded = decode_cursor(cursor, sort)
+    backwards = bool(decoded) and decoded[0] == 'p'
+
+    rows = _fetch(query, sort, decoded, per_page + 1)
+    if merge_with:
+        for other_query, other_sort in merge_with:
+            rows += _fetch(other_query, other_sort, decoded, per_page + 1)
+        rows.sort(key=lambda row: (getattr(row, sort.attr), row.id), reverse=not backwards)
+        rows = rows[:per_page + 1]
+
+    if backwards:
+        has_prev = len(rows) > per_page
+        items = list(reversed(rows[:per_page]))
+        return KeysetPage(items, has_prev, True, total, total_is_estimate, sort)
+
+    return KeysetPage(rows[:per_page], decoded is not None, len(rows) > per_page,
+                      total, total_is_estimate, sort)
+
+
+def estimate_count(query):
+    """Return the planner's row estimate for a query on Postgres, or None elsewhere"""
+    bind = db.session.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return None
+
+    entity = query.column_descriptions[0]['entity']
+    statement = query.order_by(None).with_entities(entity.id).statement
+    compiled = statement.compile(dialect=bind.dialect)
+    plan = db.session.connection().exec_driver_sql(
+        'EXPLAIN (FORMAT JSON) ' + str(compiled), compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_reports(query, exact_limit):
+    """
+    Count the filtered reports, switching to the planner estimate once the
+    estimate is above exact_limit. Returns (count, is_estimate).
+    """
+    estimate = estimate_count(query)
+    if estimate is not None and estimate > exact_limit:
+        return estimate, True
+    return query.order_by(None).count(), False
@@ -0,0 +1,53 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import abort, current_app, request
+
+MAX_TRACKED_CLIENTS = 10000
+
+
+class TokenBucketLimiter:
+    """
+    Per-client token buckets: each client may burst up to `burst` requests
+    and then gets `rate` more per second. Buckets live in this process
+    only, and the least recently seen clients are forgotten first.
+    """
+
+    def __init__(self, rate_key, burst_key):
+        self.rate_key = rate_key
+        self.burst_key = burst_key
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()  # client -> (tokens, last refill)
+
+    def allow(self, client):
+        """Take one token for `client`; False if its bucket is empty"""
+        rate = current_app.config[self.rate_key]
+        burst = current_app.config[self.burst_key]
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, last = self._buckets.get(client, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+
+            self._buckets[client] = (tokens, now)
+            self._buckets.move_to_end(client)
+            if len(self._buckets) > MAX_TRACKED_CLIENTS:
+                self._buckets.popitem(last=False)
+        return allowed
+
+    def limit(self, view):
+        """Decorate a view so clients over their rate get 429 Too Many Requests"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not self.allow(request.remote_addr):
+                abort(429)
+            return view(*args, **kwargs)
+        return wrapper
+
+
+lookup_limiter = TokenBucketLimiter('LOOKUP_RATE_LIMIT', 'LOOKUP_RATE_BURST')
+upload_limiter = TokenBucketLimiter('UPLOAD_RATE_LIMIT', 'UPLOAD_RATE_BURST')
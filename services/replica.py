@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from flask import current_app, g, has_request_context, request, session
+from flask_login import current_user
+from flask_sqlalchemy.session import Session
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Seconds the replica is behind the primary; 0 when it has replayed everything it received
+POSTGRES_LAG_SQL = text("""
+    SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END
+""")
+
+_lock = threading.Lock()
+_health = {}  # replica engine -> (usable, checked_at)
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to the replica engine while a request marked
+    with @replica_reads is running. Flushes and INSERT, UPDATE and DELETE
+    statements always go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_request_context() and g.get('read_replica') \
+                and not getattr(clause, 'is_dml', False):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def replica_lag(engine):
+    """Replication lag of a replica in seconds; non-Postgres replicas report none"""
+    with engine.connect() as connection:
+        if engine.dialect.name == 'postgresql':
+            return float(connection.execute(POSTGRES_LAG_SQL).scalar() or 0)
+        connection.execute(text('SELECT 1'))
+        return 0.0
+
+
+def replica_usable():
+    """
+    Whether the configured replica is reachable and within REPLICA_MAX_LAG,
+    checked at most every REPLICA_CHECK_INTERVAL seconds per worker
+    """
+    engine = current_app.extensions['sqlalchemy'].engines.get(REPLICA_BIND)
+    if engine is None:
+        return False
+
+    now = time.monotonic()
+    with _lock:
+        entry = _health.get(engine)
+    if entry is not None and now - entry[1] < current_app.config['REPLICA_CHECK_INTERVAL']:
+        return entry[0]
+
+    max_lag = current_app.config['REPLICA_MAX_LAG']
+    try:
+        lag = replica_lag(engine)
+        usable = lag <= max_lag
+        if not usable:
+            logger.warning('Replica is %.1fs behind (limit %ss), reading from the primary', lag, max_lag)
+    except SQLAlchemyError as error:
+        logger.warning('Replica unavailable, reading from the primary: %s', error)
+        usable = False
+
+    with _lock:
+        _health[engine] = (usable, now)
+    return usable
+
+
+def replica_reads(view):
+    """
+    Run a read-only view against the replica when one is configured and
+    healthy. Admins who wrote something in the last REPLICA_MAX_LAG seconds
+    keep reading from the primary so they see their own changes.
+    """
+    @wraps(view)
+    def decorated(*args, **kwargs):
+        g.read_replica = session.get('read_primary_until', 0) < time.time() and replica_usable()
+        return view(*args, **kwargs)
+    return decorated
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary inside a @replica_reads view, e.g. for results shared through a cache"""
+    if not has_request_context():
+        yield
+        return
+    previous = g.get('read_replica', False)
+    g.read_replica = False
+    try:
+        yield
+    finally:
+        g.read_replica = previous
+
+
+def _pin_writers_to_primary(response):
+    if request.method not in SAFE_METHODS and current_user.is_authenticated:
+        session['read_primary_until'] = time.time() + current_app.config['REPLICA_MAX_LAG']
+    return response
+
+
+def init_replica(app):
+    """Pin admins to the primary after their writes when a replica is configured"""
+    if REPLICA_BIND in app.config.get('SQLALCHEMY_BINDS', {}):
+        app.after_request(_pin_writers_to_primary)
@@ -0,0 +1,73 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+from flask import current_app
+from sqlalchemy.orm import selectinload
+from models import ArchivedReport, Report
+
+REPORT_ID_PATTERN = re.compile(r'^ACR-\d{8}-[0-9A-F]{8}$')
+
+EVIDENCE_FIELDS = ('id', 'filename', 'content_hash', 'original_filename', 'file_type', 'file_size', 'uploaded_at')
+REPORT_FIELDS = ('id', 'report_id', 'corruption_type', 'description', 'location', 'status', 'created_at', 'updated_at')
+
+_lock = threading.Lock()
+_cache = OrderedDict()  # report_id -> (snapshot or None, expires_at), least recently used first
+
+
+def _snapshot(report):
+    """Detached, read-only copy of a report and its evidence for rendering citizen pages"""
+    snapshot = SimpleNamespace(**{field: getattr(report, field) for field in REPORT_FIELDS})
+    snapshot.evidence = [
+        SimpleNamespace(**{field: getattr(evidence, field) for field in EVIDENCE_FIELDS})
+        for evidence in report.evidence
+    ]
+    return snapshot
+
+
+def get_report_snapshot(report_id):
+    """
+    Look up a report by its public ID through a per-process LRU cache.
+    Unknown IDs are cached too (for a shorter time), and IDs that cannot
+    have been generated are rejected without a query. Returns None if
+    there is no such report.
+    """
+    if not REPORT_ID_PATTERN.match(report_id or ''):
+        return None
+
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(report_id)
+        if entry is not None and now < entry[1]:
+            _cache.move_to_end(report_id)
+            return entry[0]
+
+    report = Report.query.options(selectinload(Report.evidence)) \
+        .filter_by(report_id=report_id).first()
+    if report is None:
+        # Citizens can still track reports that have been archived
+        report = ArchivedReport.query.options(selectinload(ArchivedReport.evidence)) \
+            .filter_by(report_id=report_id).first()
+    snapshot = _snapshot(report) if report else None
+
+    config = current_app.config
+    ttl = config['REPORT_CACHE_TTL'] if snapshot else config['REPORT_CACHE_NEGATIVE_TTL']
+    with _lock:
+        _cache[report_id] = (snapshot, now + ttl)
+        _cache.move_to_end(report_id)
+        while len(_cache) > config['REPORT_CACHE_SIZE']:
+            _cache.popitem(last=False)
+    return snapshot
+
+
+def invalidate_report(report_id):
+    """Drop one cached report after a write that changes it, or creates it"""
+    with _lock:
+        _cache.pop(report_id, None)
+
+
+def invalidate_reports():
+    """Drop every cached report, e.g. after a bulk update"""
+    with _lock:
+        _cache.clear()
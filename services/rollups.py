@@ -0,0 +1,117 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+from sqlalchemy import func
+from extensions import db
+from models import ArchivedReport, Report, ReportDailyStats
+
+GROUPINGS = {'type': ReportDailyStats.corruption_type, 'status': ReportDailyStats.status}
+
+
+def _as_date(value):
+    """func.date() returns a date on Postgres and an ISO string on SQLite"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def adjust_daily_stats(changes):
+    """
+    Apply (created_at, corruption_type, status, delta) changes to the rollup
+    table in the caller's transaction, merging changes to the same bucket.
+    Reports without a creation time are not counted.
+    """
+    totals = Counter()
+    for created_at, corruption_type, status, delta in changes:
+        if created_at is not None:
+            totals[(_as_date(created_at), corruption_type, status or 'Pending')] += delta
+
+    rows = [{'day': day, 'corruption_type': corruption_type, 'status': status, 'count': delta}
+            for (day, corruption_type, status), delta in sorted(totals.items()) if delta]
+    if not rows:
+        return
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        statement = insert(ReportDailyStats)
+        statement = statement.on_conflict_do_update(
+            index_elements=['day', 'corruption_type', 'status'],
+            set_={'count': ReportDailyStats.count + statement.excluded['count']}
+        )
+        db.session.execute(statement, rows)
+    else:
+        for row in rows:
+            updated = ReportDailyStats.query.filter_by(
+                day=row['day'], corruption_type=row['corruption_type'], status=row['status']
+            ).update({'count': ReportDailyStats.count + row['count']}, synchronize_session=False)
+            if not updated:
+                db.session.add(ReportDailyStats(**row))
+
+
+def report_change(report, delta):
+    """One report entering (+1) or leaving (-1) its rollup bucket"""
+    return report.created_at, report.corruption_type, report.status, delta
+
+
+def query_changes(id_query, delta, status=None):
+    """
+    Changes for every report selected by id_query, grouped in SQL so a bulk
+    action costs one query. With status, the reports are counted under that
+    status instead of their current one.
+    """
+    day = func.date(Report.created_at)
+    rows = db.session.query(day, Report.corruption_type, Report.status, func.count(Report.id)) \
+        .filter(Report.id.in_(id_query.scalar_subquery())) \
+        .group_by(day, Report.corruption_type, Report.status)
+    return [(created, corruption_type, status or current_status, delta * count)
+            for created, corruption_type, current_status, count in rows]
+
+
+def backfill_daily_stats():
+    """
+    Rebuild the rollup table from the reports and archive tables; returns
+    the number of buckets. Archiving does not change the rollups, so
+    archived reports are counted too.
+    """
+    reports = db.union_all(
+        db.select(Report.created_at, Report.corruption_type, Report.status),
+        db.select(ArchivedReport.created_at, ArchivedReport.corruption_type, ArchivedReport.status),
+    ).subquery()
+    day = func.date(reports.c.created_at)
+    status = func.coalesce(reports.c.status, 'Pending')
+    db.session.execute(db.delete(ReportDailyStats))
+    db.session.execute(
+        db.insert(ReportDailyStats).from_select(
+            ['day', 'corruption_type', 'status', 'count'],
+            db.select(day, reports.c.corruption_type, status, func.count())
+            .where(reports.c.created_at.isnot(None))
+            .group_by(day, reports.c.corruption_type, status)
+        )
+    )
+    db.session.commit()
+    return ReportDailyStats.query.count()
+
+
+def daily_series(date_from, date_to, group='type'):
+    """
+    Reports per day between two dates (inclusive), split by type or status.
+    Reads only the rollups, so the cost depends on the range, not on how
+    many reports there are. Returns (days, {name: counts aligned to days}).
+    """
+    column = GROUPINGS[group]
+    rows = db.session.query(ReportDailyStats.day, column, func.sum(ReportDailyStats.count)) \
+        .filter(ReportDailyStats.day >= date_from, ReportDailyStats.day <= date_to) \
+        .group_by(ReportDailyStats.day, column)
+
+    days = [date_from + timedelta(days=offset) for offset in range((date_to - date_from).days + 1)]
+    index = {day: position for position, day in enumerate(days)}
+    series = {}
+    for day, name, count in rows:
+        if count:
+            series.setdefault(name, [0] * len(days))[index[_as_date(day)]] = int(count)
+    return days, dict(sorted(series.items()))
@@ -0,0 +1,40 @@
+from sqlalchemy import Double, cast, func, literal, literal_column, or_, table, column
+from extensions import db
+from models import Report
+
+SEARCH_CONFIG = 'english'
+
+
+def fts5_terms(q):
+    """Quote each word so user input is never parsed as FTS5 query syntax"""
+    return ' '.join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+
+def apply_search(query, q, model=Report):
+    """
+    Restrict a report query (or an archived report query) to full-text
+    matches for q. Returns (query, rank) where a higher rank is a better match.
+    """
+    dialect = db.session.get_bind().dialect.name
+    tablename = model.__tablename__
+    
+    if dialect == 'postgresql':
+        vector = literal_column(f'{tablename}.search_vector')
+        tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        # Compare ranks as double precision so cursor values round-trip exactly
+        rank = cast(func.ts_rank(vector, tsquery), Double)
+        return query.filter(vector.op('@@')(tsquery)), rank
+    
+    if dialect == 'sqlite':
+        fts_table = table(f'{tablename}_fts', column('rowid'))
+        fts = literal_column(f'{tablename}_fts')
+        # bm25 is lower for better matches; location terms weigh double
+        rank = -func.bm25(fts, 1.0, 2.0)
+        query = query.join(fts_table, fts_table.c.rowid == model.id) \
+            .filter(fts.op('MATCH')(fts5_terms(q)))
+        return query, rank
+    
+    # Other databases fall back to an unranked substring match
+    pattern = f'%{q}%'
+    query = query.filter(or_(model.description.ilike(pattern), model.location.ilike(pattern)))
+    return query, literal(0.0)
@@ -0,0 +1,125 @@
+import hashlib
+import random
+from datetime import datetime, timedelta
+from extensions import db
+from models import Evidence, Report, ReportBucket, ReportDailyStats, ReportSignature
+from services.rollups import adjust_daily_stats
+from services.storage import content_path
+
+SEED_BATCH_SIZE = 5000
+
+# Rough shape of real intake: a few categories dominate
+CORRUPTION_TYPES = {
+    'Bribery': 30, 'Embezzlement': 15, 'Fraud': 15, 'Abuse of Power': 10, 'Nepotism': 8,
+    'Extortion': 7, 'Conflict of Interest': 6, 'Money Laundering': 4, 'Other': 5,
+}
+FILE_TYPES = {'jpg': 55, 'png': 15, 'pdf': 25, 'gif': 5}
+EVIDENCE_PER_REPORT = {0: 55, 1: 25, 2: 12, 3: 8}
+
+LOCATIONS = ['Capital District', 'North Region', 'South Region', 'East Region', 'West Region',
+             'Port City', 'Airport Authority', 'Central Market', 'Customs Office', 'City Hall']
+SUBJECTS = ['official', 'officer', 'clerk', 'inspector', 'contractor', 'director', 'minister', 'agent']
+ACTIONS = ['demanded a payment', 'asked for a bribe', 'diverted funds', 'awarded a contract',
+           'hired a relative', 'falsified records', 'blocked a permit', 'inflated an invoice']
+CONTEXTS = ['for road construction', 'at the customs checkpoint', 'during a tender', 'for a business licence',
+            'in the school budget', 'for hospital supplies', 'at the land registry', 'for a building permit']
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _description(rng):
+    sentences = [
+        f'The {rng.choice(SUBJECTS)} {rng.choice(ACTIONS)} {rng.choice(CONTEXTS)}.'
+        for _ in range(rng.randint(1, 6))
+    ]
+    return ' '.join(sentences)
+
+
+def _status(rng, age_days):
+    """Older reports are more likely to have been handled"""
+    handled = min(0.95, age_days / 60)
+    if rng.random() > handled:
+        return 'Pending'
+    return 'Resolved' if rng.random() < min(0.8, age_days / 180) else 'Reviewed'
+
+
+def _created_at(rng, now, days):
+    # More reports arrive recently, and mostly during the working day
+    age = timedelta(days=days * rng.random() ** 1.5)
+    created = now - age
+    return created.replace(hour=min(23, max(0, int(rng.gauss(13, 4)))), minute=rng.randrange(60))
+
+
+def seed_reports(count, days=365, seed=None, clear=False, batch_size=SEED_BATCH_SIZE):
+    """
+    Bulk insert `count` synthetic reports with evidence rows, spread over the
+    last `days` days. The same seed reproduces the same data, relative to
+    the current time. Evidence
+    rows point at content-addressed names whose files do not exist.
+    Returns (reports, evidence) inserted.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    if clear:
+        db.session.execute(db.delete(ReportBucket))
+        db.session.execute(db.delete(ReportSignature))
+        db.session.execute(db.delete(Evidence))
+        db.session.execute(db.delete(Report))
+        db.session.execute(db.delete(ReportDailyStats))
+        db.session.commit()
+
+    report_total = evidence_total = 0
+    for start in range(0, count, batch_size):
+        reports = []
+        for _ in range(start, min(start + batch_size, count)):
+            created = _created_at(rng, now, days)
+            status = _status(rng, (now - created).days)
+            updated = created if status == 'Pending' else created + timedelta(hours=rng.randint(1, 24 * 30))
+            reports.append({
+                'report_id': f'ACR-{created:%Y%m%d}-{rng.getrandbits(32):08X}',
+                'corruption_type': _weighted(rng, CORRUPTION_TYPES),
+                'description': _description(rng),
+                'location': rng.choice(LOCATIONS) if rng.random() < 0.8 else None,
+                'status': status,
+                'created_at': created,
+                'updated_at': min(updated, now),
+            })
+
+        # Public IDs are random; drop the rare collision instead of failing the batch
+        existing = set(db.session.execute(
+            db.select(Report.report_id).where(Report.report_id.in_([r['report_id'] for r in reports]))
+        ).scalars())
+        unique = {r['report_id']: r for r in reports if r['report_id'] not in existing}
+        reports = list(unique.values())
+
+        db.session.execute(db.insert(Report), reports)
+        ids = dict(db.session.execute(
+            db.select(Report.report_id, Report.id).where(Report.report_id.in_(list(unique)))
+        ).all())
+
+        evidence = []
+        for report in reports:
+            for _ in range(_weighted(rng, EVIDENCE_PER_REPORT)):
+                file_type = _weighted(rng, FILE_TYPES)
+                content_hash = hashlib.sha256(rng.randbytes(16)).hexdigest()
+                evidence.append({
+                    'filename': content_path(content_hash, file_type),
+                    'content_hash': content_hash,
+                    'original_filename': f'evidence_{rng.randrange(10000)}.{file_type}',
+                    'file_type': file_type,
+                    'file_size': min(int(rng.lognormvariate(12, 1.2)), 200 * 1024 * 1024),
+                    'uploaded_at': report['created_at'],
+                    'report_id': ids[report['report_id']],
+                })
+        if evidence:
+            db.session.execute(db.insert(Evidence), evidence)
+        adjust_daily_stats((r['created_at'], r['corruption_type'], r['status'], 1) for r in reports)
+        db.session.commit()
+
+        report_total += len(reports)
+        evidence_total += len(evidence)
+
+    return report_total, evidence_total
@@ -0,0 +1,276 @@
+import bisect
+import hashlib
+import random
+import re
+import struct
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app
+from sqlalchemy import func
+from extensions import db
+from models import Report, ReportBucket, ReportSignature
+
+SHINGLE_SIZE = 3  # Words per shingle
+NUM_PERM = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERM // BANDS  # 32 bands of 4: pairs above ~0.6 similarity nearly always share a bucket
+SIGNATURE_FORMAT = f'<{NUM_PERM}I'
+INDEX_BATCH_SIZE = 1000
+PROBE_CHUNK_SIZE = 100  # (band, bucket) lookups per UNION ALL statement
+PROBE_LIMIT = 50  # Newest earlier reports read per (band, bucket), so campaign floods stay cheap
+MAX_CANDIDATES = 1000  # Most recent candidates compared per report
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Fixed seed: signatures have to stay comparable across processes and restarts
+_rng = random.Random(0x5EED)
+PERMUTATIONS = tuple((_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                     for _ in range(NUM_PERM))
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def shingles(text):
+    """Overlapping word triples of the lower-cased text; texts this short are one shingle"""
+    words = WORD_PATTERN.findall((text or '').lower())
+    if len(words) <= SHINGLE_SIZE:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(text):
+    """MinHash signature of a text as NUM_PERM 32-bit values, or None if it has no words"""
+    hashes = [int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'little')
+              for shingle in shingles(text)]
+    if not hashes:
+        return None
+    return tuple(min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes) for a, b in PERMUTATIONS)
+
+
+def band_keys(signature):
+    """(band, bucket) keys of a signature; a bucket is a signed 64-bit hash of the band's values"""
+    keys = []
+    for band in range(BANDS):
+        values = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f'<{ROWS_PER_BAND}I', *values), digest_size=8).digest()
+        keys.append((band, int.from_bytes(digest, 'little', signed=True)))
+    return keys
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def signatures_for(rows):
+    """(report id, signature) for (report id, description) rows; picklable for process pools"""
+    return [(report_id, minhash(description)) for report_id, description in rows]
+
+
+def remove_from_index(report_ids):
+    """Drop reports from the index before they are deleted or re-indexed; the caller commits"""
+    ReportBucket.query.filter(ReportBucket.report_id.in_(report_ids)).delete(synchronize_session=False)
+    ReportSignature.query.filter(ReportSignature.report_id.in_(report_ids)).delete(synchronize_session=False)
+
+
+def _probe(bounds):
+    """
+    For {(band, bucket): report id} bounds, the newest PROBE_LIMIT stored
+    report ids below the bound under each key. Every lookup is a bounded
+    backwards range scan of the bucket table's primary key, however many
+    reports share the bucket.
+    """
+    keys = sorted(bounds)
+    found = defaultdict(list)
+    for start in range(0, len(keys), PROBE_CHUNK_SIZE):
+        lookups = [
+            db.select(ReportBucket.band, ReportBucket.bucket, ReportBucket.report_id)
+            .where(ReportBucket.band == band, ReportBucket.bucket == bucket,
+                   ReportBucket.report_id < bounds[(band, bucket)])
+            .order_by(ReportBucket.report_id.desc()).limit(PROBE_LIMIT)
+            .subquery()
+            for band, bucket in keys[start:start + PROBE_CHUNK_SIZE]
+        ]
+        rows = db.session.execute(db.union_all(*[db.select(lookup) for lookup in lookups]))
+        for band, bucket, report_id in rows:
+            found[(band, bucket)].append(report_id)
+    return found
+
+
+def _batch_candidates(keys):
+    """
+    Candidates of each report among the earlier reports of its own batch,
+    limited like a probe: the newest PROBE_LIMIT earlier ids per key
+    """
+    members = defaultdict(list)
+    for report_id in sorted(keys):
+        for key in keys[report_id]:
+            members[key].append(report_id)
+    candidates = {}
+    for report_id, report_keys in keys.items():
+        earlier = set()
+        for key in report_keys:
+            ids = members[key]
+            end = bisect.bisect_left(ids, report_id)
+            earlier.update(ids[max(0, end - PROBE_LIMIT):end])
+        candidates[report_id] = earlier
+    return candidates
+
+
+def _stored_signatures(report_ids):
+    """report id -> (signature, cluster id) for already indexed reports"""
+    report_ids = sorted(report_ids)
+    stored = {}
+    for start in range(0, len(report_ids), INDEX_BATCH_SIZE):
+        rows = db.session.query(ReportSignature.report_id, ReportSignature.signature, ReportSignature.cluster_id) \
+            .filter(ReportSignature.report_id.in_(report_ids[start:start + INDEX_BATCH_SIZE]))
+        for report_id, signature, cluster_id in rows:
+            stored[report_id] = (struct.unpack(SIGNATURE_FORMAT, signature), cluster_id)
+    return stored
+
+
+def index_signatures(items):
+    """
+    Store (report id, signature) pairs and put each report in the cluster of
+    its most similar earlier report above SIMILARITY_THRESHOLD, or in a new
+    cluster of its own. Candidates come from bounded probes of the bucket
+    table for the whole batch, never from a scan. Reports are handled in id
+    order, so live indexing and backfills build the same clusters. Reports
+    without a signature (no words) are left out. The caller commits.
+    """
+    items = sorted(items)
+    if not items:
+        return
+    remove_from_index([report_id for report_id, _ in items])
+    items = [(report_id, signature) for report_id, signature in items if signature is not None]
+    if not items:
+        return
+
+    keys = {report_id: band_keys(signature) for report_id, signature in items}
+    # Stored reports are probed below the newest batch member under each key;
+    # the batch's own reports are matched in memory
+    bounds = {}
+    for report_id, report_keys in keys.items():
+        for key in report_keys:
+            bounds[key] = max(bounds.get(key, 0), report_id)
+    found = _probe(bounds)
+    in_batch = _batch_candidates(keys)
+    candidates = {
+        report_id: sorted({other for key in report_keys for other in found[key] if other < report_id}
+                          | in_batch[report_id], reverse=True)[:MAX_CANDIDATES]
+        for report_id, report_keys in keys.items()
+    }
+
+    db.session.execute(db.insert(ReportBucket), [
+        {'band': band, 'bucket': bucket, 'report_id': report_id}
+        for report_id, report_keys in keys.items() for band, bucket in report_keys
+    ])
+    known = _stored_signatures({other for others in candidates.values() for other in others} - set(keys))
+
+    threshold = current_app.config['SIMILARITY_THRESHOLD']
+    rows = []
+    for report_id, signature in items:
+        best, cluster_id = threshold, report_id
+        for other in candidates[report_id]:
+            # Earlier reports of the same batch are in known by now
+            if other in known:
+                score = similarity(signature, known[other][0])
+                if score >= best:
+                    best, cluster_id = score, known[other][1]
+        known[report_id] = (signature, cluster_id)
+        rows.append({'report_id': report_id, 'signature': struct.pack(SIGNATURE_FORMAT, *signature),
+                     'cluster_id': cluster_id})
+    db.session.execute(db.insert(ReportSignature), rows)
+
+
+def index_report(report):
+    """Index one report after it is created or its description changes; the caller commits"""
+    index_signatures([(report.id, minhash(report.description))])
+
+
+def index_reports(report_ids):
+    """Index reports by id, e.g. from a background job after a bulk import; the caller commits"""
+    rows = db.session.query(Report.id, Report.description).filter(Report.id.in_(report_ids)).all()
+    index_signatures(signatures_for(rows))
+
+
+def _unindexed_batches(batch_size):
+    """Batches of (id, description) for reports without a signature, in id order"""
+    last_id = 0
+    while True:
+        rows = db.session.query(Report.id, Report.description) \
+            .outerjoin(ReportSignature, ReportSignature.report_id == Report.id) \
+            .filter(ReportSignature.report_id.is_(None), Report.id > last_id) \
+            .order_by(Report.id).limit(batch_size).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+def backfill_index(workers, batch_size=INDEX_BATCH_SIZE, rebuild=False):
+    """
+    Index every report without a signature, in id order. A process pool
+    computes signatures a few batches ahead while this process stores the
+    finished ones, committing each batch. Returns how many reports were
+    indexed.
+    """
+    if rebuild:
+        db.session.execute(db.delete(ReportBucket))
+        db.session.execute(db.delete(ReportSignature))
+        db.session.commit()
+
+    indexed = 0
+    pending = deque()
+
+    def store(future):
+        items = future.result()
+        index_signatures(items)
+        db.session.commit()
+        return len(items)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for rows in _unindexed_batches(batch_size):
+            pending.append(pool.submit(signatures_for, rows))
+            if len(pending) > workers:
+                indexed += store(pending.popleft())
+        while pending:
+            indexed += store(pending.popleft())
+    return indexed
+
+
+def similar_counts(report_ids):
+    """How many other reports share each report's cluster, for reports that have any"""
+    clusters = dict(db.session.query(ReportSignature.report_id, ReportSignature.cluster_id)
+                    .filter(ReportSignature.report_id.in_(report_ids)))
+    if not clusters:
+        return {}
+    sizes = dict(db.session.query(ReportSignature.cluster_id, func.count(ReportSignature.report_id))
+                 .filter(ReportSignature.cluster_id.in_(set(clusters.values())))
+                 .group_by(ReportSignature.cluster_id))
+    return {report_id: sizes[cluster_id] - 1 for report_id, cluster_id in clusters.items()
+            if sizes.get(cluster_id, 1) > 1}
+
+
+def similar_reports(report_id, limit):
+    """
+    The other reports in a report's cluster, most similar first, as
+    (report, similarity) pairs, with the number of other members
+    """
+    own = db.session.get(ReportSignature, report_id)
+    if own is None:
+        return [], 0
+
+    members = ReportSignature.query.filter(ReportSignature.cluster_id == own.cluster_id,
+                                           ReportSignature.report_id != report_id)
+    total = members.count()
+    if not total:
+        return [], 0
+
+    signature = struct.unpack(SIGNATURE_FORMAT, own.signature)
+    scores = sorted(
+        ((similarity(signature, struct.unpack(SIGNATURE_FORMAT, member.signature)), member.report_id)
+         for member in members.order_by(ReportSignature.report_id.desc()).limit(MAX_CANDIDATES)),
+        reverse=True
+    )[:limit]
+    reports = {report.id: report for report in Report.query.filter(Report.id.in_([rid for _, rid in scores]))}
+    return [(reports[rid], score) for score, rid in scores if rid in reports], total
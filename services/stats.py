@@ -0,0 +1,65 @@
+import threading
+import time
+from flask import current_app
+from sqlalchemy import func
+from extensions import db
+from models import Report
+from services.replica import primary_reads
+
+_lock = threading.Lock()
+_cache = {'stats': None, 'expires_at': 0.0, 'generation': 0}
+
+
+def _load_dashboard_stats():
+    """Compute every dashboard counter and the type list from one GROUP BY"""
+    rows = db.session.query(
+        Report.status,
+        Report.corruption_type,
+        func.count(Report.id)
+    ).group_by(Report.status, Report.corruption_type).all()
+    
+    by_status = {}
+    corruption_types = set()
+    for status, corruption_type, count in rows:
+        by_status[status] = by_status.get(status, 0) + count
+        corruption_types.add(corruption_type)
+    
+    return {
+        'total_reports': sum(by_status.values()),
+        'pending_reports': by_status.get('Pending', 0),
+        'reviewed_reports': by_status.get('Reviewed', 0),
+        'resolved_reports': by_status.get('Resolved', 0),
+        'corruption_types': sorted(corruption_types),
+    }
+
+
+def get_dashboard_stats():
+    """
+    Return the dashboard statistics, recomputing them once the TTL expires.
+    They are shared by every admin of the worker, so they are computed on
+    the primary even in replica-routed views: a lagging replica would put
+    counts from before an admin's own write back into the cache.
+    """
+    now = time.monotonic()
+    with _lock:
+        if _cache['stats'] is not None and now < _cache['expires_at']:
+            return _cache['stats']
+        generation = _cache['generation']
+    
+    with primary_reads():
+        stats = _load_dashboard_stats()
+    
+    with _lock:
+        # A write invalidated the cache while these were computed; use them once, keep nothing
+        if generation == _cache['generation']:
+            _cache['stats'] = stats
+            _cache['expires_at'] = now + current_app.config['STATS_CACHE_TTL']
+    return stats
+
+
+def invalidate_dashboard_stats():
+    """Drop the cached statistics after a write that changes report counts"""
+    with _lock:
+        _cache['stats'] = None
+        _cache['expires_at'] = 0.0
+        _cache['generation'] += 1
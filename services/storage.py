@@ -0,0 +1,316 @@
+import fcntl
+import hashlib
+import json
+import os
+import re
+import secrets
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from extensions import db
+from models import ArchivedEvidence, Evidence
+from services.metadata import can_strip, strip_metadata
+
+CHUNK_SIZE = 64 * 1024
+STORED_NAME_PATTERN = re.compile(r'^([0-9a-f]{64})(\.\w+)?$')
+CLAIM_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{22}$')
+
+_session_hooked = False
+
+
+def content_path(content_hash, ext):
+    """Sharded location of a stored file, relative to UPLOAD_FOLDER: ab/cd/<hash>.<ext>"""
+    name = f'{content_hash}.{ext.lower()}' if ext else content_hash
+    return '/'.join([content_hash[:2], content_hash[2:4], name])
+
+
+def thumbnail_filename(content_hash):
+    """Location of the JPEG thumbnail derived from a stored file: thumbs/ab/cd/<hash>.jpg"""
+    return 'thumbs/' + content_path(content_hash, 'jpg')
+
+
+def content_hash_of(filename):
+    """The content hash encoded in a stored filename, or None for legacy uploads"""
+    match = STORED_NAME_PATTERN.match(filename.rsplit('/', 1)[-1])
+    return match.group(1) if match else None
+
+
+def absolute_path(filename):
+    """Absolute path of a stored evidence file"""
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], *filename.split('/'))
+
+
+def _temp_dir():
+    temp_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], '.tmp')
+    os.makedirs(temp_dir, exist_ok=True)
+    return temp_dir
+
+
+def _temp_file():
+    return tempfile.NamedTemporaryFile(dir=_temp_dir(), delete=False)
+
+
+# ==============================
+# Claims
+# ==============================
+# A file stored before the row that references it has committed is claimed:
+# a small marker under .claims that release_files respects. Claims are
+# written and checked under one lock file, so a release never deletes a
+# file that an upload of the same content is moving into place.
+def _claims_dir():
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], '.claims')
+
+
+def _claim_path(claim_id):
+    return os.path.join(_claims_dir(), claim_id)
+
+
+@contextmanager
+def _claims_lock(exclusive):
+    os.makedirs(_claims_dir(), exist_ok=True)
+    with open(os.path.join(_claims_dir(), '.lock'), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+
+
+def _claimed_hashes():
+    hashes = set()
+    for name in os.listdir(_claims_dir()):
+        if CLAIM_ID_PATTERN.match(name):
+            try:
+                with open(_claim_path(name)) as f:
+                    hashes.add(json.load(f)['content_hash'])
+            except (OSError, ValueError, KeyError):
+                continue
+    return hashes
+
+
+def hold_claim(claim_id):
+    """Keep a claim until the current transaction commits; after a rollback it stays until it expires"""
+    db.session.info.setdefault('storage_claims', []).append(claim_id)
+
+
+def drop_claims(claim_ids):
+    """Remove claims whose files are now referenced by committed rows"""
+    for claim_id in claim_ids:
+        try:
+            os.remove(_claim_path(claim_id))
+        except FileNotFoundError:
+            pass
+
+
+def take_claim(claim_id):
+    """
+    Move a pending claim to the current transaction. Only the first caller
+    gets it, so an upload token attaches its file once. Returns False if
+    the claim was already taken or has expired.
+    """
+    if not CLAIM_ID_PATTERN.match(claim_id or ''):
+        return False
+    taken_id = secrets.token_urlsafe(16)
+    with _claims_lock(exclusive=False):
+        try:
+            os.rename(_claim_path(claim_id), _claim_path(taken_id))
+        except FileNotFoundError:
+            return False
+    # Its age restarts, so expire_claims leaves it alone while the transaction runs
+    os.utime(_claim_path(taken_id))
+    hold_claim(taken_id)
+    return True
+
+
+def expire_claims(max_age):
+    """
+    Drop claims older than max_age seconds, e.g. uploads that were never
+    attached to a report or whose report was rolled back, and release
+    their files unless something else references them. Returns how many
+    claims expired.
+    """
+    if not os.path.isdir(_claims_dir()):
+        return 0
+
+    cutoff = time.time() - max_age
+    expired = []
+    for name in os.listdir(_claims_dir()):
+        if not CLAIM_ID_PATTERN.match(name):
+            continue
+        path = _claim_path(name)
+        try:
+            # take_claim may have renamed it since the listing
+            if os.path.getmtime(path) >= cutoff:
+                continue
+            with open(path) as f:
+                claim = json.load(f)
+            os.remove(path)
+        except (OSError, ValueError):
+            continue
+        expired.append((claim['filename'], claim['content_hash']))
+
+    release_files(expired)
+    return len(expired)
+
+
+def _drop_claims_after_commit(session):
+    claim_ids = session.info.pop('storage_claims', None)
+    if claim_ids:
+        drop_claims(claim_ids)
+
+
+def _forget_claims_after_rollback(session):
+    session.info.pop('storage_claims', None)
+
+
+def _commit_temp_file(temp_path, content_hash, ext):
+    """
+    Move a fully written temp file into its content-addressed location,
+    claimed so it cannot be released before a row references it.
+    Returns (filename, claim id).
+    """
+    filename = content_path(content_hash, ext)
+    target = absolute_path(filename)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    claim_id = secrets.token_urlsafe(16)
+    with _claims_lock(exclusive=False):
+        with open(_claim_path(claim_id), 'w') as f:
+            json.dump({'filename': filename, 'content_hash': content_hash}, f)
+        # os.replace is atomic, so identical content arriving concurrently is harmless
+        os.replace(temp_path, target)
+    return filename, claim_id
+
+
+class _HashingWriter:
+    """Writes to a file while hashing and counting what was written"""
+
+    def __init__(self, f):
+        self.f = f
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.digest.update(data)
+        self.f.write(data)
+        self.size += len(data)
+
+
+def _write_stripped(stream, ext):
+    """
+    Copy a stream to a temp file without its image metadata, hashing the
+    bytes as they are written: one pass however much is stripped.
+    Returns (temp path, content_hash, size).
+    """
+    with _temp_file() as temp:
+        writer = _HashingWriter(temp)
+        try:
+            strip_metadata(stream, writer, ext)
+        except BaseException:
+            temp.close()
+            os.remove(temp.name)
+            raise
+    return temp.name, writer.digest.hexdigest(), writer.size
+
+
+def store_stream(stream, ext):
+    """
+    Copy a stream to disk, stripping image metadata and hashing it on the
+    way, for a row added in the current transaction: the file stays claimed
+    until it commits. The hash and size are of the stored file.
+    Returns (filename, content_hash, size); identical content shares one file.
+    """
+    temp_path, content_hash, size = _write_stripped(stream, ext)
+    filename, claim_id = _commit_temp_file(temp_path, content_hash, ext)
+    hold_claim(claim_id)
+    return filename, content_hash, size
+
+
+def copy_into_store(path, content_hash, ext):
+    """
+    Add a copy of a file that stays where it is, e.g. a legacy upload whose
+    row still points at it, for a row updated in the current transaction:
+    the copy stays claimed until it commits. Hard links where it can, so
+    the copy takes no extra space. Returns the stored filename.
+    """
+    temp_path = os.path.join(_temp_dir(), secrets.token_hex(16))
+    try:
+        os.link(path, temp_path)
+    except OSError:
+        shutil.copyfile(path, temp_path)
+    filename, claim_id = _commit_temp_file(temp_path, content_hash, ext)
+    hold_claim(claim_id)
+    return filename
+
+
+def store_file(path, ext):
+    """
+    Move a file that is already on disk under UPLOAD_FOLDER into the store.
+    Images are rewritten without their metadata in the pass that hashes
+    them; other files are hashed and renamed. The caller keeps the returned
+    claim until a row references the file.
+    Returns (filename, content_hash, size, claim id).
+    """
+    if can_strip(ext):
+        with open(path, 'rb') as source:
+            temp_path, content_hash, size = _write_stripped(source, ext)
+        os.remove(path)
+    else:
+        temp_path, content_hash, size = path, hash_file(path), os.path.getsize(path)
+    filename, claim_id = _commit_temp_file(temp_path, content_hash, ext)
+    return filename, content_hash, size, claim_id
+
+
+def hash_file(path):
+    """SHA-256 of a file on disk, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def release_files(stored):
+    """
+    Remove stored files that no evidence row references any more and no
+    pending upload has claimed. Takes (filename, content_hash) pairs
+    captured before the rows were deleted; call it after the deleting
+    transaction has committed.
+    """
+    stored = set(stored)
+    hashes = {content_hash for _, content_hash in stored if content_hash}
+
+    with _claims_lock(exclusive=True):
+        # Claims first: a claim is only dropped once its row is committed, so it is seen either way
+        claimed = _claimed_hashes()
+        referenced = set()
+        if hashes:
+            # Archived evidence keeps pointing at the same stored files
+            for model in (Evidence, ArchivedEvidence):
+                referenced.update(
+                    db.session.query(model.filename, model.content_hash)
+                    .filter(model.content_hash.in_(hashes))
+                )
+        referenced_names = {filename for filename, _ in referenced}
+        referenced_hashes = {content_hash for _, content_hash in referenced}
+
+        for filename, content_hash in stored:
+            if content_hash in claimed:
+                continue
+            paths = []
+            if filename not in referenced_names:
+                paths.append(absolute_path(filename))
+            if content_hash and content_hash not in referenced_hashes:
+                paths.append(absolute_path(thumbnail_filename(content_hash)))
+            for path in paths:
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def init_storage(app):
+    """Drop file claims once the rows that reference the files have committed"""
+    global _session_hooked
+    if not _session_hooked:
+        event.listen(Session, 'after_commit', _drop_claims_after_commit)
+        event.listen(Session, 'after_rollback', _forget_claims_after_rollback)
+        _session_hooked = True
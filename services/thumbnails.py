@@ -0,0 +1,115 @@
+import logging
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app
+from services.storage import absolute_path, thumbnail_filename
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it evidence simply has no thumbnails
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+IMAGE_TYPES = {'jpg', 'jpeg', 'png', 'gif'}
+PDF_TYPES = {'pdf'}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn keeps the pool independent of the web server's threads and sockets
+            _executor = ProcessPoolExecutor(max_workers=workers,
+                                            mp_context=multiprocessing.get_context('spawn'))
+        return _executor
+
+
+def can_thumbnail(file_type):
+    if Image is None:
+        return False
+    file_type = (file_type or '').lower()
+    return file_type in IMAGE_TYPES or (file_type in PDF_TYPES and shutil.which('pdftoppm') is not None)
+
+
+def _render_pdf_page(source, work_dir, max_size):
+    """Render the first page of a PDF to a JPEG with poppler's pdftoppm"""
+    prefix = os.path.join(work_dir, 'page')
+    subprocess.run(
+        ['pdftoppm', '-jpeg', '-f', '1', '-l', '1', '-singlefile',
+         '-scale-to', str(max_size * 2), source, prefix],
+        check=True, capture_output=True, timeout=60
+    )
+    return prefix + '.jpg'
+
+
+def generate_thumbnail(source, target, file_type, max_size):
+    """
+    Write a bounded JPEG derivative of an image or the first page of a PDF.
+    The derivative is re-encoded without EXIF, so camera and GPS metadata
+    never reach it. Runs in a pool process; returns the target path.
+    """
+    if os.path.exists(target):
+        return target
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(target)) as work_dir:
+        if file_type.lower() in PDF_TYPES:
+            source = _render_pdf_page(source, work_dir, max_size)
+
+        with Image.open(source) as image:
+            image.draft('RGB', (max_size, max_size))  # Decode large JPEGs at reduced scale
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((max_size, max_size))
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+
+            temp_target = os.path.join(work_dir, 'thumb.jpg')
+            image.save(temp_target, 'JPEG', quality=80, optimize=True)
+
+        os.replace(temp_target, target)
+    return target
+
+
+def _log_failure(future):
+    error = future.exception()
+    if error is not None:
+        logger.warning('Thumbnail generation failed: %s', error)
+
+
+def schedule_thumbnails(stored):
+    """
+    Queue thumbnail generation in the process pool for newly stored files,
+    given as (filename, content_hash, file_type). Call after commit; the
+    request does not wait for the results.
+    """
+    max_size = current_app.config['THUMBNAIL_SIZE']
+    jobs = []
+    for filename, content_hash, file_type in stored:
+        if content_hash and can_thumbnail(file_type):
+            target = absolute_path(thumbnail_filename(content_hash))
+            if not os.path.exists(target):
+                jobs.append((absolute_path(filename), target, file_type, max_size))
+
+    if not jobs:
+        return
+
+    executor = _get_executor(current_app.config['THUMBNAIL_WORKERS'])
+    for job in jobs:
+        executor.submit(generate_thumbnail, *job).add_done_callback(_log_failure)
+
+
+def thumbnail_for(evidence):
+    """Stored filename of an evidence thumbnail if it has been generated, else None"""
+    if not evidence.content_hash:
+        return None
+    filename = thumbnail_filename(evidence.content_hash)
+    return filename if os.path.exists(absolute_path(filename)) else None
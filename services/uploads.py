@@ -0,0 +1,191 @@
+import fcntl
+import json
+import os
+import re
+import secrets
+import shutil
+import time
+from contextlib import contextmanager
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from services.storage import CHUNK_SIZE, store_file, take_claim
+
+UPLOAD_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{22}$')
+
+
+class UploadError(Exception):
+    """A chunked upload request that cannot be applied"""
+
+    def __init__(self, message, status=400, **extra):
+        super().__init__(message)
+        self.status = status
+        self.extra = extra
+
+
+def _sessions_dir():
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], '.chunks')
+
+
+def _session_dir(upload_id):
+    if not UPLOAD_ID_PATTERN.match(upload_id or ''):
+        raise UploadError('Unknown upload', 404)
+    path = os.path.join(_sessions_dir(), upload_id)
+    if not os.path.isdir(path):
+        raise UploadError('Unknown upload', 404)
+    return path
+
+
+def _load_meta(path):
+    with open(os.path.join(path, 'meta.json')) as f:
+        return json.load(f)
+
+
+def _received(path):
+    return os.path.getsize(os.path.join(path, 'data'))
+
+
+@contextmanager
+def _locked_data(path, mode):
+    """
+    The session's data file, locked so one writer or completion at a time
+    gets it, even across worker processes. Raises UploadError if a
+    completion moved the file away first.
+    """
+    data_path = os.path.join(path, 'data')
+    try:
+        data = open(data_path, mode)
+    except FileNotFoundError:
+        raise UploadError('Unknown upload', 404)
+    with data:
+        fcntl.flock(data, fcntl.LOCK_EX)
+        if not os.path.exists(data_path):
+            raise UploadError('Unknown upload', 404)
+        yield data
+
+
+def start_upload(filename, ext, size):
+    """Open an upload session for a file of a declared size"""
+    if size <= 0 or size > current_app.config['CHUNKED_UPLOAD_MAX_SIZE']:
+        raise UploadError('File is empty or too large', 413)
+
+    upload_id = secrets.token_urlsafe(16)
+    path = os.path.join(_sessions_dir(), upload_id)
+    os.makedirs(path)
+
+    meta = {
+        'filename': filename,
+        'ext': ext,
+        'size': size,
+        'chunk_size': current_app.config['UPLOAD_CHUNK_SIZE'],
+        'created': time.time(),
+    }
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+    open(os.path.join(path, 'data'), 'wb').close()
+
+    return upload_id, meta
+
+
+def upload_status(upload_id):
+    """Return (meta, bytes received) so a client can resume where it stopped"""
+    path = _session_dir(upload_id)
+    return _load_meta(path), _received(path)
+
+
+def append_part(upload_id, index, stream):
+    """
+    Append part `index` to the session. Parts must arrive in order; a part
+    that was already received is acknowledged without being written again.
+    Returns the number of bytes received so far.
+    """
+    path = _session_dir(upload_id)
+    meta = _load_meta(path)
+    chunk_size = meta['chunk_size']
+    offset = index * chunk_size
+    expected_length = min(chunk_size, meta['size'] - offset)
+
+    if expected_length <= 0:
+        raise UploadError('Part is beyond the end of the file')
+
+    with _locked_data(path, 'r+b') as data:
+        data.seek(0, os.SEEK_END)
+        received = data.tell()
+
+        if offset + expected_length <= received:
+            return received
+        if offset != received:
+            raise UploadError('Parts must be sent in order', 409, received=received)
+
+        written = 0
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+            written += len(chunk)
+            if written > expected_length:
+                break
+            data.write(chunk)
+
+        if written != expected_length:
+            data.truncate(offset)
+            raise UploadError(f'Part {index} must be {expected_length} bytes', received=offset)
+
+        return offset + written
+
+
+def complete_upload(upload_id):
+    """Move a fully received upload into the evidence store and sign a token for it"""
+    path = _session_dir(upload_id)
+    meta = _load_meta(path)
+    # Of two concurrent completions the second finds the session gone
+    with _locked_data(path, 'rb') as data:
+        received = os.fstat(data.fileno()).st_size
+        if received != meta['size']:
+            raise UploadError('Upload is incomplete', 409, received=received)
+
+        # The file stays claimed until a report that references it commits
+        stored_name, content_hash, size, claim_id = store_file(os.path.join(path, 'data'), meta['ext'])
+        shutil.rmtree(path, ignore_errors=True)
+
+    return _serializer().dumps({
+        'claim': claim_id,
+        'filename': stored_name,
+        'content_hash': content_hash,
+        'original_filename': meta['filename'],
+        'file_type': meta['ext'],
+        'file_size': size,
+    })
+
+
+def load_evidence_token(token):
+    """
+    Return the stored-file details from a completed upload token, or None.
+    A token is good for one report: its file's claim moves to the current
+    transaction, and later uses find it gone.
+    """
+    try:
+        upload = _serializer().loads(token, max_age=current_app.config['UPLOAD_SESSION_TTL'])
+    except BadSignature:
+        return None
+    if not take_claim(upload.pop('claim', None)):
+        return None
+    return upload
+
+
+def purge_stale_uploads():
+    """Remove unfinished upload sessions older than UPLOAD_SESSION_TTL; returns how many"""
+    root = _sessions_dir()
+    if not os.path.isdir(root):
+        return 0
+
+    cutoff = time.time() - current_app.config['UPLOAD_SESSION_TTL']
+    purged = 0
+    for upload_id in os.listdir(root):
+        path = os.path.join(root, upload_id)
+        data = os.path.join(path, 'data')
+        last_write = os.path.getmtime(data if os.path.exists(data) else path)
+        if last_write < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+            purged += 1
+    return purged
+
+
+def _serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt='evidence-upload')
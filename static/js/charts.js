@@ -0,0 +1,58 @@
+// Reports-per-day chart on the admin dashboard, drawn from the daily rollups
+(function() {
+    'use strict';
+    
+    const canvas = document.getElementById('dailyChart');
+    if (!canvas || typeof Chart === 'undefined') {
+        return;
+    }
+    
+    const groupSelect = document.querySelector('[data-chart-group]');
+    const daysSelect = document.querySelector('[data-chart-days]');
+    let chart = null;
+    
+    const isoDate = date => date.toISOString().slice(0, 10);
+    
+    const load = async () => {
+        const to = new Date();
+        const from = new Date(to.getTime() - (parseInt(daysSelect.value, 10) - 1) * 86400000);
+        const params = new URLSearchParams({
+            date_from: isoDate(from),
+            date_to: isoDate(to),
+            group: groupSelect.value
+        });
+        
+        const response = await fetch(`${canvas.dataset.url}?${params}`, {
+            headers: { 'Accept': 'application/json' }
+        });
+        if (!response.ok) {
+            return;
+        }
+        const data = await response.json();
+        
+        const datasets = Object.entries(data.series).map(([name, counts]) => ({
+            label: name,
+            data: counts
+        }));
+        
+        if (chart) {
+            chart.destroy();
+        }
+        chart = new Chart(canvas, {
+            type: 'bar',
+            data: { labels: data.days, datasets: datasets },
+            options: {
+                animation: false,
+                scales: {
+                    x: { stacked: true },
+                    y: { stacked: true, beginAtZero: true, ticks: { precision: 0 } }
+                },
+                plugins: { legend: { position: 'bottom' } }
+            }
+        });
+    };
+    
+    groupSelect.addEventListener('change', load);
+    daysSelect.addEventListener('change', load);
+    load();
+})();
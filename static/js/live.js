@@ -0,0 +1,151 @@
+// Live dashboard: applies report changes from the server's event stream
+// instead of reloading the page
+(function() {
+    'use strict';
+    
+    const tbody = document.getElementById('reportRows');
+    // No events URL when the deployment has LIVE_DASHBOARD turned off
+    if (!tbody || !tbody.dataset.eventsUrl || typeof EventSource === 'undefined') {
+        return;
+    }
+    
+    const liveStatus = document.getElementById('liveStatus');
+    const perPage = parseInt(tbody.dataset.perPage, 10);
+    const statusClasses = { Pending: 'bg-warning', Reviewed: 'bg-info', Resolved: 'bg-success' };
+    
+    const setLive = (connected) => {
+        liveStatus.textContent = connected ? 'Live' : 'Reconnecting…';
+        liveStatus.className = `badge ms-2 fs-6 ${connected ? 'bg-success' : 'bg-secondary'}`;
+    };
+    
+    const adjustStat = (name, delta) => {
+        const stat = document.querySelector(`[data-stat="${name}"]`);
+        if (stat) {
+            stat.textContent = Math.max(0, parseInt(stat.textContent, 10) + delta);
+        }
+    };
+    
+    const element = (tag, className, text) => {
+        const node = document.createElement(tag);
+        if (className) {
+            node.className = className;
+        }
+        if (text !== undefined) {
+            node.textContent = text;
+        }
+        return node;
+    };
+    
+    const cell = (...children) => {
+        const td = element('td');
+        children.forEach(child => td.append(child));
+        return td;
+    };
+    
+    const statusBadge = (status) => {
+        const badge = element('span', `badge ${statusClasses[status] || 'bg-success'}`, status);
+        badge.dataset.statusBadge = '';
+        return badge;
+    };
+    
+    // Same columns as the server-rendered rows; text only, never HTML
+    const buildRow = (report) => {
+        const tr = element('tr', 'table-warning');
+        tr.dataset.reportId = report.id;
+        
+        const checkbox = element('input', 'form-check-input');
+        checkbox.type = 'checkbox';
+        checkbox.name = 'report_ids';
+        checkbox.value = report.id;
+        
+        const description = element('div', 'text-truncate', report.description);
+        description.style.maxWidth = '200px';
+        description.title = report.description;
+        
+        const link = element('a', 'btn btn-sm btn-primary');
+        link.href = report.url;
+        link.title = 'View Details';
+        link.append(element('i', 'fas fa-eye'));
+        
+        tr.append(
+            cell(checkbox),
+            cell(element('span', 'badge bg-secondary', report.report_id)),
+            cell(element('span', 'badge bg-info', report.corruption_type)),
+            cell(description),
+            cell(report.location || 'N/A'),
+            cell(statusBadge(report.status)),
+            cell(report.evidence_count
+                ? element('span', 'badge bg-primary', `${report.evidence_count} file(s)`)
+                : element('span', 'text-muted', 'None')),
+            cell(report.created_at),
+            cell(link)
+        );
+        return tr;
+    };
+    
+    const matchesFilters = (report) =>
+        tbody.dataset.liveInsert === '1' &&
+        (!tbody.dataset.statusFilter || tbody.dataset.statusFilter === report.status) &&
+        (!tbody.dataset.typeFilter || tbody.dataset.typeFilter === report.corruption_type);
+    
+    const findRow = (id) => tbody.querySelector(`tr[data-report-id="${id}"]`);
+    
+    const showReloadNotice = () => {
+        if (document.getElementById('liveReload')) {
+            return;
+        }
+        const notice = element('div', 'alert alert-info d-flex justify-content-between align-items-center',
+                               'Several reports have changed.');
+        notice.id = 'liveReload';
+        const reload = element('button', 'btn btn-sm btn-primary', 'Reload');
+        reload.type = 'button';
+        reload.addEventListener('click', () => window.location.reload());
+        notice.append(reload);
+        tbody.closest('.card').before(notice);
+    };
+    
+    const handlers = {
+        report_created: (report) => {
+            adjustStat('total', 1);
+            adjustStat(report.status, 1);
+            if (!matchesFilters(report) || findRow(report.id)) {
+                return;
+            }
+            const empty = tbody.querySelector('tr[data-empty-row]');
+            if (empty) {
+                empty.remove();
+            }
+            tbody.prepend(buildRow(report));
+            // Keep the page length; the oldest row moves to the next page
+            const rows = tbody.querySelectorAll('tr[data-report-id]');
+            if (rows.length > perPage) {
+                rows[rows.length - 1].remove();
+            }
+        },
+        status_changed: (change) => {
+            adjustStat(change.old_status, -1);
+            adjustStat(change.status, 1);
+            const row = findRow(change.id);
+            const badge = row && row.querySelector('[data-status-badge]');
+            if (badge) {
+                badge.replaceWith(statusBadge(change.status));
+            }
+        },
+        report_deleted: (change) => {
+            adjustStat('total', -1);
+            adjustStat(change.status, -1);
+            const row = findRow(change.id);
+            if (row) {
+                row.remove();
+            }
+        },
+        refresh: showReloadNotice
+    };
+    
+    const source = new EventSource(tbody.dataset.eventsUrl);
+    source.addEventListener('open', () => setLive(true));
+    source.addEventListener('error', () => setLive(false));
+    Object.entries(handlers).forEach(([type, handler]) => {
+        source.addEventListener(type, (event) => handler(JSON.parse(event.data)));
+    });
+})();
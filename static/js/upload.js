@@ -0,0 +1,88 @@
+// Chunked, resumable evidence uploads
+(function() {
+    'use strict';
+    
+    const MAX_RETRIES = 5;
+    
+    const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+    
+    const requestJSON = async (url, options) => {
+        const response = await fetch(url, options);
+        const body = await response.json().catch(() => ({}));
+        if (!response.ok) {
+            const error = new Error(body.error || `Upload failed (${response.status})`);
+            error.status = response.status;
+            error.received = body.received;
+            throw error;
+        }
+        return body;
+    };
+    
+    // Upload one file in fixed-size parts, resuming from the server's offset after errors
+    const uploadFile = async (startUrl, file, onProgress) => {
+        const session = await requestJSON(startUrl, {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({filename: file.name, size: file.size})
+        });
+        
+        let received = 0;
+        let retries = 0;
+        while (received < file.size) {
+            const index = Math.floor(received / session.chunk_size);
+            const part = file.slice(index * session.chunk_size, (index + 1) * session.chunk_size);
+            try {
+                const result = await requestJSON(`${session.url}/${index}`, {method: 'PUT', body: part});
+                received = result.received;
+                retries = 0;
+                onProgress(received / file.size);
+            } catch (error) {
+                if (++retries > MAX_RETRIES || (error.status && error.status < 500 && error.status !== 409)) {
+                    throw error;
+                }
+                await sleep(1000 * retries);
+                received = (await requestJSON(session.url)).received;
+            }
+        }
+        
+        const result = await requestJSON(`${session.url}/complete`, {method: 'POST'});
+        return result.evidence_token;
+    };
+    
+    document.querySelectorAll('form[data-chunked-upload]').forEach(form => {
+        const input = form.querySelector('input[type="file"]');
+        const status = form.querySelector('[data-upload-status]');
+        let uploading = false;
+        
+        form.addEventListener('submit', async event => {
+            if (!input || !input.files.length || uploading) {
+                return;
+            }
+            event.preventDefault();
+            uploading = true;
+            
+            try {
+                const files = Array.from(input.files);
+                for (const [i, file] of files.entries()) {
+                    const token = await uploadFile(form.dataset.chunkedUpload, file, fraction => {
+                        if (status) {
+                            status.textContent = `Uploading ${file.name} (${i + 1}/${files.length}): ${Math.round(fraction * 100)}%`;
+                        }
+                    });
+                    const hidden = document.createElement('input');
+                    hidden.type = 'hidden';
+                    hidden.name = 'evidence_token';
+                    hidden.value = token;
+                    form.appendChild(hidden);
+                }
+                input.value = '';
+                form.submit();
+            } catch (error) {
+                uploading = false;
+                if (status) {
+                    status.textContent = error.message;
+                }
+            }
+        });
+    });
+})();
@@ -0,0 +1,84 @@
+import pytest
+from flask_migrate import upgrade
+from sqlalchemy import event
+from app import create_app
+from config import Config
+from extensions import db
+import models
+from models import Admin
+from services import history, page_cache, report_cache, stats
+
+
+@pytest.fixture
+def app(tmp_path):
+    """The app on a fresh SQLite database and upload folder"""
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'test.db'}"
+        SQLALCHEMY_BINDS = {}
+        UPLOAD_FOLDER = str(tmp_path / 'uploads')
+        TEMPLATE_CACHE_DIR = str(tmp_path)
+        PROXY_FIX_X_FOR = 0
+        LOOKUP_RATE_BURST = 10 ** 9
+        UPLOAD_RATE_BURST = 10 ** 9
+        THUMBNAIL_WORKERS = 1
+
+    # Per-process caches outlive an app; start every test without them
+    stats.invalidate_dashboard_stats()
+    report_cache.invalidate_reports()
+    page_cache._pages.clear()
+    page_cache._fragments.clear()
+    models._admin_cache.clear()
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        # Only the primary: a replica test leaves its bind key registered on db
+        db.create_all(bind_key=None)
+        yield app
+        history.flush()
+        db.session.remove()
+        db.drop_all(bind_key=None)
+
+
+@pytest.fixture
+def migrated(app):
+    """The app's database built by the migrations, with the raw DDL create_all leaves out (e.g. SQLite FTS5)"""
+    db.drop_all(bind_key=None)
+    upgrade(directory='migrations')
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def admin(app):
+    """A test client logged in as an admin"""
+    account = Admin(username='admin', email='admin@example.com')
+    account.set_password('secret')
+    db.session.add(account)
+    db.session.commit()
+
+    client = app.test_client()
+    client.post('/admin/login', data={'username': 'admin', 'password': 'secret'})
+    return client
+
+
+@pytest.fixture
+def count_queries(app):
+    """Call with a function; returns how many SQL statements it ran"""
+    def count(action):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            action()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        return len(statements)
+    return count
@@ -0,0 +1,23 @@
+from extensions import db
+from models import Admin
+
+
+def get(app, client, url):
+    # Flask-Login keeps the user on g; a fresh app context per request, as in production
+    with app.app_context():
+        return client.get(url)
+
+
+def test_admin_is_loaded_once_per_cache_ttl(app, admin, count_queries):
+    get(app, admin, '/admin/report/0')
+
+    assert count_queries(lambda: get(app, admin, '/admin/report/0')) == 1  # Only the report lookup
+
+
+def test_deleted_admin_is_logged_out_at_once(app, admin):
+    assert get(app, admin, '/admin/dashboard').status_code == 200
+
+    db.session.delete(Admin.query.one())
+    db.session.commit()
+
+    assert get(app, admin, '/admin/dashboard').status_code == 302
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+import pytest
+from extensions import db
+from models import ArchivedEvidence, ArchivedReport, Evidence, Report
+from services.archive import archive_resolved_reports
+from services.seed import seed_reports
+
+
+@pytest.fixture
+def old_resolved(app):
+    seed_reports(40, seed=22)
+    report = Report.query.join(Evidence).filter(Report.status == 'Resolved').first()
+    Report.query.filter(Report.status == 'Resolved') \
+        .update({'updated_at': datetime.utcnow() - timedelta(days=400)}, synchronize_session=False)
+    db.session.commit()
+    return report.id, report.report_id, len(report.evidence)
+
+
+def test_old_resolved_reports_move_to_the_archive(old_resolved):
+    report_id, public_id, evidence_count = old_resolved
+    resolved = Report.query.filter_by(status='Resolved').count()
+
+    assert archive_resolved_reports(365, batch_size=7) == resolved
+
+    assert Report.query.filter_by(status='Resolved').count() == 0
+    assert db.session.get(Report, report_id) is None
+    archived = ArchivedReport.query.filter_by(id=report_id).one()
+    assert archived.report_id == public_id
+    assert ArchivedEvidence.query.filter_by(report_id=report_id).count() == evidence_count
+
+
+def test_recent_and_unresolved_reports_stay(app):
+    seed_reports(20, seed=23)
+    operational = Report.query.count()
+
+    archive_resolved_reports(365 * 10)
+
+    assert Report.query.count() == operational
+
+
+def test_archived_reports_stay_trackable_and_viewable(old_resolved, client, admin):
+    report_id, public_id, _ = old_resolved
+    archive_resolved_reports(365)
+
+    assert public_id in client.get(f'/manage/{public_id}').get_data(as_text=True)
+    assert admin.get(f'/admin/archive/{report_id}').status_code == 200
+    dashboard = admin.get('/admin/dashboard?archived=1&status=Resolved').get_data(as_text=True)
+    assert public_id in dashboard
@@ -0,0 +1,56 @@
+from models import Evidence, Job, Report
+from services.seed import seed_reports
+
+
+def test_bulk_status_update_of_checked_reports(app, admin):
+    seed_reports(20, seed=13)
+    chosen = [report.id for report in Report.query.order_by(Report.id).limit(5)]
+
+    admin.post('/admin/reports/bulk', data={'action': 'status', 'new_status': 'Reviewed', 'report_ids': chosen})
+
+    assert {report.status for report in Report.query.filter(Report.id.in_(chosen))} == {'Reviewed'}
+
+
+def test_bulk_status_update_of_everything_matching_the_filter(app, admin):
+    seed_reports(40, seed=14)
+    reviewed = Report.query.filter_by(status='Reviewed').count()
+
+    admin.post('/admin/reports/bulk', data={'action': 'status', 'new_status': 'Resolved', 'scope': 'filter',
+                                            'status': 'Pending'})
+
+    assert Report.query.filter_by(status='Pending').count() == 0
+    assert Report.query.filter_by(status='Reviewed').count() == reviewed
+
+
+def test_bulk_delete_removes_evidence_rows_and_queues_file_cleanup(app, admin):
+    seed_reports(20, seed=15)
+    chosen = [report.id for report in Report.query.join(Evidence).distinct().limit(5)]
+
+    admin.post('/admin/reports/bulk', data={'action': 'delete', 'report_ids': chosen})
+
+    assert Report.query.filter(Report.id.in_(chosen)).count() == 0
+    assert Evidence.query.filter(Evidence.report_id.in_(chosen)).count() == 0
+    assert Job.query.filter_by(kind='release_files').count() == 1
+
+
+def test_bulk_statement_count_does_not_grow_with_the_selection(app, admin, count_queries):
+    seed_reports(200, seed=16)
+    ids = [report.id for report in Report.query.order_by(Report.id)]
+
+    counts = [count_queries(lambda: admin.post('/admin/reports/bulk', data={
+        'action': 'status', 'new_status': status, 'report_ids': ids[:size]}))
+        for size, status in ((5, 'Reviewed'), (150, 'Resolved'))]
+
+    assert counts[0] == counts[1]
+
+
+def test_bulk_action_returns_to_the_same_filtered_view(app, admin):
+    seed_reports(5, seed=17)
+    filters = {'status': 'Pending', 'q': 'contract', 'archived': '1'}
+
+    response = admin.post('/admin/reports/bulk', data={'action': 'status', 'new_status': 'Reviewed',
+                                                       'scope': 'filter', **filters})
+
+    location = response.headers['Location']
+    assert location.startswith('/admin/dashboard?')
+    assert all(f'{name}={value}' in location for name, value in filters.items())
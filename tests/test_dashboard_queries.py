@@ -0,0 +1,39 @@
+import pytest
+from extensions import db
+from models import Evidence, Report
+from services.seed import seed_reports
+from services.stats import invalidate_dashboard_stats
+
+
+@pytest.fixture
+def reports(app):
+    seed_reports(120, seed=1)
+
+
+def dashboard_statements(app, admin, count_queries, per_page):
+    app.config['REPORTS_PER_PAGE'] = per_page
+    invalidate_dashboard_stats()
+
+    def load():
+        response = admin.get('/admin/dashboard')
+        assert response.status_code == 200
+        assert response.get_data(as_text=True).count('data-report-id="') == per_page
+    return count_queries(load)
+
+
+def test_dashboard_statement_count_does_not_grow_with_page_size(app, admin, reports, count_queries):
+    counts = [dashboard_statements(app, admin, count_queries, per_page) for per_page in (5, 20, 50)]
+    assert counts[0] == counts[1] == counts[2]
+
+
+def test_report_page_statement_count_does_not_grow_with_evidence(app, admin, reports, count_queries):
+    few, many = Report.query.order_by(Report.id).limit(2).all()
+    for report, files in ((few, 1), (many, 10)):
+        Evidence.query.filter_by(report_id=report.id).delete()
+        for i in range(files):
+            db.session.add(Evidence(report_id=report.id, filename=f'{report.id}-{i}.pdf',
+                                    original_filename=f'{i}.pdf', file_type='pdf', file_size=10))
+    db.session.commit()
+
+    counts = [count_queries(lambda: admin.get(f'/admin/report/{report.id}')) for report in (few, many)]
+    assert counts[0] == counts[1]
@@ -0,0 +1,67 @@
+import json
+import pytest
+from extensions import db
+from models import Report
+from services import events
+
+
+@pytest.fixture
+def subscription(app):
+    subscription = events.subscribe()
+    yield subscription
+    events.unsubscribe(subscription)
+
+
+def received(subscription):
+    changes = []
+    while (change := subscription.get(timeout=0)) is not None:
+        changes.append(change)
+    return changes
+
+
+def test_submission_is_pushed_after_commit(subscription, client):
+    client.post('/report', data={'corruption_type': 'Fraud', 'description': 'Invoices inflated'})
+
+    change, = received(subscription)
+    assert change['type'] == 'report_created'
+    assert change['description'] == 'Invoices inflated' and change['status'] == 'Pending'
+
+
+def test_rolled_back_changes_are_never_sent(subscription, client):
+    client.post('/report', data={'corruption_type': 'Fraud', 'description': 'Invoices inflated'})
+    received(subscription)
+    report = Report.query.one()
+    events.publish('report_deleted', id=report.id)
+    db.session.delete(report)
+    db.session.rollback()
+    db.session.commit()
+
+    assert received(subscription) == []
+
+
+def test_slow_client_is_told_to_reload(app, subscription):
+    for n in range(app.config['SSE_QUEUE_SIZE'] + 1):
+        events._broadcast({'type': 'status_changed', 'id': n})
+
+    stream = events.stream_events(subscription, heartbeat=0)
+    assert next(stream).startswith('retry:')
+    assert next(stream) == 'event: refresh\ndata: {}\n\n'
+    assert json.loads(next(stream).split('data: ', 1)[1])['id'] == 0
+
+
+def test_stream_sends_keepalives_and_unsubscribes_on_close(subscription):
+    stream = events.stream_events(subscription, heartbeat=0)
+    next(stream)
+
+    assert next(stream) == ': keepalive\n\n'
+    stream.close()
+    assert subscription not in events._subscribers
+
+
+def test_live_dashboard_can_be_turned_off(app, admin):
+    app.config['LIVE_DASHBOARD'] = False
+
+    page = admin.get('/admin/dashboard').get_data(as_text=True)
+
+    assert 'data-events-url=""' in page and 'liveStatus' not in page
+    assert admin.get('/admin/events').status_code == 404
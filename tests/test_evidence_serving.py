@@ -0,0 +1,49 @@
+import io
+import pytest
+from models import Evidence
+
+CONTENT = b'%PDF-1.4 ' + bytes(range(256)) * 4
+
+
+@pytest.fixture
+def evidence(app, client):
+    client.post('/report', data={'corruption_type': 'Fraud', 'description': 'Payroll ghosts',
+                                 'evidence': (io.BytesIO(CONTENT), 'payroll.pdf')})
+    return Evidence.query.one()
+
+
+def test_evidence_needs_an_admin(evidence, client):
+    assert client.get(f'/admin/uploads/{evidence.filename}').status_code == 302
+
+
+def test_evidence_is_cached_privately_by_content_hash(evidence, admin):
+    response = admin.get(f'/admin/uploads/{evidence.filename}')
+
+    assert response.get_data() == CONTENT
+    assert response.get_etag() == (evidence.content_hash, False)
+    assert response.cache_control.private and response.cache_control.immutable
+    assert not response.cache_control.public
+
+    revalidated = admin.get(f'/admin/uploads/{evidence.filename}',
+                            headers={'If-None-Match': f'"{evidence.content_hash}"'})
+    assert revalidated.status_code == 304
+
+
+def test_range_requests_get_partial_content(evidence, admin):
+    response = admin.get(f'/admin/uploads/{evidence.filename}', headers={'Range': 'bytes=9-18'})
+
+    assert response.status_code == 206
+    assert response.get_data() == CONTENT[9:19]
+
+
+def test_nginx_offload_sends_only_headers(app, evidence, admin):
+    app.config['EVIDENCE_OFFLOAD'] = 'x-accel-redirect'
+
+    response = admin.get(f'/admin/uploads/{evidence.filename}')
+
+    assert response.headers['X-Accel-Redirect'] == app.config['EVIDENCE_ACCEL_PREFIX'] + evidence.filename
+    assert response.get_data() == b''
+
+
+def test_paths_outside_the_upload_folder_are_refused(evidence, admin):
+    assert admin.get('/admin/uploads/../../config.py').status_code == 404
@@ -0,0 +1,38 @@
+import csv
+import io
+from models import Evidence, Report
+from services.seed import seed_reports
+
+
+def export(admin, query=''):
+    response = admin.get('/admin/export' + query)
+    assert response.status_code == 200 and response.is_streamed
+    return list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+
+
+def test_export_lists_every_report_with_its_evidence_count(app, admin):
+    seed_reports(30, seed=3)
+
+    rows = export(admin)
+
+    assert len(rows) == Report.query.count()
+    report = Report.query.join(Evidence).first()
+    row = next(row for row in rows if row['Report ID'] == report.report_id)
+    assert int(row['Evidence Count']) == len(report.evidence)
+
+
+def test_export_statement_count_does_not_grow_with_rows(app, admin, count_queries):
+    counts = []
+    for total in (10, 200):
+        seed_reports(total, seed=4, clear=True)
+        counts.append(count_queries(lambda: export(admin)))
+    assert counts[0] == counts[1]
+
+
+def test_export_applies_the_dashboard_filters(app, admin):
+    seed_reports(40, seed=5)
+
+    rows = export(admin, '?status=Pending')
+
+    assert {row['Status'] for row in rows} == {'Pending'}
+    assert len(rows) == Report.query.filter_by(status='Pending').count()
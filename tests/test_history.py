@@ -0,0 +1,54 @@
+from extensions import db
+from models import Report, ReportEvent
+from services import history
+from services.seed import seed_reports
+
+
+def pending_report(seed):
+    seed_reports(5, seed=seed)
+    report = Report.query.first()
+    report.status = 'Pending'
+    db.session.commit()
+    return report
+
+
+def test_status_changes_are_recorded_with_their_actor(app, admin):
+    report = pending_report(24)
+
+    admin.post(f'/admin/report/{report.id}/update_status', data={'status': 'Reviewed'})
+    admin.post(f'/admin/report/{report.id}/update_status', data={'status': 'Resolved'})
+
+    entries = [(entry.old_status, entry.new_status, entry.actor) for entry in history.timeline(report.id)]
+    assert entries == [('Pending', 'Reviewed', 'admin'), ('Reviewed', 'Resolved', 'admin')]
+
+
+def test_buffered_entries_are_visible_before_they_are_written(app, admin):
+    report = pending_report(25)
+    admin.post(f'/admin/report/{report.id}/update_status', data={'status': 'Reviewed'})
+
+    assert len(history.timeline(report.id)) == 1
+
+    history.flush()
+    assert ReportEvent.query.one().new_status == 'Reviewed'
+    assert len(history.timeline(report.id)) == 1
+
+
+def test_rolled_back_changes_leave_no_history(app):
+    seed_reports(1, seed=26)
+    report = Report.query.one()
+    history.record(report.id, 'status_changed', 'Pending', 'Resolved')
+    report.status = 'Resolved'
+    db.session.rollback()
+
+    assert history.flush() == 0
+    assert history.timeline(report.id) == []
+
+
+def test_history_survives_deleting_the_report(app, admin):
+    seed_reports(1, seed=27)
+    report = Report.query.one()
+
+    admin.post(f'/admin/report/{report.id}/delete')
+    history.flush()
+
+    assert [entry.event_type for entry in history.timeline(report.id)] == ['deleted']
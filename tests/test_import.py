@@ -0,0 +1,96 @@
+import io
+import os
+import time
+from sqlalchemy.exc import OperationalError
+from models import Job, Report
+from services import events, history, ingest
+
+CSV_HEADER = 'corruption_type,description,location\n'
+
+
+def _csv(rows):
+    return io.BytesIO((CSV_HEADER + ''.join(f'Bribery,Report number {n},Nairobi\n' for n in range(rows))).encode())
+
+
+def test_database_error_stops_the_import_and_keeps_earlier_batches(app, tmp_path, monkeypatch):
+    load_batch = ingest._load_batch
+    calls = []
+
+    def failing_second_batch(rows):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise OperationalError('INSERT', {}, Exception('disk full'))
+        load_batch(rows)
+
+    monkeypatch.setattr(ingest, '_load_batch', failing_second_batch)
+    result = ingest.import_reports(_csv(5), 'csv', str(tmp_path / 'rejects.csv'), batch_size=2)
+
+    assert result.imported == 2
+    assert 'line 4' in result.error and 'disk full' in result.error
+    assert Report.query.count() == 2
+
+
+def test_import_route_reports_the_partial_result(app, admin, monkeypatch):
+    def failing_batch(rows):
+        raise OperationalError('INSERT', {}, Exception('disk full'))
+
+    monkeypatch.setattr(ingest, '_load_batch', failing_batch)
+    response = admin.post('/admin/import', data={'file': (_csv(3), 'partner.csv')},
+                          headers={'Accept': 'application/json'})
+
+    assert response.status_code == 400
+    assert response.json['imported'] == 0
+    assert 'disk full' in response.json['error']
+
+
+def test_purge_rejects_deletes_only_old_reject_files(tmp_path):
+    old, new, other = (tmp_path / name for name in ('rejects-old.csv', 'rejects-new.csv', 'notes.txt'))
+    for path in (old, new, other):
+        path.write_text('x')
+    stale = time.time() - 3600
+    os.utime(old, (stale, stale))
+    os.utime(other, (stale, stale))
+
+    assert ingest.purge_rejects(str(tmp_path), 60) == 1
+    assert not old.exists() and new.exists() and other.exists()
+
+
+def test_invalid_rows_go_to_the_reject_file(app, tmp_path):
+    source = io.BytesIO(b'{"corruption_type": "Fraud", "description": "Ghost workers on payroll"}\n'
+                        b'{"corruption_type": "Gossip", "description": "Not a known type"}\n'
+                        b'not json\n'
+                        b'{"corruption_type": "Bribery", "description": "Cash at the gate", "created_at": "2024-03-01"}\n')
+    rejects = tmp_path / 'rejects.jsonl'
+
+    result = ingest.import_reports(source, 'jsonl', str(rejects))
+
+    assert (result.imported, result.rejected, result.error) == (2, 2, None)
+    assert [report.report_id.startswith('ACR-') for report in Report.query] == [True, True]
+    lines = rejects.read_text().splitlines()
+    assert 'Unknown corruption_type' in lines[0] and '"_line": 3' in lines[1]
+
+
+def test_dashboard_import_links_the_rejects(app, admin):
+    source = io.BytesIO(b'corruption_type,description\nFraud,Forged receipts\nFraud,\n')
+
+    response = admin.post('/admin/import', data={'file': (source, 'partner.csv')},
+                          headers={'Accept': 'application/json'}).json
+
+    assert (response['imported'], response['rejected']) == (1, 1)
+    assert 'description is required' in admin.get(response['rejects_url']).get_data(as_text=True)
+
+
+def test_imported_reports_get_history_a_dashboard_refresh_and_indexing(app, tmp_path):
+    subscription = events.subscribe()
+    try:
+        ingest.import_reports(_csv(3), 'csv', str(tmp_path / 'rejects.csv'), batch_size=2)
+        refreshes = [subscription.get(timeout=0) for _ in range(2)]
+    finally:
+        events.unsubscribe(subscription)
+
+    assert refreshes == [{'type': 'refresh'}] * 2
+    for report in Report.query:
+        entry, = history.timeline(report.id)
+        assert (entry.event_type, entry.new_status, entry.actor) == ('imported', 'Pending', 'system')
+    indexed = [job.payload['report_ids'] for job in Job.query.filter_by(kind='index_reports')]
+    assert sorted(sum(indexed, [])) == sorted(report.id for report in Report.query)
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+from extensions import db
+from models import Job
+from services import jobs
+
+
+def _stale_job(app, attempts, max_attempts=3):
+    locked_at = datetime.utcnow() - timedelta(seconds=app.config['JOB_LOCK_TIMEOUT'] + 60)
+    stale = Job(kind='test-noop', payload={}, status='running', attempts=attempts,
+                max_attempts=max_attempts, locked_at=locked_at, locked_by='gone:1')
+    db.session.add(stale)
+    db.session.commit()
+    return stale.id
+
+
+def test_stale_job_is_requeued_as_an_attempt(app):
+    job_id = _stale_job(app, attempts=0)
+
+    jobs._requeue_stale(datetime.utcnow())
+    db.session.commit()
+
+    requeued = db.session.get(Job, job_id)
+    db.session.refresh(requeued)
+    assert requeued.status == 'queued'
+    assert requeued.attempts == 1
+    assert requeued.locked_by is None
+    assert requeued.last_error == jobs.STALE_ERROR
+
+
+def test_stale_job_fails_after_max_attempts(app):
+    job_id = _stale_job(app, attempts=2, max_attempts=3)
+
+    assert jobs.claim_jobs('worker:1', 10) == []
+
+    failed = db.session.get(Job, job_id)
+    db.session.refresh(failed)
+    assert failed.status == 'failed'
+    assert failed.attempts == 3
+    assert failed.finished_at is not None
+
+
+def test_worker_runs_queued_jobs(app):
+    ran = []
+    jobs.HANDLERS['test-record'] = lambda value: ran.append(value)
+    try:
+        jobs.enqueue('test-record', value=42)
+        db.session.commit()
+
+        assert jobs.run_worker(concurrency=1, once=True) == 1
+    finally:
+        del jobs.HANDLERS['test-record']
+
+    assert ran == [42]
+    assert Job.query.one().status == 'done'
+
+
+def test_web_process_runs_jobs_only_when_opted_in(app):
+    app.testing = False
+    try:
+        jobs.init_jobs(app)
+        assert jobs._start_embedded_worker not in app.before_request_funcs[None]
+
+        app.config['JOB_WORKER_THREADS'] = 1
+        jobs.init_jobs(app)
+        assert jobs._start_embedded_worker in app.before_request_funcs[None]
+    finally:
+        app.testing = True
+        if jobs._start_embedded_worker in app.before_request_funcs[None]:
+            app.before_request_funcs[None].remove(jobs._start_embedded_worker)
@@ -0,0 +1,97 @@
+import hashlib
+import io
+import pytest
+from services.metadata import strip_metadata
+from services.storage import absolute_path, store_file, store_stream
+
+Image = pytest.importorskip('PIL.Image')
+PngImagePlugin = pytest.importorskip('PIL.PngImagePlugin')
+
+GPS_IFD = 0x8825
+ORIENTATION = 0x0112
+MAKE = 0x010F
+
+
+def photo_with_exif():
+    exif = Image.Exif()
+    exif[MAKE] = 'Reporter phone'
+    exif[ORIENTATION] = 6
+    exif[GPS_IFD] = {1: 'S', 2: (1.0, 17.0, 30.0)}
+    buffer = io.BytesIO()
+    Image.new('RGB', (40, 20), 'red').save(buffer, 'JPEG', exif=exif, comment=b'taken at home')
+    return buffer.getvalue()
+
+
+def strip(data, ext):
+    target = io.BytesIO()
+    changed = strip_metadata(io.BytesIO(data), target, ext)
+    return changed, target.getvalue()
+
+
+def test_jpeg_keeps_pixels_and_orientation_only():
+    original = photo_with_exif()
+
+    changed, stripped = strip(original, 'jpg')
+
+    assert changed
+    with Image.open(io.BytesIO(stripped)) as image:
+        assert dict(image.getexif()) == {ORIENTATION: 6}
+        assert 'comment' not in image.info
+        assert image.tobytes() == Image.open(io.BytesIO(original)).tobytes()
+    assert strip(stripped, 'jpg') == (False, stripped)
+
+
+def test_png_text_chunks_are_removed():
+    info = PngImagePlugin.PngInfo()
+    info.add_text('Author', 'Jane Reporter')
+    buffer = io.BytesIO()
+    Image.new('RGB', (8, 8), 'blue').save(buffer, 'PNG', pnginfo=info)
+
+    changed, stripped = strip(buffer.getvalue(), 'png')
+
+    assert changed
+    with Image.open(io.BytesIO(stripped)) as image:
+        assert 'Author' not in image.info
+        image.load()
+
+
+def test_gif_comments_and_xmp_are_removed_but_looping_kept():
+    frames = [Image.new('RGB', (8, 8), color) for color in ('red', 'blue')]
+    buffer = io.BytesIO()
+    frames[0].save(buffer, 'GIF', save_all=True, append_images=frames[1:], loop=0, comment=b'taken at home')
+    xmp = b'\x21\xff\x0bXMP DataXMP\x0bJane Report\x00'
+    original = buffer.getvalue()[:-1] + xmp + b'\x3b'
+
+    changed, stripped = strip(original, 'gif')
+
+    assert changed and b'taken at home' not in stripped and b'Jane Report' not in stripped
+    with Image.open(io.BytesIO(stripped)) as image:
+        assert image.n_frames == 2 and image.info['loop'] == 0
+    assert strip(stripped, 'gif') == (False, stripped)
+
+
+def test_unparseable_files_are_copied_unchanged():
+    assert strip(b'\xff\xd8not really a jpeg', 'jpg') == (False, b'\xff\xd8not really a jpeg')
+    assert strip(b'%PDF-1.4 whatever', 'pdf') == (False, b'%PDF-1.4 whatever')
+
+
+def test_stored_evidence_hash_is_of_the_stripped_file(app):
+    filename, content_hash, size = store_stream(io.BytesIO(photo_with_exif()), 'jpg')
+
+    with open(absolute_path(filename), 'rb') as f:
+        stored = f.read()
+    assert hashlib.sha256(stored).hexdigest() == content_hash
+    assert len(stored) == size
+    assert b'Reporter phone' not in stored
+
+
+def test_chunked_uploads_are_stripped_in_the_store(app, tmp_path):
+    upload = tmp_path / 'data'
+    upload.write_bytes(photo_with_exif())
+
+    filename, content_hash, size, _ = store_file(str(upload), 'jpg')
+
+    with open(absolute_path(filename), 'rb') as f:
+        stored = f.read()
+    assert (hashlib.sha256(stored).hexdigest(), len(stored)) == (content_hash, size)
+    assert b'Reporter phone' not in stored and not upload.exists()
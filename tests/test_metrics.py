@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+from services import metrics
+
+RECORD_ONE_REQUEST = "from services.metrics import observe; observe('citizen.index', 'GET', 200, 0.02, 3, 0.01, 0)"
+
+
+def test_requests_are_counted(app, client):
+    client.get('/').close()
+
+    assert 'http_requests_total{endpoint="citizen.index",method="GET",status="200"}' in metrics.render_metrics()
+
+
+def test_metrics_are_summed_over_worker_processes(tmp_path, monkeypatch):
+    env = {**os.environ, 'PROMETHEUS_MULTIPROC_DIR': str(tmp_path)}
+    for _ in range(2):
+        subprocess.run([sys.executable, '-c', RECORD_ONE_REQUEST], env=env, check=True, cwd=os.getcwd())
+
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+    rendered = metrics.render_metrics()
+
+    assert 'http_requests_total{endpoint="citizen.index",method="GET",status="200"} 2.0' in rendered
+    assert 'db_statements_total{endpoint="citizen.index"} 6.0' in rendered
+
+
+def test_responses_report_their_sql_time(app, admin):
+    timing = admin.get('/admin/dashboard').headers.getlist('Server-Timing')
+
+    assert any(entry.startswith('db;dur=') and 'queries' in entry for entry in timing)
+
+
+def test_metrics_need_an_admin_or_the_scrape_token(app, client):
+    app.config['METRICS_TOKEN'] = 'scrape-secret'
+
+    assert client.get('/admin/metrics').status_code == 401
+    assert client.get('/admin/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get('/admin/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+
+
+def test_slow_requests_are_logged(app, client, caplog):
+    app.config['SLOW_REQUEST_SECONDS'] = 0
+
+    client.get('/').close()
+
+    assert any('Slow request GET /' in record.getMessage() for record in caplog.records)
+
+
+def test_event_streams_are_not_timed(app, admin, caplog):
+    app.config['SLOW_REQUEST_SECONDS'] = 0
+
+    admin.get('/admin/events').close()
+
+    rendered = metrics.render_metrics()
+    assert 'http_requests_total{endpoint="admin.events",method="GET",status="200"}' in rendered
+    assert 'http_request_duration_seconds_count{endpoint="admin.events"}' not in rendered
+    assert not any('Slow request' in record.getMessage() for record in caplog.records)
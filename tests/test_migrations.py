@@ -0,0 +1,20 @@
+from flask_migrate import check
+from sqlalchemy import text
+from extensions import db
+from services.seed import seed_reports
+
+
+def test_migrations_build_the_schema_the_models_declare(migrated):
+    # Exits if autogenerate would write a new revision
+    check(directory='migrations')
+
+
+def test_filtered_dashboard_query_uses_an_index(app):
+    seed_reports(200, seed=12)
+
+    plan = db.session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM reports WHERE status = 'Pending' ORDER BY created_at DESC, id DESC LIMIT 21"
+    )).all()
+
+    details = ' '.join(row[-1] for row in plan)
+    assert 'ix_reports_status_created_at_id' in details and 'TEMP B-TREE' not in details
@@ -0,0 +1,37 @@
+from extensions import db
+from models import Report
+from services import page_cache
+from services.seed import seed_reports
+
+
+def test_anonymous_pages_are_rendered_once_and_revalidated(app, client):
+    first = client.get('/')
+    assert first.cache_control.public and 'Cookie' in first.vary
+
+    assert client.get('/').get_data() == first.get_data()
+    assert client.get('/', headers={'If-None-Match': first.get_etag()[0]}).status_code == 304
+
+
+def test_admins_and_flash_messages_bypass_the_page_cache(app, client, admin):
+    client.get('/track')
+    client.post('/track', data={'report_id': ''})
+
+    assert 'Please enter a Report ID' in client.get('/track').get_data(as_text=True)
+    assert not admin.get('/').cache_control.public
+
+
+def test_dashboard_rows_are_rendered_from_fragments_until_they_change(app, admin):
+    seed_reports(5, seed=28)
+    report = Report.query.first()
+    report.status = 'Pending'
+    db.session.commit()
+    admin.get('/admin/dashboard')
+    cached = dict(page_cache._fragments)
+
+    admin.post(f'/admin/report/{report.id}/update_status', data={'status': 'Resolved'})
+    page = admin.get('/admin/dashboard').get_data(as_text=True)
+
+    # Only the changed row is rendered again, under a new key
+    assert len(page_cache._fragments) == len(cached) + 1
+    row = page.split(f'data-report-id="{report.id}"', 1)[1].split('</tr>', 1)[0]
+    assert 'Resolved' in row
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+from extensions import db
+from models import Report
+from services.pagination import decode_cursor, keyset_paginate
+from services.seed import seed_reports
+
+
+def walk(per_page):
+    pages, cursor = [], None
+    while True:
+        page = keyset_paginate(Report.query, per_page, cursor)
+        pages.append(page)
+        if not page.has_next:
+            return pages
+        cursor = page.next_cursor
+
+
+def test_pages_cover_every_report_once_newest_first(app):
+    seed_reports(53, seed=9)
+
+    pages = walk(10)
+    seen = [report.id for page in pages for report in page.items]
+
+    expected = [report.id for report in Report.query.order_by(Report.created_at.desc(), Report.id.desc())]
+    assert seen == expected
+    assert len(pages) == 6 and not pages[0].has_prev and pages[1].has_prev
+
+
+def test_previous_cursor_returns_the_same_page(app):
+    seed_reports(30, seed=10)
+    first = keyset_paginate(Report.query, 10)
+    second = keyset_paginate(Report.query, 10, first.next_cursor)
+
+    back = keyset_paginate(Report.query, 10, second.prev_cursor)
+
+    assert [report.id for report in back.items] == [report.id for report in first.items]
+
+
+def test_new_reports_do_not_shift_later_pages(app):
+    seed_reports(30, seed=11)
+    first = keyset_paginate(Report.query, 10)
+    expected = [report.id for report in keyset_paginate(Report.query, 10, first.next_cursor).items]
+
+    db.session.add(Report(report_id='ACR-20990101-NEW00001', corruption_type='Fraud', description='Newest',
+                          created_at=datetime.utcnow() + timedelta(hours=1)))
+    db.session.commit()
+
+    assert [report.id for report in keyset_paginate(Report.query, 10, first.next_cursor).items] == expected
+
+
+def test_tampered_cursor_starts_from_the_first_page(app):
+    assert decode_cursor('not-a-cursor') is None
+    assert decode_cursor('') is None
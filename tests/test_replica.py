@@ -0,0 +1,68 @@
+import re
+import shutil
+import pytest
+from app import create_app
+from config import Config
+from extensions import db
+from models import Admin, Report
+from services import stats
+from services.seed import seed_reports
+
+
+@pytest.fixture
+def replica_app(tmp_path):
+    """An app whose replica is a snapshot of the primary that never catches up"""
+    class ReplicaConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'primary.db'}"
+        SQLALCHEMY_BINDS = {'replica': f"sqlite:///{tmp_path / 'replica.db'}"}
+        UPLOAD_FOLDER = str(tmp_path / 'uploads')
+        TEMPLATE_CACHE_DIR = str(tmp_path)
+        PROXY_FIX_X_FOR = 0
+        # No lag is measured on SQLite, so every dashboard read is routed to the replica
+        REPLICA_MAX_LAG = 0
+
+    stats.invalidate_dashboard_stats()
+    app = create_app(ReplicaConfig)
+    with app.app_context():
+        db.create_all(bind_key=None)
+        seed_reports(40, seed=2)
+        for username in ('writer', 'reader'):
+            account = Admin(username=username, email=f'{username}@example.com')
+            account.set_password('secret')
+            db.session.add(account)
+        db.session.commit()
+        db.engine.dispose()
+        shutil.copy(tmp_path / 'primary.db', tmp_path / 'replica.db')
+        yield app
+        db.session.remove()
+
+
+def login(app, username):
+    client = app.test_client()
+    client.post('/admin/login', data={'username': username, 'password': 'secret'})
+    return client
+
+
+def stat(page, name):
+    return int(re.search(rf'data-stat="{name}">(\d+)<', page).group(1))
+
+
+def test_dashboard_rows_come_from_the_replica(replica_app):
+    reader = login(replica_app, 'reader')
+    Report.query.delete()
+    db.session.commit()
+
+    page = reader.get('/admin/dashboard').get_data(as_text=True)
+    assert page.count('data-report-id="') > 0
+
+
+def test_stats_cache_is_not_filled_from_a_lagging_replica(replica_app):
+    writer, reader = login(replica_app, 'writer'), login(replica_app, 'reader')
+    report = Report.query.filter_by(status='Pending').first()
+    before = stat(reader.get('/admin/dashboard').get_data(as_text=True), 'Pending')
+
+    writer.post(f'/admin/report/{report.id}/update_status', data={'status': 'Resolved'})
+    reader.get('/admin/dashboard')
+
+    assert stat(writer.get('/admin/dashboard').get_data(as_text=True), 'Pending') == before - 1
@@ -0,0 +1,48 @@
+import io
+from datetime import date
+from extensions import db
+from models import Report, ReportDailyStats
+from services.rollups import backfill_daily_stats
+from services.seed import seed_reports
+
+
+def rollups():
+    return {(row.day, row.corruption_type, row.status): row.count
+            for row in ReportDailyStats.query if row.count}
+
+
+def test_rollups_follow_every_kind_of_write(app, admin, client):
+    seed_reports(60, seed=21)
+    client.post('/report', data={'corruption_type': 'Fraud', 'description': 'Forged receipts'})
+    first, second, *rest = Report.query.order_by(Report.id).all()
+    admin.post(f'/admin/report/{first.id}/update_status', data={'status': 'Resolved'})
+    admin.post(f'/admin/report/{second.id}/delete')
+    admin.post('/admin/reports/bulk', data={'action': 'status', 'new_status': 'Reviewed',
+                                            'report_ids': [report.id for report in rest[:10]]})
+    admin.post('/admin/reports/bulk', data={'action': 'delete', 'report_ids': [report.id for report in rest[10:15]]})
+    admin.post('/admin/import', data={'file': (io.BytesIO(b'corruption_type,description\nBribery,Cash at the gate\n'),
+                                               'partner.csv')})
+    live = rollups()
+
+    backfill_daily_stats()
+
+    assert live == rollups()
+
+
+def test_daily_endpoint_groups_by_type(app, admin):
+    today = date.today()
+    db.session.add_all([ReportDailyStats(day=today, corruption_type='Fraud', status='Pending', count=3),
+                        ReportDailyStats(day=today, corruption_type='Fraud', status='Resolved', count=2),
+                        ReportDailyStats(day=today, corruption_type='Bribery', status='Pending', count=1)])
+    db.session.commit()
+
+    data = admin.get(f'/admin/stats/daily?date_from={today}&date_to={today}').json
+
+    assert data['series'] == {'Bribery': [1], 'Fraud': [5]}
+    assert data['totals'] == {'Bribery': 1, 'Fraud': 5}
+
+
+def test_daily_endpoint_rejects_bad_ranges(app, admin):
+    assert admin.get('/admin/stats/daily?date_from=2026-02-01&date_to=2026-01-01').status_code == 400
+    assert admin.get('/admin/stats/daily?date_from=yesterday').status_code == 400
+    assert admin.get('/admin/stats/daily?group=location').status_code == 400
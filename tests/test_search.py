@@ -0,0 +1,56 @@
+import pytest
+from extensions import db
+from models import Report
+from services.search import apply_search
+
+
+@pytest.fixture
+def reports(migrated):
+    texts = [
+        ('The district officer asked for a bribe to approve the road permit', 'Kisumu'),
+        ('Road contract money was diverted by the minister', 'Nairobi'),
+        ('Hospital supplies were sold privately', 'Mombasa'),
+        ('A bribe was paid at the Nairobi land registry', 'Nakuru'),
+    ]
+    for n, (description, location) in enumerate(texts):
+        db.session.add(Report(report_id=f'ACR-20260101-SRCH{n:04d}', corruption_type='Bribery',
+                              description=description, location=location))
+    db.session.commit()
+
+
+def search(q):
+    query, rank = apply_search(Report.query, q)
+    return [report.description for report in query.order_by(rank.desc(), Report.id.desc())]
+
+
+def test_search_matches_descriptions_and_locations(reports):
+    assert search('hospital') == ['Hospital supplies were sold privately']
+    assert len(search('bribe')) == 2
+    assert len(search('nairobi')) == 2
+
+
+def test_location_matches_rank_first(reports):
+    assert search('nairobi')[0] == 'Road contract money was diverted by the minister'
+
+
+def test_query_syntax_in_user_input_is_searched_literally(reports):
+    assert search('road" OR "hospital') == []
+    assert search('NEAR(') == []
+
+
+def test_index_follows_edits_and_deletes(reports):
+    report = Report.query.filter(Report.description.like('Hospital%')).one()
+    report.description = 'Medicine was stolen from the clinic'
+    db.session.commit()
+    assert search('hospital') == []
+    assert search('clinic') == ['Medicine was stolen from the clinic']
+
+    db.session.delete(report)
+    db.session.commit()
+    assert search('clinic') == []
+
+
+def test_dashboard_search(reports, admin):
+    page = admin.get('/admin/dashboard?q=permit').get_data(as_text=True)
+
+    assert page.count('data-report-id="') == 1
@@ -0,0 +1,32 @@
+from extensions import db
+from models import Evidence, Report, ReportDailyStats
+from services.seed import seed_reports
+
+
+def snapshot():
+    return [(report.corruption_type, report.description, report.status)
+            for report in Report.query.order_by(Report.id)]
+
+
+def test_same_seed_reproduces_the_same_reports(app):
+    seed_reports(50, seed=18, clear=True)
+    first = snapshot()
+
+    seed_reports(50, seed=18, clear=True)
+
+    assert snapshot() == first
+    assert len(first) == 50
+
+
+def test_seeded_data_keeps_rollups_in_step(app):
+    reports, evidence = seed_reports(120, seed=19, batch_size=50)
+
+    assert Report.query.count() == reports == 120
+    assert Evidence.query.count() == evidence
+    assert db.session.query(db.func.sum(ReportDailyStats.count)).scalar() == reports
+
+
+def test_seed_command(app):
+    output = app.test_cli_runner().invoke(args=['seed', '25', '--seed', '20']).output
+
+    assert 'Inserted 25 report(s)' in output
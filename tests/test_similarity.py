@@ -0,0 +1,60 @@
+import itertools
+from extensions import db
+from models import Report, ReportSignature
+from services import similarity
+from services.seed import seed_reports
+
+_numbers = itertools.count()
+FLOOD = 'The customs officer demanded a cash payment before releasing the shipment at the northern border post'
+
+
+def add_reports(descriptions):
+    reports = [Report(report_id=f'ACR-20260101-{next(_numbers):08X}', corruption_type='Bribery', description=text)
+               for text in descriptions]
+    db.session.add_all(reports)
+    db.session.flush()
+    return reports
+
+
+def clusters():
+    return dict(db.session.query(ReportSignature.report_id, ReportSignature.cluster_id))
+
+
+def test_near_duplicates_share_a_cluster(app):
+    first, copy, other = add_reports([FLOOD, FLOOD + ' again', 'A clerk sold exam answers to students'])
+    for report in (first, copy, other):
+        similarity.index_report(report)
+    db.session.commit()
+
+    assert clusters() == {first.id: first.id, copy.id: first.id, other.id: other.id}
+    similar, total = similarity.similar_reports(first.id, 10)
+    assert total == 1 and similar[0][0].id == copy.id
+
+
+def test_probe_reads_a_bounded_number_of_rows_in_a_flood(app):
+    flood = add_reports([FLOOD] * (similarity.PROBE_LIMIT * 3))
+    similarity.index_signatures(similarity.signatures_for([(r.id, r.description) for r in flood]))
+    db.session.commit()
+
+    newcomer, = add_reports([FLOOD])
+    keys = similarity.band_keys(similarity.minhash(FLOOD))
+    found = similarity._probe({key: newcomer.id for key in keys})
+    assert all(len(ids) == similarity.PROBE_LIMIT for ids in found.values())
+    assert max(ids[0] for ids in found.values()) == flood[-1].id
+
+    similarity.index_report(newcomer)
+    assert clusters()[newcomer.id] == flood[0].id
+
+
+def test_backfill_builds_the_same_clusters_as_live_indexing(app):
+    seed_reports(150, seed=3)
+    add_reports([FLOOD] * 5 + [FLOOD + ' twice'] * 5)
+    db.session.commit()
+
+    for report in Report.query.order_by(Report.id):
+        similarity.index_report(report)
+    db.session.commit()
+    live = clusters()
+
+    similarity.backfill_index(workers=1, batch_size=40, rebuild=True)
+    assert clusters() == live
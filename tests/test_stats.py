@@ -0,0 +1,32 @@
+from extensions import db
+from models import Report
+from services import stats
+from services.seed import seed_reports
+
+
+def test_stats_match_the_reports_table(app):
+    seed_reports(60, seed=6)
+
+    result = stats.get_dashboard_stats()
+
+    assert result['total_reports'] == Report.query.count()
+    for status in ('Pending', 'Reviewed', 'Resolved'):
+        assert result[f'{status.lower()}_reports'] == Report.query.filter_by(status=status).count()
+    assert result['corruption_types'] == sorted({type_ for (type_,) in db.session.query(Report.corruption_type)})
+
+
+def test_stats_are_one_query_then_cached(app, count_queries):
+    seed_reports(20, seed=7)
+
+    assert count_queries(stats.get_dashboard_stats) == 1
+    assert count_queries(stats.get_dashboard_stats) == 0
+
+
+def test_status_change_invalidates_the_cache(app, admin):
+    seed_reports(20, seed=8)
+    report = Report.query.filter_by(status='Pending').first()
+    pending = stats.get_dashboard_stats()['pending_reports']
+
+    admin.post(f'/admin/report/{report.id}/update_status', data={'status': 'Resolved'})
+
+    assert stats.get_dashboard_stats()['pending_reports'] == pending - 1
@@ -0,0 +1,101 @@
+import csv
+import io
+import os
+import zipfile
+import pytest
+from extensions import db
+from models import Evidence, Report
+from services.storage import absolute_path, release_files, store_stream
+
+
+def legacy_evidence(app, names):
+    report = Report(report_id='ACR-20260101-00000001', corruption_type='Fraud', description='Forged invoices')
+    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    for name in names:
+        with open(absolute_path(name), 'wb') as f:
+            f.write(b'same bytes')
+        report.evidence.append(Evidence(filename=name, original_filename=name, file_type='pdf'))
+    db.session.add(report)
+    db.session.commit()
+    return report
+
+
+def test_rehome_moves_legacy_files_into_the_store(app):
+    legacy_evidence(app, ['one.pdf', 'two.pdf'])
+
+    output = app.test_cli_runner().invoke(args=['evidence', 'rehome']).output
+
+    assert 'Moved 1, deduplicated 1, missing 0' in output
+    for evidence in Evidence.query:
+        assert evidence.content_hash and os.path.exists(absolute_path(evidence.filename))
+    assert not os.path.exists(absolute_path('one.pdf'))
+    assert not os.path.exists(absolute_path('two.pdf'))
+
+
+def test_rehome_keeps_legacy_files_until_the_rows_commit(app, monkeypatch):
+    legacy_evidence(app, ['one.pdf'])
+
+    def crash():
+        raise RuntimeError('killed')
+
+    monkeypatch.setattr(db.session, 'commit', crash)
+    with pytest.raises(RuntimeError):
+        app.test_cli_runner().invoke(args=['evidence', 'rehome'], catch_exceptions=False)
+    monkeypatch.undo()
+    db.session.rollback()
+
+    evidence = Evidence.query.one()
+    assert evidence.filename == 'one.pdf'
+    assert os.path.exists(absolute_path('one.pdf'))
+
+
+def test_evidence_bundle_manifest_matches_the_files(app, admin):
+    legacy_evidence(app, ['one.pdf', 'two.pdf'])
+    os.remove(absolute_path('two.pdf'))
+
+    archive = zipfile.ZipFile(io.BytesIO(admin.get('/admin/export/evidence').get_data()))
+    manifest = list(csv.DictReader(io.StringIO(archive.read('manifest.csv').decode())))
+
+    included = {row['File'] for row in manifest if row['Included'] == 'Yes'}
+    assert included == set(archive.namelist()) - {'manifest.csv'}
+    assert len(included) == 1 and len(manifest) == 2
+
+
+def submit(client, content, name='scan.pdf'):
+    return client.post('/report', data={'corruption_type': 'Fraud', 'description': 'Forged invoices',
+                                        'evidence': (io.BytesIO(content), name)})
+
+
+def test_identical_evidence_is_stored_once(app, client):
+    submit(client, b'%PDF-1.4 same')
+    submit(client, b'%PDF-1.4 same', name='copy.pdf')
+
+    first, second = Evidence.query.order_by(Evidence.id)
+    assert first.filename == second.filename
+    assert first.filename == f'{first.content_hash[:2]}/{first.content_hash[2:4]}/{first.content_hash}.pdf'
+    assert os.path.exists(absolute_path(first.filename))
+
+
+def test_shared_file_is_released_with_its_last_reference(app, client):
+    submit(client, b'%PDF-1.4 shared')
+    submit(client, b'%PDF-1.4 shared')
+    first, second = Evidence.query.order_by(Evidence.id)
+    stored = [(first.filename, first.content_hash)]
+
+    db.session.delete(first)
+    db.session.commit()
+    release_files(stored)
+    assert os.path.exists(absolute_path(second.filename))
+
+    db.session.delete(second)
+    db.session.commit()
+    release_files(stored)
+    assert not os.path.exists(absolute_path(second.filename))
+
+
+def test_file_of_an_uncommitted_row_is_not_released(app):
+    filename, content_hash, _ = store_stream(io.BytesIO(b'%PDF-1.4 pending'), 'pdf')
+
+    release_files([(filename, content_hash)])
+
+    assert os.path.exists(absolute_path(filename))
@@ -0,0 +1,44 @@
+import io
+import pytest
+from extensions import db
+from models import Evidence, Report
+from services.storage import absolute_path, store_stream, thumbnail_filename
+from services.thumbnails import generate_thumbnail, thumbnail_for
+
+Image = pytest.importorskip('PIL.Image')
+
+
+def photo(size=(1200, 800)):
+    buffer = io.BytesIO()
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Rotated 90 degrees clockwise
+    Image.new('RGB', size, 'green').save(buffer, 'JPEG', exif=exif)
+    return buffer.getvalue()
+
+
+def test_thumbnail_is_bounded_upright_and_without_exif(app):
+    filename, content_hash, _ = store_stream(io.BytesIO(photo()), 'jpg')
+    target = absolute_path(thumbnail_filename(content_hash))
+
+    generate_thumbnail(absolute_path(filename), target, 'jpg', app.config['THUMBNAIL_SIZE'])
+
+    with Image.open(target) as thumbnail:
+        assert max(thumbnail.size) == app.config['THUMBNAIL_SIZE']
+        assert thumbnail.height > thumbnail.width
+        assert not thumbnail.getexif()
+
+
+def test_report_page_shows_a_thumbnail_once_generated(app, admin):
+    filename, content_hash, size = store_stream(io.BytesIO(photo()), 'jpg')
+    report = Report(report_id='ACR-20260101-THUMB001', corruption_type='Fraud', description='Photo of the ledger')
+    report.evidence.append(Evidence(filename=filename, content_hash=content_hash, original_filename='ledger.jpg',
+                                    file_type='jpg', file_size=size))
+    db.session.add(report)
+    db.session.commit()
+    evidence = report.evidence[0]
+    assert thumbnail_for(evidence) is None
+
+    generate_thumbnail(absolute_path(filename), absolute_path(thumbnail_filename(content_hash)), 'jpg', 320)
+
+    assert thumbnail_for(evidence) == thumbnail_filename(content_hash)
+    assert thumbnail_filename(content_hash) in admin.get(f'/admin/report/{report.id}').get_data(as_text=True)
@@ -0,0 +1,53 @@
+import pytest
+from app import create_app
+from models import Report
+from services.report_cache import get_report_snapshot
+from services.seed import seed_reports
+
+
+@pytest.fixture
+def report(app):
+    seed_reports(5, seed=17)
+    return Report.query.first()
+
+
+def test_lookups_are_served_from_the_cache(report, count_queries):
+    assert get_report_snapshot(report.report_id).description == report.description
+
+    assert count_queries(lambda: get_report_snapshot(report.report_id)) == 0
+
+
+def test_unknown_and_malformed_ids_cost_at_most_one_query(app, count_queries):
+    assert count_queries(lambda: get_report_snapshot('ACR-20260101-DEADBEEF')) > 0
+    assert count_queries(lambda: get_report_snapshot('ACR-20260101-DEADBEEF')) == 0
+    assert count_queries(lambda: get_report_snapshot("' OR 1=1 --")) == 0
+
+
+def test_status_change_reaches_the_tracking_page(report, admin, client):
+    client.get(f'/manage/{report.report_id}')
+
+    admin.post(f'/admin/report/{report.id}/update_status', data={'status': 'Reviewed'})
+
+    assert 'Reviewed' in client.get(f'/manage/{report.report_id}').get_data(as_text=True)
+
+
+def test_lookups_are_rate_limited_per_forwarded_client(app, report):
+    # ProxyFix wraps the app when it is created, so build one behind a proxy
+    config = {key: value for key, value in app.config.items() if key.isupper()}
+    config.update(PROXY_FIX_X_FOR=1, LOOKUP_RATE_BURST=2, LOOKUP_RATE_LIMIT=0)
+    client = create_app(type('ProxiedConfig', (), config)).test_client()
+
+    def lookup(address):
+        return client.get(f'/manage/{report.report_id}', environ_base={'REMOTE_ADDR': '10.0.0.1'},
+                          headers={'X-Forwarded-For': address}).status_code
+
+    assert [lookup('198.51.100.1') for _ in range(3)] == [200, 200, 429]
+    assert lookup('198.51.100.2') == 200
+
+
+def test_track_form_does_not_use_up_lookups(app, client):
+    app.config['LOOKUP_RATE_BURST'] = 1
+    app.config['LOOKUP_RATE_LIMIT'] = 0
+    environ = {'REMOTE_ADDR': '198.51.100.3'}
+
+    assert [client.get('/track', environ_base=environ).status_code for _ in range(3)] == [200, 200, 200]
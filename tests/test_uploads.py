@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+from models import Evidence, Report
+from services import uploads
+from services.storage import absolute_path, expire_claims
+
+CONTENT = b'%PDF-1.4 ' + os.urandom(2500)
+
+
+def upload(client, content=CONTENT, chunk_size=1000):
+    started = client.post('/upload', json={'filename': 'ledger.pdf', 'size': len(content)}).json
+    upload_id = started['upload_id']
+    for index, offset in enumerate(range(0, len(content), chunk_size)):
+        client.put(f'/upload/{upload_id}/{index}', data=content[offset:offset + chunk_size])
+    return upload_id
+
+
+def submit(client, token):
+    return client.post('/report', data={'corruption_type': 'Fraud', 'description': 'Ledger copies',
+                                        'evidence_token': token})
+
+
+def test_chunked_upload_is_attached_to_a_report(app, client):
+    app.config['UPLOAD_CHUNK_SIZE'] = 1000
+    upload_id = upload(client)
+    token = client.post(f'/upload/{upload_id}/complete').json['evidence_token']
+
+    submit(client, token)
+
+    evidence = Evidence.query.one()
+    assert evidence.original_filename == 'ledger.pdf' and evidence.file_size == len(CONTENT)
+    with open(absolute_path(evidence.filename), 'rb') as f:
+        assert f.read() == CONTENT
+
+
+def test_interrupted_upload_resumes_from_the_received_offset(app, client):
+    app.config['UPLOAD_CHUNK_SIZE'] = 1000
+    upload_id = client.post('/upload', json={'filename': 'ledger.pdf', 'size': len(CONTENT)}).json['upload_id']
+    client.put(f'/upload/{upload_id}/0', data=CONTENT[:1000])
+
+    assert client.put(f'/upload/{upload_id}/2', data=CONTENT[2000:]).status_code == 409
+    assert client.put(f'/upload/{upload_id}/0', data=CONTENT[:1000]).json['received'] == 1000
+    assert client.get(f'/upload/{upload_id}').json['received'] == 1000
+    assert client.post(f'/upload/{upload_id}/complete').status_code == 409
+
+
+def test_concurrent_completions_store_the_file_once(app, client, monkeypatch):
+    app.config['UPLOAD_CHUNK_SIZE'] = 1000
+    upload_id = upload(client)
+    store_file = uploads.store_file
+    monkeypatch.setattr(uploads, 'store_file', lambda *args: time.sleep(0.2) or store_file(*args))
+    statuses = []
+
+    def complete():
+        statuses.append(app.test_client().post(f'/upload/{upload_id}/complete').status_code)
+    threads = [threading.Thread(target=complete) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(statuses) == [200, 404]
+
+
+def test_upload_token_attaches_its_file_once(app, client):
+    app.config['UPLOAD_CHUNK_SIZE'] = 1000
+    token = client.post(f'/upload/{upload(client)}/complete').json['evidence_token']
+
+    submit(client, token)
+    submit(client, token)
+
+    assert Report.query.count() == 2
+    assert Evidence.query.count() == 1
+
+
+def test_unattached_upload_is_released_after_its_ttl(app, client):
+    app.config['UPLOAD_CHUNK_SIZE'] = 1000
+    client.post(f'/upload/{upload(client)}/complete')
+    stored = [os.path.join(root, name) for root, _, names in os.walk(app.config['UPLOAD_FOLDER'])
+              for name in names if name.endswith('.pdf')]
+
+    assert expire_claims(0) == 1
+    assert not any(os.path.exists(path) for path in stored)
+
+
+def test_expiry_skips_claims_taken_during_the_scan(app, client, monkeypatch):
+    app.config['UPLOAD_CHUNK_SIZE'] = 1000
+    client.post(f'/upload/{upload(client)}/complete')
+    listdir = os.listdir
+    # A claim listed and then renamed by take_claim before expire_claims reads it
+    monkeypatch.setattr(os, 'listdir', lambda path: listdir(path) + ['A' * 22])
+
+    assert expire_claims(0) == 1
+
+
+def test_starting_uploads_is_rate_limited(app, client):
+    app.config['UPLOAD_RATE_BURST'] = 2
+    app.config['UPLOAD_RATE_LIMIT'] = 0
+    start = lambda: client.post('/upload', json={'filename': 'a.pdf', 'size': 10},
+                                environ_base={'REMOTE_ADDR': '203.0.113.8'})
+
+    assert [start().status_code for _ in range(3)] == [201, 201, 429]